@@ -668,6 +668,8 @@ class Database:
         wavel_sampling: Optional[float] = None,
         teff_range: Optional[Tuple[float, float]] = None,
         unpack_tar: bool = True,
+        single_precision: bool = False,
+        n_proc: int = 1,
     ) -> None:
         """
         Function for adding a grid of model spectra to the database.
@@ -722,6 +724,20 @@ class Database:
             argument can be set to ``False`` such that the
             unpacking will be skipped. This can save some time
             with unpacking large TAR files.
+        single_precision : bool
+            Store the fluxes of the model spectra as 32-bit instead
+            of 64-bit floats. This halves the size of the grid in
+            the database and in memory when interpolating the grid,
+            at the cost of a relative precision of about 1e-7, which
+            is typically well below the accuracy of the models.
+        n_proc : int
+            Number of processes that are used for reading and
+            resampling the spectra in parallel. By default, the
+            spectra are read sequentially. With ``n_proc`` larger
+            than 1, a script that calls this method should be
+            protected with ``if __name__ == "__main__":`` on
+            platforms that spawn the worker processes (i.e.
+            macOS and Windows).
 
         Returns
         -------
@@ -740,6 +756,8 @@ class Database:
                 teff_range=teff_range,
                 wavel_sampling=wavel_sampling,
                 unpack_tar=unpack_tar,
+                single_precision=single_precision,
+                n_proc=n_proc,
             )
 
     @typechecked
@@ -2129,6 +2147,7 @@ class Database:
         parallax: Optional[float] = None,
         spec_labels: Optional[List[str]] = None,
         attr_dict: Optional[Dict] = None,
+        fix_param: Optional[Dict[str, float]] = None,
     ):
         """
         This function stores the posterior samples from classes
@@ -2169,6 +2188,13 @@ class Database:
         attr_dict : dict, None
             Dictionary with data that will be stored as attributes
             of the dataset with samples.
+        fix_param : dict, None
+            Dictionary with the values of the fixed parameters,
+            which are written as additional columns of the dataset
+            with samples, such that the samples do not need to be
+            extended in memory. The names of the fixed parameters
+            should be included at the end of ``modelpar``. Not
+            used if the argument is set to ``None``.
 
         Returns
         -------
@@ -2178,13 +2204,21 @@ class Database:
 
         print_section("Add posterior samples")
 
-        print(f"Database tag: {tag}")
-        print(f"Sampler: {sampler}")
-        print(f"Samples shape: {samples.shape}")
-
         if spec_labels is None:
             spec_labels = []
 
+        if fix_param is None:
+            fix_param = {}
+
+        n_fitted = samples.shape[-1]
+        fix_values = np.array(list(fix_param.values()), dtype=float)
+
+        samples_shape = samples.shape[:-1] + (n_fitted + fix_values.size,)
+
+        print(f"Database tag: {tag}")
+        print(f"Sampler: {sampler}")
+        print(f"Samples shape: {samples_shape}")
+
         with h5py.File(self.database, "a") as hdf5_file:
             if "results" not in hdf5_file:
                 hdf5_file.create_group("results")
@@ -2195,7 +2229,24 @@ class Database:
             if f"results/fit/{tag}" in hdf5_file:
                 del hdf5_file[f"results/fit/{tag}"]
 
-            dset = hdf5_file.create_dataset(f"results/fit/{tag}/samples", data=samples)
+            if fix_values.size == 0:
+                dset = hdf5_file.create_dataset(
+                    f"results/fit/{tag}/samples", data=samples
+                )
+
+            else:
+                # Write the samples and the columns with the
+                # fixed parameters directly to the dataset
+
+                dset = hdf5_file.create_dataset(
+                    f"results/fit/{tag}/samples",
+                    shape=samples_shape,
+                    dtype=samples.dtype,
+                )
+
+                dset[..., :n_fitted] = samples
+                dset[..., n_fitted:] = fix_values
+
             hdf5_file.create_dataset(f"results/fit/{tag}/ln_prob", data=ln_prob)
 
             for key, value in bounds.items():
@@ -2257,9 +2308,14 @@ class Database:
             from emcee.autocorr import integrated_time
 
             for i, item in enumerate(modelpar):
-                auto_corr = integrated_time(samples[:, i], quiet=True)[0]
+                if i < n_fitted:
+                    param_samples = samples[:, i]
+                else:
+                    param_samples = np.full(samples.shape[0], fix_values[i - n_fitted])
+
+                auto_corr = integrated_time(param_samples, quiet=True)[0]
 
-                if np.allclose(samples[:, i], np.mean(samples[:, i]), atol=0.0):
+                if np.allclose(param_samples, np.mean(param_samples), atol=0.0):
                     print(f"   - {item}: fixed")
                 else:
                     print(f"   - {item}: {auto_corr:.2f}")
@@ -85,8 +85,12 @@ def add_manual(database, tag, file_name, model_name="manual"):
     iso_data[:, 5] *= 1e9  # (cm)
     iso_data[:, 5] *= 1e-2 / constants.R_JUP  # (cm) -> (Rjup)
 
-    index_sort = np.argsort(iso_data[:, 0])
-    iso_data = iso_data[index_sort, :]
+    # Sort by age, unless the rows are already in
+    # increasing order, as is typically the case
+
+    if np.any(np.diff(iso_data[:, 0]) < 0.0):
+        index_sort = np.argsort(iso_data[:, 0], kind="stable")
+        iso_data = iso_data[index_sort, :]
 
     print(f"Adding isochrones: {tag}...", end="", flush=True)
 
@@ -43,8 +43,12 @@ def add_marleau(database, tag, file_name):
     isochrones = np.vstack((age, mass, teff, luminosity, logg))
     isochrones = np.transpose(isochrones)
 
-    index_sort = np.argsort(isochrones[:, 0])
-    isochrones = isochrones[index_sort, :]
+    # Sort by age, unless the rows are already in
+    # increasing order, as is typically the case
+
+    if np.any(np.diff(isochrones[:, 0]) < 0.0):
+        index_sort = np.argsort(isochrones[:, 0], kind="stable")
+        isochrones = isochrones[index_sort, :]
 
     dset = database.create_dataset(f"isochrones/{tag}/evolution", data=isochrones)
 
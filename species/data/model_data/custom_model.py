@@ -8,14 +8,14 @@ import warnings
 from typing import List, Optional, Tuple
 
 import h5py
-import spectres
 import numpy as np
 
 from typeguard import typechecked
 
+from species.data.model_data.model_spectra import read_model_spectrum
 from species.util.core_util import print_section
 from species.util.data_util import sort_data, write_data, add_missing
-from species.util.spec_util import create_wavelengths
+from species.util.spec_util import create_wavelengths, resample_spectrum
 
 
 @typechecked
@@ -193,15 +193,15 @@ def add_custom_model_grid(
                 print_message = f"Adding {model_name} model spectra... {filename}"
                 print(f"\r{print_message}", end="")
 
-                data_wavel, data_flux = np.loadtxt(
-                    os.path.join(data_path, filename), unpack=True
+                data_wavel, data_flux = read_model_spectrum(
+                    os.path.join(data_path, filename)
                 )
 
                 if wavel_range is None:
                     if wavelength is None:
                         wavelength = np.copy(data_wavel)  # (um)
 
-                        if np.all(np.diff(wavelength) < 0):
+                        if np.any(np.diff(wavelength) < 0.0):
                             raise ValueError(
                                 "The wavelengths are not all sorted by increasing value."
                             )
@@ -213,7 +213,7 @@ def add_custom_model_grid(
                         if wavelength is None:
                             wavelength = np.copy(data_wavel)  # (um)
 
-                            if np.all(np.diff(wavelength) < 0):
+                            if np.any(np.diff(wavelength) < 0.0):
                                 raise ValueError(
                                     "The wavelengths are not all sorted by increasing value."
                                 )
@@ -226,13 +226,8 @@ def add_custom_model_grid(
                         flux.append(data_flux[wavel_select])  # (W m-2 um-1)
 
                     else:
-                        flux_resample = spectres.spectres(
-                            wavelength,
-                            data_wavel,
-                            data_flux,
-                            spec_errs=None,
-                            fill=np.nan,
-                            verbose=False,
+                        flux_resample = resample_spectrum(
+                            wavelength, data_wavel, data_flux, fill=np.nan
                         )
 
                         if np.isnan(np.sum(flux_resample)):
@@ -4,23 +4,131 @@ Module for adding a grid of model spectra to the database.
 
 import json
 import os
+import re
 import tarfile
 import warnings
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
 from pathlib import Path
 from typing import Optional, Tuple
 
 import h5py
 import numpy as np
-import pooch
-import spectres
+import pandas as pd
 
+from tqdm.auto import tqdm
 from typeguard import typechecked
 
 from species.util.core_util import print_section
-from species.util.data_util import add_missing, extract_tarfile, sort_data, write_data
+from species.util.data_util import (
+    add_missing,
+    download_file,
+    extract_tarfile,
+    sort_data,
+    write_data,
+)
 from species.util.model_util import convert_model_name
-from species.util.spec_util import create_wavelengths
+from species.util.spec_util import create_wavelengths, resample_spectrum
+
+# Tags that precede the parameter values in the filenames of the
+# model spectra, e.g. model-name_teff_1000_logg_4.0_spec.npy
+
+FILE_TAGS = {
+    "teff": "teff",
+    "logg": "logg",
+    "feh": "feh",
+    "c_o_ratio": "co",
+    "fsed": "fsed",
+    "log_kzz": "logkzz",
+    "ad_index": "adindex",
+}
+
+
+@typechecked
+def read_model_spectrum(
+    spec_file: str,
+    wavelength: Optional[np.ndarray] = None,
+    cache_folder: Optional[str] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Function for reading a single spectrum of a model grid and
+    optionally resampling it to a new wavelength grid. The
+    function is defined at module level such that it can be
+    executed by the worker processes of ``add_model_grid``.
+
+    Parameters
+    ----------
+    spec_file : str
+        Path of the spectrum, stored either as a NumPy binary
+        file (``.npy``) or as a plain text file with any other
+        extension (e.g. ``.dat`` or ``.txt``).
+    wavelength : np.ndarray, None
+        Wavelengths (um) to which the spectrum will be resampled.
+        The original wavelengths are used if the argument is
+        set to ``None``.
+    cache_folder : str, None
+        Folder in which the parsed wavelengths and fluxes of a
+        plain text file are stored as NumPy binary file. The
+        cached arrays are used instead of parsing the text file
+        again, unless the text file has been modified since the
+        cache was written. No caching is used if the argument is
+        set to ``None``.
+
+    Returns
+    -------
+    np.ndarray
+        Original wavelengths (um) of the spectrum.
+    np.ndarray
+        Flux (W m-2 um-1), either at the original wavelengths
+        or resampled to ``wavelength``. Wavelengths for which
+        the spectrum could not be resampled are set to NaN.
+    """
+
+    if cache_folder is None:
+        cache_file = None
+    else:
+        cache_file = os.path.join(cache_folder, f"{os.path.basename(spec_file)}.npy")
+
+    if cache_file is not None and (
+        os.path.isfile(cache_file)
+        and os.path.getmtime(cache_file) >= os.path.getmtime(spec_file)
+    ):
+        data = np.load(cache_file)
+
+        data_wavel = data[:, 0]
+        data_flux = data[:, 1]
+
+    elif spec_file[-4:] == ".npy":
+        data = np.load(spec_file)
+
+        data_wavel = data[:, 0]
+        data_flux = data[:, 1]
+
+    else:
+        # Only the wavelength and flux columns are parsed,
+        # directly as floats with the C parser of pandas
+        data = pd.read_csv(
+            spec_file,
+            sep=r"\s+",
+            header=None,
+            usecols=[0, 1],
+            dtype=np.float64,
+            comment="#",
+            engine="c",
+        ).to_numpy()
+
+        if cache_file is not None:
+            np.save(cache_file, data)
+
+        data_wavel = data[:, 0]
+        data_flux = data[:, 1]
+
+    if wavelength is not None:
+        data_flux = resample_spectrum(wavelength, data_wavel, data_flux, fill=np.nan)
+
+    return data_wavel, data_flux
 
 
 @typechecked
@@ -32,6 +140,8 @@ def add_model_grid(
     teff_range: Optional[Tuple[float, float]] = None,
     wavel_sampling: Optional[float] = None,
     unpack_tar: bool = True,
+    single_precision: bool = False,
+    n_proc: int = 1,
 ) -> None:
     """
     Function for adding a grid of model spectra to the database.
@@ -67,6 +177,13 @@ def add_model_grid(
         Unpack the TAR file with the model spectra in the
         ``data_folder``. The argument can be set to ``False`` if
         the TAR file had already been unpacked previously.
+    single_precision : bool
+        Store the fluxes as 32-bit instead of 64-bit floats.
+    n_proc : int
+        Number of processes that are used for reading and
+        resampling the spectra in parallel. The spectra are read
+        sequentially with ``n_proc=1``, which does not require
+        the ``if __name__ == "__main__"`` guard in a script.
 
     Returns
     -------
@@ -155,46 +272,38 @@ def add_model_grid(
     url = f"https://home.strw.leidenuniv.nl/~stolker/species/{model_tag}.tgz"
 
     if not os.path.isfile(data_file):
-        pooch.retrieve(
-            url=url,
-            known_hash=None,
-            fname=input_file,
-            path=input_path,
-            progressbar=True,
-        )
+        download_file(url, data_file)
 
     if unpack_tar:
-        with tarfile.open(data_file) as tar_open:
-            # Get a list of all TAR members
-            tar_members = tar_open.getmembers()
-
         if teff_range is None:
-            member_list = None
-            n_members = len(tar_members)
+            member_filter = None
 
         else:
-            # Only include and extract TAR members
-            # within the specified Teff range
-            member_list = []
+            # Only extract TAR members within the specified
+            # Teff range, which are selected while reading
+            # through the TAR file
 
-            for tar_item in tar_members:
+            @typechecked
+            def member_filter(tar_item: tarfile.TarInfo) -> bool:
                 file_split = tar_item.name.split("_")
                 param_index = file_split.index("teff") + 1
                 teff_val = float(file_split[param_index])
 
-                if teff_range[0] <= teff_val <= teff_range[1]:
-                    member_list.append(tar_item)
-
-            n_members = len(member_list)
+                return teff_range[0] <= teff_val <= teff_range[1]
 
         print(
-            f"\nUnpacking {n_members}/{len(tar_members)} model spectra "
-            f"from {model_info['name']} ({model_info['file size']})...",
+            f"\nUnpacking model spectra from {model_info['name']} "
+            f"({model_info['file size']})...",
             end="",
             flush=True,
         )
 
-        extract_tarfile(data_file, data_folder, member_list=member_list)
+        # Spectra that had already been unpacked
+        # before are not extracted again
+
+        extract_tarfile(
+            data_file, data_folder, member_filter=member_filter, skip_existing=True
+        )
 
         print(" [DONE]")
 
@@ -224,39 +333,19 @@ def add_model_grid(
 
         print(f"Reference URL: {model_info['url']}")
 
-    teff = []
+    # Compiled patterns for extracting the parameter
+    # values from the filenames of the spectra
 
-    if "logg" in model_info["parameters"]:
-        logg = []
-    else:
-        logg = None
+    param_regex = {}
 
-    if "feh" in model_info["parameters"]:
-        feh = []
-    else:
-        feh = None
+    for param_item in model_info["parameters"]:
+        param_regex[param_item] = re.compile(rf"_{FILE_TAGS[param_item]}_([^_]+)")
 
-    if "c_o_ratio" in model_info["parameters"]:
-        c_o_ratio = []
-    else:
-        c_o_ratio = None
+    param_values = {param_item: [] for param_item in model_info["parameters"]}
 
-    if "fsed" in model_info["parameters"]:
-        fsed = []
-    else:
-        fsed = None
-
-    if "log_kzz" in model_info["parameters"]:
-        log_kzz = []
-    else:
-        log_kzz = None
-
-    if "ad_index" in model_info["parameters"]:
-        ad_index = []
-    else:
-        ad_index = None
-
-    flux = []
+    # Array with the spectra, which is allocated once the
+    # number of spectra and wavelengths are known
+    flux = None
 
     print()
 
@@ -289,144 +378,136 @@ def add_model_grid(
         print(f"Teff range (K) = {teff_range[0]} - {teff_range[1]}")
 
     print()
-    print_message = ""
+
+    spec_files = []
 
     for _, _, file_list in os.walk(data_folder):
         for file_name in sorted(file_list):
             if file_name[: len(model_tag)] == model_tag:
-                file_split = file_name.split("_")
+                file_param = {}
 
-                param_index = file_split.index("teff") + 1
-                teff_val = float(file_split[param_index])
+                for param_item, regex_item in param_regex.items():
+                    file_param[param_item] = float(
+                        regex_item.search(file_name).group(1)
+                    )
 
                 if teff_range is not None:
-                    if teff_val < teff_range[0] or teff_val > teff_range[1]:
+                    if not teff_range[0] <= file_param["teff"] <= teff_range[1]:
                         continue
 
-                teff.append(teff_val)
-
-                if logg is not None:
-                    param_index = file_split.index("logg") + 1
-                    logg.append(float(file_split[param_index]))
+                for param_item, param_value in file_param.items():
+                    param_values[param_item].append(param_value)
 
-                if feh is not None:
-                    param_index = file_split.index("feh") + 1
-                    feh.append(float(file_split[param_index]))
+                spec_files.append(os.path.join(data_folder, file_name))
 
-                if c_o_ratio is not None:
-                    param_index = file_split.index("co") + 1
-                    c_o_ratio.append(float(file_split[param_index]))
+    # Reading and resampling of the spectra is independent
+    # for each file so the files can be distributed across
+    # multiple processes with n_proc > 1
 
-                if fsed is not None:
-                    param_index = file_split.index("fsed") + 1
-                    fsed.append(float(file_split[param_index]))
+    # Parsed plain text spectra are cached as NumPy binary
+    # files, outside the data folder, such that adding the
+    # grid again with a different wavelength range or
+    # resolution only requires the resampling
 
-                if log_kzz is not None:
-                    param_index = file_split.index("logkzz") + 1
-                    log_kzz.append(float(file_split[param_index]))
+    if any(spec_file[-4:] != ".npy" for spec_file in spec_files):
+        cache_folder = os.path.join(input_path, f"{model_tag}_cache")
 
-                if ad_index is not None:
-                    param_index = file_split.index("adindex") + 1
-                    ad_index.append(float(file_split[param_index]))
+        if not os.path.exists(cache_folder):
+            os.makedirs(cache_folder)
 
-                empty_message = len(print_message) * " "
-                print(f"\r{empty_message}", end="")
+    else:
+        cache_folder = None
 
-                print_message = (
-                    f"Adding {model_info['name']} model spectra... {file_name}"
-                )
-                print(f"\r{print_message}", end="", flush=True)
+    if n_proc > 1:
+        pool_context = ProcessPoolExecutor(max_workers=n_proc)
+    else:
+        pool_context = nullcontext()
+
+    with pool_context as executor:
+        if executor is None:
+            spec_iter = map(
+                read_model_spectrum,
+                spec_files,
+                repeat(wavelength),
+                repeat(cache_folder),
+            )
 
-                spec_file = os.path.join(data_folder, file_name)
+        else:
+            spec_iter = executor.map(
+                read_model_spectrum,
+                spec_files,
+                repeat(wavelength),
+                repeat(cache_folder),
+                chunksize=max(1, len(spec_files) // (4 * n_proc)),
+            )
 
-                if file_name[-4:] == ".dat":
-                    data_wavel, data_flux = np.loadtxt(spec_file, unpack=True)
+        spec_iter = tqdm(
+            spec_iter,
+            desc=f"Adding {model_info['name']} model spectra",
+            total=len(spec_files),
+            mininterval=0.2,
+        )
 
-                else:
-                    data = np.load(spec_file)
+        for spec_idx, (data_wavel, data_flux) in enumerate(spec_iter):
+            if wavel_range is None:
+                if wavelength is None:
+                    wavelength = np.copy(data_wavel)  # (um)
 
-                    data_wavel = data[:, 0]
-                    data_flux = data[:, 1]
+                    if np.any(np.diff(wavelength) < 0.0):
+                        raise ValueError(
+                            "The wavelengths are not all sorted by increasing value."
+                        )
 
-                if wavel_range is None:
+            else:
+                if not resample_spectra:
                     if wavelength is None:
                         wavelength = np.copy(data_wavel)  # (um)
 
-                        if np.all(np.diff(wavelength) < 0):
+                        if np.any(np.diff(wavelength) < 0.0):
                             raise ValueError(
                                 "The wavelengths are not all sorted by increasing value."
                             )
 
-                    flux.append(data_flux)  # (W m-2 um-1)
-
-                else:
-                    if not resample_spectra:
-                        if wavelength is None:
-                            wavelength = np.copy(data_wavel)  # (um)
-
-                            if np.all(np.diff(wavelength) < 0):
-                                raise ValueError(
-                                    "The wavelengths are not all sorted by increasing value."
-                                )
-
-                            wavel_select = (wavel_range[0] < wavelength) & (
-                                wavelength < wavel_range[1]
-                            )
-                            wavelength = wavelength[wavel_select]
-
-                        flux.append(data_flux[wavel_select])  # (W m-2 um-1)
-
-                    else:
-                        flux_resample = spectres.spectres(
-                            wavelength,
-                            data_wavel,
-                            data_flux,
-                            spec_errs=None,
-                            fill=np.nan,
-                            verbose=False,
+                        wavel_select = (wavel_range[0] < wavelength) & (
+                            wavelength < wavel_range[1]
                         )
+                        wavelength = wavelength[wavel_select]
 
-                        if np.isnan(np.sum(flux_resample)):
-                            raise ValueError(
-                                f"Resampling is only possible if the new wavelength "
-                                f"range ({wavelength[0]} - {wavelength[-1]} um) falls "
-                                f"sufficiently far within the wavelength range "
-                                f"({data_wavel[0]} - {data_wavel[-1]} um) of the input "
-                                f"spectra."
-                            )
-
-                        flux.append(flux_resample)  # (W m-2 um-1)
-
-    print()
-
-    if logg is not None:
-        logg = np.asarray(logg)
+                    data_flux = data_flux[wavel_select]  # (W m-2 um-1)
 
-    if feh is not None:
-        feh = np.asarray(feh)
-
-    if c_o_ratio is not None:
-        c_o_ratio = np.asarray(c_o_ratio)
+                else:
+                    if np.isnan(np.sum(data_flux)):
+                        raise ValueError(
+                            f"Resampling is only possible if the new wavelength "
+                            f"range ({wavelength[0]} - {wavelength[-1]} um) falls "
+                            f"sufficiently far within the wavelength range "
+                            f"({data_wavel[0]} - {data_wavel[-1]} um) of the input "
+                            f"spectra."
+                        )
 
-    if fsed is not None:
-        fsed = np.asarray(fsed)
+            if flux is None:
+                flux = np.empty(
+                    (len(spec_files), wavelength.size),
+                    dtype=np.float32 if single_precision else np.float64,
+                )
 
-    if log_kzz is not None:
-        log_kzz = np.asarray(log_kzz)
+            flux[spec_idx] = data_flux  # (W m-2 um-1)
 
-    if ad_index is not None:
-        ad_index = np.asarray(ad_index)
+    param_values = {
+        param_key: np.asarray(param_value)
+        for param_key, param_value in param_values.items()
+    }
 
     data_sorted = sort_data(
-        np.asarray(teff),
-        logg,
-        feh,
-        c_o_ratio,
-        fsed,
-        log_kzz,
-        ad_index,
+        param_values["teff"],
+        param_values.get("logg"),
+        param_values.get("feh"),
+        param_values.get("c_o_ratio"),
+        param_values.get("fsed"),
+        param_values.get("log_kzz"),
+        param_values.get("ad_index"),
         wavelength,
-        np.asarray(flux),
+        flux,
     )
 
     write_data(
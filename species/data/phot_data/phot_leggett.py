@@ -51,7 +51,7 @@ def add_leggett(input_path, database):
 
     database.create_group(group)
 
-    dataframe = pd.pandas.read_excel(data_file1)
+    dataframe = pd.read_excel(data_file1)
     dataframe.columns = dataframe.columns.str.replace("'", "")
 
     modulus = np.asarray(dataframe["M-m"])  # M-m (mag)
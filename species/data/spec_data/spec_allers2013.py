@@ -18,7 +18,7 @@ from astropy.io import fits
 from astroquery.simbad import Simbad
 from typeguard import typechecked
 
-from species.util.data_util import extract_tarfile
+from species.util.data_util import extract_tarfile, parallax_lookup
 from species.util.query_util import get_simbad
 
 
@@ -50,7 +50,7 @@ def add_allers2013(input_path: str, database: h5py._hl.files.File) -> None:
     if not os.path.isfile(parallax_file):
         urllib.request.urlretrieve(parallax_url, parallax_file)
 
-    parallax_data = pd.pandas.read_csv(
+    parallax_data = pd.read_csv(
         parallax_file,
         usecols=[0, 1, 2],
         names=["object", "parallax", "parallax_error"],
@@ -58,6 +58,8 @@ def add_allers2013(input_path: str, database: h5py._hl.files.File) -> None:
         dtype={"object": str, "parallax": float, "parallax_error": float},
     )
 
+    parallax_dict = parallax_lookup(parallax_data)
+
     print_text = "spectra of young M/L type objects from Allers & Liu 2013"
 
     data_url = "https://home.strw.leidenuniv.nl/~stolker/species/allers_liu_2013.tgz"
@@ -118,16 +120,7 @@ def add_allers2013(input_path: str, database: h5py._hl.files.File) -> None:
                 if not isinstance(simbad_id, str):
                     simbad_id = simbad_id.decode("utf-8")
 
-                par_select = parallax_data[parallax_data["object"] == simbad_id]
-
-                if not par_select.empty:
-                    parallax = (
-                        par_select["parallax"].values[0],
-                        par_select["parallax_error"].values[0],
-                    )
-
-                else:
-                    parallax = (np.nan, np.nan)
+                parallax = parallax_dict.get(simbad_id, (np.nan, np.nan))
 
             else:
                 parallax = (np.nan, np.nan)
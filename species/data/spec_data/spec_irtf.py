@@ -14,7 +14,7 @@ import pandas as pd
 from astropy.io import fits
 from typeguard import typechecked
 
-from species.util.data_util import extract_tarfile, update_sptype
+from species.util.data_util import extract_tarfile, parallax_lookup, update_sptype
 from species.util.query_util import get_parallax, get_simbad
 
 
@@ -50,7 +50,7 @@ def add_irtf(
     if not os.path.isfile(parallax_file):
         urllib.request.urlretrieve(parallax_url, parallax_file)
 
-    parallax_data = pd.pandas.read_csv(
+    parallax_data = pd.read_csv(
         parallax_file,
         usecols=[0, 1, 2],
         names=["object", "parallax", "parallax_error"],
@@ -58,6 +58,8 @@ def add_irtf(
         dtype={"object": str, "parallax": float, "parallax_error": float},
     )
 
+    parallax_dict = parallax_lookup(parallax_data)
+
     data_folder = os.path.join(input_path, "irtf")
 
     if not os.path.exists(data_folder):
@@ -157,15 +159,8 @@ def add_irtf(
                             if not isinstance(simbad_id, str):
                                 simbad_id = simbad_id.decode("utf-8")
 
-                            par_select = parallax_data[
-                                parallax_data["object"] == simbad_id
-                            ]
-
-                            if not par_select.empty:
-                                parallax = (
-                                    par_select["parallax"],
-                                    par_select["parallax_error"],
-                                )
+                            if simbad_id in parallax_dict:
+                                parallax = parallax_dict[simbad_id]
                             else:
                                 simbad_id, parallax = get_parallax(name)
 
@@ -70,7 +70,7 @@ def add_kesseli2017(input_path: str, database: h5py._hl.files.File) -> None:
             with fits.open(os.path.join(fits_folder, filename)) as hdu_list:
                 data = hdu_list[1].data
 
-                wavelength = 1e-4 * 10.0 ** data["LogLam"]  # (um)
+                wavelength = 10.0 ** (data["LogLam"] - 4.0)  # (um)
                 flux = data["Flux"]  # Normalized units
                 error = data["PropErr"]  # Normalized units
 
@@ -13,7 +13,7 @@ from astropy.io.votable import parse_single_table
 from typeguard import typechecked
 
 from species.phot.syn_phot import SyntheticPhotometry
-from species.util.data_util import update_sptype
+from species.util.data_util import parallax_lookup, update_sptype
 from species.util.query_util import get_simbad
 
 
@@ -42,7 +42,7 @@ def add_spex(input_path: str, database: h5py._hl.files.File) -> None:
     if not os.path.isfile(parallax_file):
         urllib.request.urlretrieve(parallax_url, parallax_file)
 
-    parallax_data = pd.pandas.read_csv(
+    parallax_data = pd.read_csv(
         parallax_file,
         usecols=[0, 1, 2],
         names=["object", "parallax", "parallax_error"],
@@ -50,6 +50,8 @@ def add_spex(input_path: str, database: h5py._hl.files.File) -> None:
         dtype={"object": str, "parallax": float, "parallax_error": float},
     )
 
+    parallax_dict = parallax_lookup(parallax_data)
+
     database.create_group("spectra/spex")
 
     data_path = os.path.join(input_path, "spex")
@@ -220,16 +222,7 @@ def add_spex(input_path: str, database: h5py._hl.files.File) -> None:
                 if not isinstance(simbad_id, str):
                     simbad_id = simbad_id.decode("utf-8")
 
-                par_select = parallax_data[parallax_data["object"] == simbad_id]
-
-                if not par_select.empty:
-                    parallax = (
-                        par_select["parallax"].values[0],
-                        par_select["parallax_error"].values[0],
-                    )
-
-                else:
-                    parallax = (np.nan, np.nan)
+                parallax = parallax_dict.get(simbad_id, (np.nan, np.nan))
 
             else:
                 parallax = (np.nan, np.nan)
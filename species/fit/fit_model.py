@@ -2,15 +2,17 @@
 Module with functionalities for fitting atmospheric model spectra.
 """
 
+import math
 import os
 import sys
 import warnings
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from typing import Optional, Union, List, Tuple, Dict
 
 import dynesty
 import numpy as np
-import spectres
 
 try:
     import ultranest
@@ -30,30 +32,178 @@ except:
         "(Linux) or DYLD_LIBRARY_PATH (Mac)?"
     )
 
-from PyAstronomy.pyasl import fastRotBroad
 from schwimmbad import MPIPool
-from scipy import interpolate, integrate, stats
+from scipy import integrate, signal, sparse
+from scipy.linalg import cho_factor, cho_solve
+from scipy.special import ndtri
+from tqdm.auto import tqdm
 from typeguard import typechecked
 
 from species.core import constants
 from species.phot.syn_phot import SyntheticPhotometry
-from species.read.read_model import ReadModel
+from species.read.read_model import ReadModel, gtotd_emission
 from species.read.read_object import ReadObject
 from species.read.read_planck import ReadPlanck
 from species.read.read_filter import ReadFilter
 from species.util.convert_util import logg_to_mass
-from species.util.core_util import print_section
+from species.util.core_util import mpi_rank, print_section
 from species.util.data_util import convert_units
 from species.util.dust_util import (
+    apply_ism_ext_coeff,
     convert_to_av,
     interp_lognorm,
     interp_powerlaw,
-    ism_extinction,
+    ism_extinction_coeff,
 )
-from species.util.model_util import binary_to_single, powerlaw_spectrum
+from species.util.fit_util import gaussian_lnlike, photometry_lnlike
+from species.util.model_util import (
+    binary_to_single,
+    interp_grid_linear,
+    powerlaw_spectrum,
+)
+from species.util.spec_util import (
+    create_wavelengths,
+    linear_interp_weights,
+    rot_broad_kernel,
+    smooth_resample_matrix,
+)
+
+# Optional parameters that are fitted if they are included
+# in the bounds dictionary, in the order of modelpar
+
+OPTIONAL_PARAM = [
+    "ism_red",
+    "veil_a",
+    "veil_b",
+    "veil_ref",
+    "lin_a",
+    "lin_b",
+    "gtotd_rinn",
+    "gtotd_rout",
+    "gtotd_incl",
+]
+
+# Parameters of a spectrum, in the order of the tuple with
+# the bounds of the spectrum in the bounds dictionary
+
+SPEC_PARAM = ["scaling", "error", "radvel", "offset"]
+
+
+@typechecked
+def _solve_cov(cov_matrix: np.ndarray, data_diff: np.ndarray) -> np.ndarray:
+    """
+    Function for solving a linear system with a covariance matrix,
+    which is used instead of multiplying with the inverted matrix.
+    The system is solved with the Cholesky factor of the matrix, or
+    with an LU decomposition if the matrix is numerically not
+    positive definite.
+
+    Parameters
+    ----------
+    cov_matrix : np.ndarray
+        Covariance matrix.
+    data_diff : np.ndarray
+        Residuals of the data and the model.
+
+    Returns
+    -------
+    np.ndarray
+        Product of the inverted covariance matrix
+        and the residuals.
+    """
+
+    try:
+        cov_factor = cho_factor(cov_matrix, check_finite=False)
+        cov_diff = cho_solve(cov_factor, data_diff, check_finite=False)
+
+    except np.linalg.LinAlgError:
+        cov_diff = np.linalg.solve(cov_matrix, data_diff)
+
+    return cov_diff
+
+
+@lru_cache(maxsize=None)
+@typechecked
+def _filter_fwhm(filter_name: str) -> float:
+    """
+    Function for calculating the FWHM of a filter profile, which
+    is used as weight of the photometry. The values are cached
+    such that the filter profiles are read only once when
+    fitting multiple objects with the same filters.
+
+    Parameters
+    ----------
+    filter_name : str
+        Filter name as listed in the database.
+
+    Returns
+    -------
+    float
+        Full width at half maximum (:math:`\\mu\\mathrm{m}`).
+    """
+
+    return ReadFilter(filter_name).filter_fwhm()
+
+
+@typechecked
+def _format_params(
+    param_names: List[str], param_values: Union[List[float], np.ndarray]
+) -> str:
+    """
+    Function for formatting the names and values of the
+    parameters as lines that can be printed with a single call.
+
+    Parameters
+    ----------
+    param_names : list(str)
+        Parameter names.
+    param_values : list(float), np.ndarray
+        Parameter values.
+
+    Returns
+    -------
+    str
+        Formatted parameters, with a line for each parameter.
+    """
+
+    return "\n".join(
+        (
+            f"   - {name} = {value:.2e}"
+            if -0.1 < value < 0.1
+            else f"   - {name} = {value:.2f}"
+        )
+        for name, value in zip(param_names, param_values)
+    )
+
+
+@typechecked
+def _create_interp(model: str, grid_kwargs: dict, interp_kwargs: dict) -> ReadModel:
+    """
+    Function for creating a :class:`~species.read.read_model.ReadModel`
+    object with an interpolated grid of model spectra or fluxes. The
+    function is defined at the module level such that it can be used
+    by the worker processes of :class:`~species.fit.fit_model.FitModel`.
+
+    Parameters
+    ----------
+    model : str
+        Name of the atmospheric model.
+    grid_kwargs : dict
+        Keyword arguments for :class:`~species.read.read_model.ReadModel`.
+    interp_kwargs : dict
+        Keyword arguments for
+        :func:`~species.read.read_model.ReadModel.interpolate_grid`.
+
+    Returns
+    -------
+    species.read.read_model.ReadModel
+        Object with the interpolated grid.
+    """
 
+    read_model = ReadModel(model, **grid_kwargs)
+    read_model.interpolate_grid(**interp_kwargs)
 
-warnings.filterwarnings("always", category=DeprecationWarning)
+    return read_model
 
 
 class FitModel:
@@ -98,6 +248,7 @@ class FitModel:
         apply_weights: Union[bool, Dict[str, Union[float, np.ndarray]]] = False,
         ext_filter: Optional[str] = None,
         normal_prior: Optional[Dict[str, Tuple[float, float]]] = None,
+        n_proc: int = 1,
     ) -> None:
         """
         Parameters
@@ -152,7 +303,8 @@ class FitModel:
                  resolution. The resolution is set when adding a
                  spectrum to the database with
                  :func:`~species.data.database.Database.add_object`.
-                 Note that the broadening is applied with the
+                 Note that the broadening is applied with an FFT
+                 convolution of the same kernel as used by the
                  `fastRotBroad <https://pyastronomy.readthedocs.io/
                  en/latest/pyaslDoc/aslDoc/rotBroad.html#PyAstronomy.
                  pyasl.fastRotBroad>`_ function from ``PyAstronomy``.
@@ -461,6 +613,11 @@ class FitModel:
             argument is set to ``None``. See also the ``bounds``
             parameter for including priors with a (log-)uniform
             distribution.
+        n_proc : int
+            Number of processes that are used for interpolating the
+            model grids of the filters and spectra in parallel. The
+            grids are interpolated sequentially with ``n_proc=1``,
+            which should be used when running with MPI.
 
         Returns
         -------
@@ -470,6 +627,11 @@ class FitModel:
 
         print_section("Fit model spectra")
 
+        # Show the deprecation warnings of the
+        # arguments, but only the first time
+
+        warnings.filterwarnings("once", category=DeprecationWarning)
+
         if not inc_phot and not inc_spec:
             raise ValueError("No photometric or spectroscopic data has been selected.")
 
@@ -492,7 +654,18 @@ class FitModel:
         self.object = ReadObject(object_name)
         self.obj_parallax = self.object.get_parallax()
         self.binary = False
+        self.n_disk = 0
         self.ext_filter = ext_filter
+        self.n_proc = n_proc
+        self.mpi_rank = mpi_rank()
+
+        # Name of the extinction parameter of ext_filter, such
+        # that the name is not formatted with every likelihood call
+
+        if self.ext_filter is None:
+            self.ext_filter_key = None
+        else:
+            self.ext_filter_key = f"phot_ext_{self.ext_filter}"
 
         if fit_corr is None:
             self.fit_corr = []
@@ -534,17 +707,28 @@ class FitModel:
 
             self.modelpar.append("parallax")
 
+            self.param_interp = None
+            self.teff_range = None
+
         elif self.model == "powerlaw":
             self.n_planck = 0
 
             self.modelpar = ["log_powerlaw_a", "log_powerlaw_b", "log_powerlaw_c"]
 
+            self.param_interp = None
+            self.teff_range = None
+
         else:
             # Fitting self-consistent atmospheric models
-            if self.bounds is not None:
-                readmodel = ReadModel(self.model)
-                bounds_grid = readmodel.get_bounds()
 
+            # The grid boundaries and parameters are read once
+            # and reused for setting the priors and the order
+            # of the parameters for the interpolation
+            readmodel = ReadModel(self.model)
+            bounds_grid = readmodel.get_bounds()
+            self.param_interp = readmodel.get_parameters()
+
+            if self.bounds is not None:
                 for key, value in bounds_grid.items():
                     if key not in self.bounds or self.bounds[key] is None:
                         # Set the parameter boundaries to the grid
@@ -563,80 +747,25 @@ class FitModel:
                         self.bounds[f"{key}_1"] = bounds_grid[key]
                         del self.bounds[key]
 
-                    else:
-                        if self.bounds[key][0] < bounds_grid[key][0]:
-                            warnings.warn(
-                                f"The lower bound on {key} "
-                                f"({self.bounds[key][0]}) is smaller than "
-                                f"the lower bound from the available "
-                                f"{self.model} model grid "
-                                f"({bounds_grid[key][0]}). The lower bound "
-                                f"of the {key} prior will be adjusted to "
-                                f"{bounds_grid[key][0]}."
-                            )
-                            self.bounds[key] = (
-                                bounds_grid[key][0],
-                                self.bounds[key][1],
-                            )
+                    # Adjust the boundaries to the grid boundaries,
+                    # separately for each component of a binary
 
-                        if self.bounds[key][1] > bounds_grid[key][1]:
-                            warnings.warn(
-                                f"The upper bound on {key} "
-                                f"({self.bounds[key][1]}) is larger than the "
-                                f"upper bound from the available {self.model} "
-                                f"model grid ({bounds_grid[key][1]}). The "
-                                f"bound of the {key} prior will be adjusted "
-                                f"to {bounds_grid[key][1]}."
-                            )
-                            self.bounds[key] = (
-                                self.bounds[key][0],
-                                bounds_grid[key][1],
-                            )
+                    if key in self.bounds:
+                        self._check_grid_bounds(key, value)
 
-                    if self.binary:
+                    else:
                         for i in range(2):
-                            if self.bounds[f"{key}_{i}"][0] < bounds_grid[key][0]:
-                                warnings.warn(
-                                    f"The lower bound on {key}_{i} "
-                                    f"({self.bounds[f'{key}_{i}'][0]}) "
-                                    f"is smaller than the lower bound "
-                                    f"from the available {self.model} "
-                                    f"model grid ({bounds_grid[key][0]}). "
-                                    f"The lower bound of the {key}_{i} "
-                                    f"prior will be adjusted to "
-                                    f"{bounds_grid[key][0]}."
-                                )
-                                self.bounds[f"{key}_{i}"] = (
-                                    bounds_grid[key][0],
-                                    self.bounds[f"{key}_{i}"][1],
-                                )
-
-                            if self.bounds[f"{key}_{i}"][1] > bounds_grid[key][1]:
-                                warnings.warn(
-                                    f"The upper bound on {key}_{i} "
-                                    f"({self.bounds[f'{key}_{i}'][0]}) "
-                                    f"is larger than the lower bound "
-                                    f"from the available {self.model} "
-                                    f"model grid ({bounds_grid[key][1]}). "
-                                    f"The upper bound of the {key}_{i} "
-                                    f"prior will be adjusted to "
-                                    f"{bounds_grid[key][1]}."
-                                )
-                                self.bounds[f"{key}_{i}"] = (
-                                    self.bounds[f"{key}_{i}"][0],
-                                    bounds_grid[key][1],
-                                )
+                            self._check_grid_bounds(f"{key}_{i}", value)
 
             else:
                 # Set all parameter boundaries to the grid boundaries
-                readmodel = ReadModel(self.model, None, None)
-                self.bounds = readmodel.get_bounds()
+                self.bounds = bounds_grid
 
             print(f"Object name: {object_name}")
             print(f"Model tag: {model}")
             print(f"Binary star: {self.binary}")
 
-            self.modelpar = readmodel.get_parameters()
+            self.modelpar = self.param_interp.copy()
 
             if "flux_scaling" in self.bounds:
                 # Fit arbitrary flux scaling
@@ -732,10 +861,15 @@ class FitModel:
                 # Update list of model parameters
 
                 for key in bounds:
-                    if key[:-2] in self.modelpar:
-                        par_index = self.modelpar.index(key[:-2])
-                        self.modelpar[par_index] = key[:-2] + "_0"
-                        self.modelpar.insert(par_index, key[:-2] + "_1")
+                    if not key.endswith(("_0", "_1")):
+                        continue
+
+                    param_name = key[:-2]
+
+                    if param_name in self.modelpar:
+                        par_index = self.modelpar.index(param_name)
+                        self.modelpar[par_index] = param_name + "_0"
+                        self.modelpar.insert(par_index, param_name + "_1")
 
                 if "radius" in self.modelpar:
                     # Fit a weighting for the two spectra in case this
@@ -747,6 +881,24 @@ class FitModel:
                     if "spec_weight" not in self.bounds:
                         self.bounds["spec_weight"] = (0.0, 1.0)
 
+            # Temperature range of the uniform priors, such that
+            # only the required part of the grid is interpolated
+
+            teff_keys = [
+                key for key in ["teff", "teff_0", "teff_1"] if key in self.bounds
+            ]
+
+            if not teff_keys or any(key in self.normal_prior for key in teff_keys):
+                self.teff_range = None
+
+            else:
+                teff_bounds = np.array([self.bounds[key] for key in teff_keys])
+
+                self.teff_range = (
+                    float(np.amin(teff_bounds[:, 0])),
+                    float(np.amax(teff_bounds[:, 1])),
+                )
+
         # Select filters and spectra
 
         if isinstance(inc_phot, bool):
@@ -778,12 +930,26 @@ class FitModel:
 
         self.objphot = []
         self.modelphot = []
+        self.extphot = []
+        self.extsynphot = []
+        self.phot_wavel = []
         self.filter_name = []
         self.instr_name = []
 
         print()
 
-        for item in inc_phot:
+        if self.model not in ["planck", "powerlaw"]:
+            interp_phot = self._interpolate_grids(
+                self.model,
+                [
+                    {"filter_name": item, "teff_range": self.teff_range}
+                    for item in inc_phot
+                ],
+                [{} for _ in inc_phot],
+                "filters",
+            )
+
+        for phot_idx, item in enumerate(inc_phot):
             if self.model == "planck":
                 # Create SyntheticPhotometry objects when fitting a Planck function
                 print(f"Creating synthetic photometry: {item}...", end="", flush=True)
@@ -800,12 +966,25 @@ class FitModel:
                 self.modelphot.append(synphot)
 
             else:
-                # Or interpolate the model grid for each filter
-                print(f"Interpolating {item}...", end="", flush=True)
-                readmodel = ReadModel(self.model, filter_name=item)
-                readmodel.interpolate_grid(wavel_resample=None, spec_res=None)
-                self.modelphot.append(readmodel)
-                print(" [DONE]")
+                # Or the interpolated model grid of the filter
+                self.modelphot.append(interp_phot[phot_idx])
+
+                # The extinction with ext_filter requires the spectrum
+                # instead of the interpolated flux of the filter
+
+                if self.ext_filter is not None:
+                    self.extphot.append(
+                        ReadModel(
+                            self.model, filter_name=item, teff_range=self.teff_range
+                        )
+                    )
+
+                    self.extsynphot.append(SyntheticPhotometry(item))
+
+            # Mean wavelength of the filter, which is used
+            # for the extinction and the linear excess
+
+            self.phot_wavel.append(ReadFilter(item).mean_wavelength())
 
             # Add parameter for error inflation
 
@@ -828,6 +1007,53 @@ class FitModel:
             self.filter_name.append(item)
             self.instr_name.append(instr_filt)
 
+        # For the blackbody fits, the spectrum is calculated once for the
+        # wavelength range of all filters and the synthetic fluxes are
+        # calculated with a sparse matrix with the weights of the filters
+
+        self.readplanck = None
+        self.phot_matrix = None
+
+        if self.model == "planck" and len(self.modelphot) > 0:
+            wavel_range = (
+                min(synphot.wavel_range[0] for synphot in self.modelphot),
+                max(synphot.wavel_range[1] for synphot in self.modelphot),
+            )
+
+            self.readplanck = ReadPlanck(wavel_range=wavel_range)
+            wavel_points = create_wavelengths(wavel_range, 1000.0)
+
+            self.phot_matrix = sparse.csr_matrix(
+                [synphot.flux_weights(wavel_points) for synphot in self.modelphot]
+            )
+
+        # For the model grids, the fluxes of the filters are stacked
+        # along the last axis such that all filters are interpolated
+        # with a single call, which requires the same grid points
+
+        self.phot_interp = None
+
+        if self.model not in ["planck", "powerlaw"] and len(self.modelphot) > 0:
+            phot_points = self.modelphot[0].spectrum_interp.args[0]
+
+            same_points = all(
+                len(item.spectrum_interp.args[0]) == len(phot_points)
+                and all(
+                    np.array_equal(point_item, point_ref)
+                    for point_item, point_ref in zip(
+                        item.spectrum_interp.args[0], phot_points
+                    )
+                )
+                for item in self.modelphot[1:]
+            )
+
+            if same_points:
+                phot_grid = np.concatenate(
+                    [item.spectrum_interp.args[1] for item in self.modelphot], axis=-1
+                )
+
+                self.phot_interp = partial(interp_grid_linear, phot_points, phot_grid)
+
         # Include spectroscopic data
 
         if inc_spec:
@@ -881,50 +1107,173 @@ class FitModel:
             self.modelspec = []
 
             if self.model != "planck":
-                for spec_key, spec_value in self.spectrum.items():
-                    print(f"\rInterpolating {spec_key}...", end="", flush=True)
+                grid_kwargs = []
+                interp_kwargs = []
 
+                for spec_value in self.spectrum.values():
                     wavel_range = (
                         0.9 * spec_value[0][0, 0],
                         1.1 * spec_value[0][-1, 0],
                     )
 
-                    readmodel = ReadModel(self.model, wavel_range=wavel_range)
+                    grid_kwargs.append(
+                        {"wavel_range": wavel_range, "teff_range": self.teff_range}
+                    )
+
+                    interp_kwargs.append(
+                        {
+                            "wavel_resample": spec_value[0][:, 0],
+                            "spec_res": spec_value[3],
+                        }
+                    )
+
+                self.modelspec = self._interpolate_grids(
+                    self.model, grid_kwargs, interp_kwargs, "spectra"
+                )
+
+            else:
+                self.spec_matrix = []
+
+                # ReadPlanck objects for calculating the blackbody
+                # spectra. The smoothing to R = 1000 and the resampling
+                # to the observed wavelengths are linear in the flux so
+                # they are combined into a sparse matrix per spectrum
 
-                    readmodel.interpolate_grid(
-                        wavel_resample=spec_value[0][:, 0],
-                        spec_res=spec_value[3],
+                for spec_key, spec_value in self.spectrum.items():
+                    wavel_range = (
+                        0.9 * spec_value[0][0, 0],
+                        1.1 * spec_value[0][-1, 0],
                     )
 
-                    self.modelspec.append(readmodel)
+                    self.modelspec.append(ReadPlanck(wavel_range))
 
-                    print(" [DONE]")
+                    wavel_points = create_wavelengths(wavel_range, 1000.0)
+
+                    self.spec_matrix.append(
+                        smooth_resample_matrix(
+                            spec_value[0][:, 0], wavel_points, 1000.0
+                        )
+                    )
 
         else:
             self.spectrum = {}
             self.modelspec = None
             self.n_corr_par = 0
 
-        # Get the parameter order if interpolate_grid is used
+        # Store the wavelengths, fluxes, and variances of all spectra
+        # in contiguous arrays instead of the strided columns of the
+        # data arrays. The slices in spec_index select the spectra
 
-        if self.model not in ["planck", "powerlaw"]:
-            readmodel = ReadModel(self.model)
-            self.param_interp = readmodel.get_parameters()
+        spec_edges = np.cumsum(
+            [0] + [spec_value[0].shape[0] for spec_value in self.spectrum.values()]
+        )
 
-            if self.binary:
-                param_tmp = self.param_interp.copy()
+        self.spec_index = {}
 
-                self.param_interp = []
-                for item in param_tmp:
-                    if f"{item}_0" in self.modelpar and f"{item}_1" in self.modelpar:
-                        self.param_interp.append(f"{item}_0")
-                        self.param_interp.append(f"{item}_1")
+        for spec_idx, spec_key in enumerate(self.spectrum):
+            self.spec_index[spec_key] = slice(
+                spec_edges[spec_idx], spec_edges[spec_idx + 1]
+            )
 
-                    else:
-                        self.param_interp.append(item)
+        if self.spectrum:
+            spec_data = np.concatenate(
+                [spec_value[0] for spec_value in self.spectrum.values()]
+            )
 
         else:
-            self.param_interp = None
+            spec_data = np.zeros((0, 3))
+
+        self.spec_wavel = np.ascontiguousarray(spec_data[:, 0])
+        self.spec_flux = np.ascontiguousarray(spec_data[:, 1])
+        self.spec_var = spec_data[:, 2] ** 2
+
+        # Squared differences between the wavelengths of the spectra
+        # for which the covariances are modeled with a Gaussian process,
+        # multiplied by -0.5 for the exponent of the squared exponential
+
+        self.wavel_sqdiff = {}
+
+        for spec_key in self.spectrum:
+            if spec_key in self.fit_corr:
+                spec_wavel = self.spec_wavel[self.spec_index[spec_key]]
+                self.wavel_sqdiff[spec_key] = (
+                    -0.5 * np.subtract.outer(spec_wavel, spec_wavel) ** 2
+                )
+
+        # Sum and number of the finite log(2 pi var) terms of the spectra
+        # with covariances, such that without error inflation the sum
+        # only needs to be corrected for the scaling of the variances
+
+        self.spec_lnvar = {}
+
+        for spec_key, spec_value in self.spectrum.items():
+            if spec_value[2] is not None or spec_key in self.fit_corr:
+                spec_lnvar = np.log(
+                    2.0 * np.pi * self.spec_var[self.spec_index[spec_key]]
+                )
+
+                self.spec_lnvar[spec_key] = (
+                    np.nansum(spec_lnvar),
+                    np.count_nonzero(~np.isnan(spec_lnvar)),
+                )
+
+        # Coefficients of the ISM extinction relation at the wavelengths
+        # of the filters and spectra, which only need to be scaled with
+        # the extinction and reddening of the sampled parameters
+
+        self.phot_ism_a, self.phot_ism_b = ism_extinction_coeff(
+            np.array(self.phot_wavel, dtype=float)
+        )
+
+        self.spec_ism_a, self.spec_ism_b = ism_extinction_coeff(self.spec_wavel)
+
+        # The rotational broadening is applied on a linear wavelength
+        # grid so the interpolation indices and weights between the
+        # wavelengths of the spectra and the linear grid are fixed
+
+        self.rot_broad = {}
+
+        if "vsini" in self.bounds:
+            for spec_key, spec_value in self.spectrum.items():
+                wavel_broad = np.linspace(
+                    spec_value[0][0, 0],
+                    spec_value[0][-1, 0],
+                    2 * spec_value[0].shape[0],
+                )
+
+                self.rot_broad[spec_key] = (
+                    wavel_broad,
+                    linear_interp_weights(spec_value[0][:, 0], wavel_broad),
+                    linear_interp_weights(wavel_broad, spec_value[0][:, 0]),
+                )
+
+        # Parameter order for interpolate_grid in case of a binary
+
+        if self.binary:
+            param_tmp = self.param_interp.copy()
+
+            self.param_interp = []
+            for item in param_tmp:
+                if f"{item}_0" in self.modelpar and f"{item}_1" in self.modelpar:
+                    self.param_interp.append(f"{item}_0")
+                    self.param_interp.append(f"{item}_1")
+
+                else:
+                    self.param_interp.append(item)
+
+            # Names of the parameters in param_dict that are selected for
+            # each star, in the order of the parameters of the model grid
+
+            param_pos = {item: float(i) for i, item in enumerate(self.param_interp)}
+
+            self.binary_keys = []
+
+            for star_idx in range(2):
+                param_single = binary_to_single(param_pos, star_idx)
+
+                self.binary_keys.append(
+                    [self.param_interp[int(item)] for item in param_single.values()]
+                )
 
         # Include blackbody disk
 
@@ -932,95 +1281,74 @@ class FitModel:
         self.diskspec = []
 
         if self.n_disk > 0:
-            for item in inc_phot:
-                print(f"Interpolating {item}...", end="", flush=True)
-                readmodel = ReadModel("blackbody", filter_name=item)
-                readmodel.interpolate_grid(wavel_resample=None, spec_res=None)
-                self.diskphot.append(readmodel)
-                print(" [DONE]")
+            self.diskphot = self._interpolate_grids(
+                "blackbody",
+                [{"filter_name": item} for item in inc_phot],
+                [{} for _ in inc_phot],
+                "disk filters",
+            )
 
-            for spec_key, spec_value in self.spectrum.items():
-                print(f"\rInterpolating {spec_key}...", end="", flush=True)
+            grid_kwargs = []
+            interp_kwargs = []
 
+            for spec_value in self.spectrum.values():
                 wavel_range = (0.9 * spec_value[0][0, 0], 1.1 * spec_value[0][-1, 0])
 
-                readmodel = ReadModel("blackbody", wavel_range=wavel_range)
+                grid_kwargs.append({"wavel_range": wavel_range})
 
-                readmodel.interpolate_grid(
-                    wavel_resample=spec_value[0][:, 0],
-                    spec_res=spec_value[3],
+                interp_kwargs.append(
+                    {"wavel_resample": spec_value[0][:, 0], "spec_res": spec_value[3]}
                 )
 
-                self.diskspec.append(readmodel)
-
-                print(" [DONE]")
+            self.diskspec = self._interpolate_grids(
+                "blackbody", grid_kwargs, interp_kwargs, "disk spectra"
+            )
 
         for item in self.spectrum:
+            # Add the parameters of the spectrum that are
+            # provided separately in the bounds or priors
 
-
-            #add parameteres for all individually defined spectrum bounds
             if bounds is not None:
-                for bound_name in [
-                    f"scaling_{item}", 
-                    f"log_scaling_{item}",
-                    f"error_{item}", 
-                    f"radvel_{item}", 
-                    f"offset_{item}"
+                for param_item in [
+                    "scaling",
+                    "log_scaling",
+                    "error",
+                    "radvel",
+                    "offset",
                 ]:
-                    if bound_name in bounds or bound_name in normal_prior:
+                    bound_name = f"{param_item}_{item}"
+
+                    if bound_name in bounds or bound_name in self.normal_prior:
                         self.modelpar.append(bound_name)
 
-            #add parameteres for all collectively defined spectrum bounds
-            if bounds is not None and item in bounds:
-                if bounds[item][0] is not None:
-                    # Add the flux scaling parameter
-                    self.modelpar.append(f"scaling_{item}")
-                    self.bounds[f"scaling_{item}"] = (
-                        bounds[item][0][0],
-                        bounds[item][0][1],
-                    )
+            # Add the parameters of the spectrum that are provided
+            # as tuple with the name of the spectrum as key
 
-                if len(bounds[item]) > 1 and bounds[item][1] is not None:
-                    # Add the error inflation parameters
-                    self.modelpar.append(f"error_{item}")
-                    self.bounds[f"error_{item}"] = (
-                        bounds[item][1][0],
-                        bounds[item][1][1],
-                    )
+            if bounds is not None and item in bounds:
+                for param_idx, param_item in enumerate(SPEC_PARAM):
+                    if (
+                        len(bounds[item]) > param_idx
+                        and bounds[item][param_idx] is not None
+                    ):
+                        bound_name = f"{param_item}_{item}"
 
-                    if self.bounds[f"error_{item}"][1] < 0.0:
-                        warnings.warn(
-                            f"The lower bound of 'error_{item}' is "
-                            "smaller than 0. The error inflation "
-                            "should be given relative to the model "
-                            "fluxes so the boundaries should be "
-                            "larger than 0."
-                        )
+                        self.modelpar.append(bound_name)
 
-                    if self.bounds[f"error_{item}"][1] < 0.0:
-                        warnings.warn(
-                            f"The upper bound of 'error_{item}' is "
-                            "smaller than 0. The error inflation "
-                            "should be given relative to the model "
-                            "fluxes so the boundaries should be "
-                            "larger than 0."
+                        self.bounds[bound_name] = (
+                            bounds[item][param_idx][0],
+                            bounds[item][param_idx][1],
                         )
 
-                if len(bounds[item]) > 2 and bounds[item][2] is not None:
-                    # Add radial velocity parameter (km s-1)
-                    self.modelpar.append(f"radvel_{item}")
-                    self.bounds[f"radvel_{item}"] = (
-                        bounds[item][2][0],
-                        bounds[item][2][1],
-                    )
-
-                if len(bounds[item]) > 3 and bounds[item][3] is not None:
-                    # Add flux offset parameter
-                    self.modelpar.append(f"offset_{item}")
-                    self.bounds[f"offset_{item}"] = (
-                        bounds[item][3][0],
-                        bounds[item][3][1],
-                    )
+                if f"error_{item}" in self.bounds:
+                    for bound_idx, bound_type in enumerate(["lower", "upper"]):
+                        if self.bounds[f"error_{item}"][bound_idx] < 0.0:
+                            warnings.warn(
+                                f"The {bound_type} bound of 'error_{item}' "
+                                "is smaller than 0. The error inflation "
+                                "should be given relative to the model "
+                                "fluxes so the boundaries should be "
+                                "larger than 0."
+                            )
 
                 if item in self.bounds:
                     del self.bounds[item]
@@ -1060,61 +1388,106 @@ class FitModel:
         else:
             self.cross_sections = None
 
+        # Grids with the dust cross sections of the filters (including
+        # the V band as last element) and at the wavelengths of the
+        # spectra, which are interpolated with a single call for all
+        # filters and all spectra. The grid of the spectra is linearly
+        # interpolated to the wavelengths of the data, which gives the
+        # same result as the 3D interpolation since it is separable
+
+        self.cross_phot = None
+        self.cross_spec = None
+
+        if self.cross_sections is not None:
+            dust_points = list(self.cross_sections["Generic/Bessell.V"].grid)
+
+            cross_grid = np.stack(
+                [
+                    self.cross_sections[item].values
+                    for item in self.filter_name + ["Generic/Bessell.V"]
+                ],
+                axis=-1,
+            )
+
+            self.cross_phot = partial(interp_grid_linear, dust_points, cross_grid)
+
+            if "spectrum" in self.cross_sections:
+                dust_wavel = self.cross_sections["spectrum"].grid[0]
+
+                if (
+                    np.amin(self.spec_wavel) < dust_wavel[0]
+                    or np.amax(self.spec_wavel) > dust_wavel[-1]
+                ):
+                    raise ValueError(
+                        "The wavelengths of the spectra are outside the "
+                        "wavelength range of the dust cross sections "
+                        f"({dust_wavel[0]:.2f}-{dust_wavel[-1]:.2f} um)."
+                    )
+
+                cross_values = self.cross_sections["spectrum"].values
+
+                interp_index, interp_weight = linear_interp_weights(
+                    dust_wavel, self.spec_wavel
+                )
+
+                cross_grid = cross_values[interp_index] + interp_weight[
+                    :, np.newaxis, np.newaxis
+                ] * (cross_values[interp_index + 1] - cross_values[interp_index])
+
+                self.cross_spec = partial(
+                    interp_grid_linear,
+                    dust_points,
+                    np.ascontiguousarray(np.moveaxis(cross_grid, 0, -1)),
+                )
+
         if "ism_ext" in self.bounds:
             if self.ext_filter is not None:
-                self.modelpar.append(f"phot_ext_{self.ext_filter}")
-                self.bounds[f"phot_ext_{self.ext_filter}"] = self.bounds["ism_ext"]
+                self.modelpar.append(self.ext_filter_key)
+                self.bounds[self.ext_filter_key] = self.bounds["ism_ext"]
                 del self.bounds["ism_ext"]
 
             else:
                 self.modelpar.append("ism_ext")
 
-        if "ism_red" in self.bounds:
-            self.modelpar.append("ism_red")
-
-        if "veil_a" in self.bounds:
-            self.modelpar.append("veil_a")
-
-        if "veil_b" in self.bounds:
-            self.modelpar.append("veil_b")
-
-        if "veil_ref" in self.bounds:
-            self.modelpar.append("veil_ref")
+        for item in OPTIONAL_PARAM:
+            if item in self.bounds:
+                self.modelpar.append(item)
 
-        if "lin_a" in self.bounds:
-            self.modelpar.append("lin_a")
-        
-        if "lin_b" in self.bounds:
-            self.modelpar.append("lin_b")
+        # Include prior flux ratio when fitting. The interpolated
+        # grids of the photometry are reused for the flux ratios
+        # such that a grid is only interpolated once per filter
 
-        if "gtotd_rinn" in self.bounds:
-            self.modelpar.append("gtotd_rinn")
-        
-        if "gtotd_rout" in self.bounds:
-            self.modelpar.append("gtotd_rout")
+        self.flux_ratio = {}
+        ratio_filters = []
 
-        if "gtotd_incl" in self.bounds:
-            self.modelpar.append("gtotd_incl")
+        for param_item in list(self.bounds) + list(self.normal_prior):
+            if param_item.startswith("ratio_"):
+                filter_name = param_item[6:]
 
-        # Include prior flux ratio when fitting
+                if filter_name in self.flux_ratio or filter_name in ratio_filters:
+                    continue
 
-        self.flux_ratio = {}
+                if (
+                    self.model not in ["planck", "powerlaw"]
+                    and filter_name in self.filter_name
+                ):
+                    phot_idx = self.filter_name.index(filter_name)
+                    self.flux_ratio[filter_name] = self.modelphot[phot_idx]
 
-        for param_item in self.bounds:
-            if param_item[:6] == "ratio_":
-                print(f"Interpolating {param_item[6:]}...", end="", flush=True)
-                read_model = ReadModel(self.model, filter_name=param_item[6:])
-                read_model.interpolate_grid(wavel_resample=None, spec_res=None)
-                self.flux_ratio[param_item[6:]] = read_model
-                print(" [DONE]")
+                else:
+                    ratio_filters.append(filter_name)
+
+        interp_ratio = self._interpolate_grids(
+            self.model,
+            [
+                {"filter_name": item, "teff_range": self.teff_range}
+                for item in ratio_filters
+            ],
+            [{} for _ in ratio_filters],
+            "flux ratios",
+        )
 
-        for param_item in self.normal_prior:
-            if param_item[:6] == "ratio_":
-                print(f"Interpolating {param_item[6:]}...", end="", flush=True)
-                read_model = ReadModel(self.model, filter_name=param_item[6:])
-                read_model.interpolate_grid(wavel_resample=None, spec_res=None)
-                self.flux_ratio[param_item[6:]] = read_model
-                print(" [DONE]")
+        self.flux_ratio.update(zip(ratio_filters, interp_ratio))
 
         self.fix_param = {}
         del_param = []
@@ -1161,113 +1534,462 @@ class FitModel:
 
         # Create a dictionary with the cube indices of the parameters
 
-        self.cube_index = {}
-        for i, item in enumerate(self.modelpar):
-            self.cube_index[item] = i
+        self.cube_index = {item: i for i, item in enumerate(self.modelpar)}
+
+        # Lists with the names and cube indices of the free
+        # parameters and dictionaries with the fixed parameters
+        # for each type of parameter, such that the parameter
+        # names are only parsed once instead of with every
+        # call of the likelihood function
+
+        param_groups = [
+            "spec_scaling",
+            "spec_log_scaling",
+            "spec_offset",
+            "err_scaling",
+            "rad_vel",
+            "corr_len",
+            "corr_amp",
+            "phot_scaling",
+            "dust_param",
+            "veil_param",
+            "param_dict",
+        ]
 
-        # Weighting of the photometric and spectroscopic data
+        self.param_index = {}
+        self.param_fix = {}
 
-        print("\nWeights for the log-likelihood function:")
+        for item in param_groups:
+            self.param_index[item] = []
+            self.param_fix[item] = {}
 
-        if isinstance(apply_weights, bool):
-            self.weights = {}
+        for item in self.bounds:
+            if item[:8] == "scaling_" and item[8:] in self.spectrum:
+                param_key = ("spec_scaling", item[8:])
 
-            if apply_weights:
-                for spec_item in inc_spec:
-                    spec_size = self.spectrum[spec_item][0].shape[0]
+            elif item[:12] == "log_scaling_" and item[12:] in self.spectrum:
+                param_key = ("spec_log_scaling", item[12:])
 
-                    if spec_item not in self.weights:
-                        # Set weight for spectrum to lambda/R
-                        spec_wavel = self.spectrum[spec_item][0][:, 0]
-                        spec_res = self.spectrum[spec_item][3]
-                        self.weights[spec_item] = spec_wavel / spec_res
+            elif item[:7] == "offset_" and item[7:] in self.spectrum:
+                param_key = ("spec_offset", item[7:])
 
-                    elif not isinstance(self.weights[spec_item], np.ndarray):
-                        self.weights[spec_item] = np.full(
-                            spec_size, self.weights[spec_item]
-                        )
+            elif item[:6] == "error_" and item[6:] in self.spectrum:
+                param_key = ("err_scaling", item[6:])
 
-                    if np.all(self.weights[spec_item] == self.weights[spec_item][0]):
-                        print(f"   - {spec_item} = {self.weights[spec_item][0]:.2e}")
+            elif item[:7] == "radvel_":
+                param_key = ("rad_vel", item[7:])
 
-                    else:
-                        print(
-                            f"   - {spec_item} = {np.amin(self.weights[spec_item]):.2e} "
-                            f"- {np.amax(self.weights[spec_item]):.2e}"
-                        )
+            elif item[:9] == "corr_len_" and item[9:] in self.spectrum:
+                param_key = ("corr_len", item[9:])
 
-                for phot_item in inc_phot:
-                    if phot_item not in self.weights:
-                        # Set weight for photometry to FWHM of filter
-                        read_filt = ReadFilter(phot_item)
-                        self.weights[phot_item] = read_filt.filter_fwhm()
-                        print(f"   - {phot_item} = {self.weights[phot_item]:.2e}")
+            elif item[:9] == "corr_amp_" and item[9:] in self.spectrum:
+                param_key = ("corr_amp", item[9:])
 
-            else:
-                for spec_item in inc_spec:
-                    spec_size = self.spectrum[spec_item][0].shape[0]
-                    self.weights[spec_item] = np.full(spec_size, 1.0)
-                    print(f"   - {spec_item} = {self.weights[spec_item][0]:.2f}")
+            elif item[-6:] == "_error" and item[:-6] in self.filter_name:
+                param_key = ("phot_scaling", item[:-6])
 
-                for phot_item in inc_phot:
-                    # Set weight to 1 if apply_weights=False
-                    self.weights[phot_item] = 1.0
-                    print(f"   - {phot_item} = {self.weights[phot_item]:.2f}")
+            elif item[-6:] == "_error" and item[:-6] in self.instr_name:
+                param_key = ("phot_scaling", item[:-6])
 
-        else:
-            self.weights = apply_weights
+            elif item[:8] == "lognorm_":
+                param_key = ("dust_param", item)
 
-            for spec_item in inc_spec:
-                spec_size = self.spectrum[spec_item][0].shape[0]
+            elif item[:9] == "powerlaw_":
+                param_key = ("dust_param", item)
 
-                if spec_item not in self.weights:
-                    # Set weight for spectrum to lambda/R
-                    spec_wavel = self.spectrum[spec_item][0][:, 0]
-                    spec_res = self.spectrum[spec_item][3]
-                    self.weights[spec_item] = spec_wavel / spec_res
+            elif item[:4] == "ism_":
+                param_key = ("dust_param", item)
 
-                elif not isinstance(self.weights[spec_item], np.ndarray):
-                    self.weights[spec_item] = np.full(
-                        spec_size, self.weights[spec_item]
-                    )
+            elif item == self.ext_filter_key:
+                param_key = ("dust_param", item)
 
-                if np.all(self.weights[spec_item] == self.weights[spec_item][0]):
-                    print(f"   - {spec_item} = {self.weights[spec_item][0]:.2e}")
+            elif item in ["veil_a", "veil_b", "veil_ref"]:
+                param_key = ("veil_param", item)
 
-                else:
-                    print(
-                        f"   - {spec_item} = {np.amin(self.weights[spec_item]):.2e} "
-                        f"- {np.amax(self.weights[spec_item]):.2e}"
-                    )
+            elif item == "spec_weight":
+                continue
 
-            for phot_item in inc_phot:
-                if phot_item not in self.weights:
-                    # Set weight for photometry to FWHM of filter
-                    read_filt = ReadFilter(phot_item)
-                    self.weights[phot_item] = read_filt.filter_fwhm()
+            else:
+                param_key = ("param_dict", item)
 
-                print(f"   - {phot_item} = {self.weights[phot_item]:.2e}")
+            self.param_index[param_key[0]].append((param_key[1], self.cube_index[item]))
 
-    @typechecked
-    def _prior_transform(
-        self, cube, bounds: Dict[str, Tuple[float, float]], cube_index: Dict[str, int]
-    ):
-        """
-        Function to transform the sampled unit cube into a
-        cube with sampled model parameters.
+        for key, value in self.fix_param.items():
+            if key[:8] == "scaling_" and key[8:] in self.spectrum:
+                self.param_fix["spec_scaling"][key[8:]] = value
 
-        Parameters
-        ----------
-        cube : LP_c_double, np.ndarray
-            Unit cube.
-        bounds : dict(str, tuple(float, float))
-            Dictionary with the prior boundaries.
-        cube_index : dict(str, int)
-            Dictionary with the indices for selecting the model
-            parameters in the ``cube``.
+            elif key[:12] == "log_scaling_" and key[12:] in self.spectrum:
+                self.param_fix["spec_log_scaling"][key[12:]] = value
 
-        Returns
-        -------
+            elif key[:7] == "offset_" and key[7:] in self.spectrum:
+                self.param_fix["spec_offset"][key[7:]] = value
+
+            elif key[:6] == "error_" and key[6:] in self.spectrum:
+                self.param_fix["err_scaling"][key[6:]] = value
+
+            elif key[:7] == "radvel_" and key[7:] in self.spectrum:
+                self.param_fix["rad_vel"][key[7:]] = value
+
+            elif key[:9] == "corr_len_" and key[9:] in self.spectrum:
+                self.param_fix["corr_len"][key[9:]] = value
+
+            elif key[:9] == "corr_amp_" and key[9:] in self.spectrum:
+                self.param_fix["corr_amp"][key[9:]] = value
+
+            elif key[:8] == "lognorm_":
+                self.param_fix["dust_param"][key] = value
+
+            elif key[:9] == "powerlaw_":
+                self.param_fix["dust_param"][key] = value
+
+            elif key[:4] == "ism_":
+                self.param_fix["dust_param"][key] = value
+
+            elif key[:9] == "phot_ext_":
+                self.param_fix["dust_param"][key] = value
+
+            elif key == "spec_weight":
+                pass
+
+            else:
+                self.param_fix["param_dict"][key] = value
+
+        # Names of the error inflation parameters of the filters,
+        # which are either the filter name or the instrument name
+
+        phot_error = [item[0] for item in self.param_index["phot_scaling"]]
+
+        self.phot_error_key = []
+
+        for filter_item, instr_item in zip(self.filter_name, self.instr_name):
+            if filter_item in phot_error:
+                self.phot_error_key.append(filter_item)
+
+            elif instr_item in phot_error:
+                self.phot_error_key.append(instr_item)
+
+            else:
+                self.phot_error_key.append(None)
+
+        # Flattened arrays with the fluxes and uncertainties of the
+        # photometric data, which include multiple measurements of
+        # the same filter, and the indices of the filters
+
+        phot_data = [
+            (i, flux_item, error_item)
+            for i, obj_item in enumerate(self.objphot)
+            for flux_item, error_item in zip(
+                np.atleast_1d(obj_item[0]), np.atleast_1d(obj_item[1])
+            )
+        ]
+
+        self.phot_index = np.array([item[0] for item in phot_data], dtype=int)
+        self.phot_data_flux = np.array([item[1] for item in phot_data], dtype=float)
+        self.phot_data_error = np.array([item[2] for item in phot_data], dtype=float)
+
+        # Default values of the spectrum parameters that are neither
+        # fitted nor fixed, which are added to the fixed parameters
+
+        spec_default = {
+            "spec_scaling": 1.0,
+            "spec_log_scaling": 0.0,
+            "spec_offset": 0.0,
+            "err_scaling": None,
+        }
+
+        for param_key, default_value in spec_default.items():
+            param_fit = [item[0] for item in self.param_index[param_key]]
+
+            for spec_item in self.spectrum:
+                if (
+                    spec_item not in param_fit
+                    and spec_item not in self.param_fix[param_key]
+                ):
+                    self.param_fix[param_key][spec_item] = default_value
+
+        # Names of the disk parameters and pairs of parameter names
+        # for the ordering checks of the blackbody and disk components.
+        # A sample is rejected if the first parameter of a pair is
+        # larger than the second parameter
+
+        if self.n_disk == 1:
+            self.disk_keys = [("disk_teff", "disk_radius")]
+
+        else:
+            self.disk_keys = []
+
+            for i in range(self.n_disk):
+                self.disk_keys.append((f"disk_teff_{i}", f"disk_radius_{i}"))
+
+        self.param_order = []
+
+        for i in range(self.n_planck - 1):
+            self.param_order.append((f"teff_{i+1}", f"teff_{i}"))
+            self.param_order.append((f"radius_{i}", f"radius_{i+1}"))
+
+        # The disk temperatures/radii should be decreasing/increasing,
+        # starting with a comparison with the atmosphere parameters
+
+        for i, (teff_key, radius_key) in enumerate(self.disk_keys):
+            if i == 0:
+                self.param_order.append((teff_key, "teff"))
+                self.param_order.append(("radius", radius_key))
+
+            else:
+                self.param_order.append((teff_key, self.disk_keys[i - 1][0]))
+                self.param_order.append((self.disk_keys[i - 1][1], radius_key))
+
+        # Optional components of the model, which are fixed
+        # for a fit, such that the likelihood function does
+        # not need to check the parameter names with every call
+
+        self.fit_vsini = "vsini" in self.cube_index
+        self.fit_lin = "lin_a" in self.cube_index and "lin_b" in self.cube_index
+
+        self.fit_gtotd = (
+            "gtotd_rinn" in self.cube_index
+            and "gtotd_rout" in self.cube_index
+            and "gtotd_incl" in self.cube_index
+        )
+
+        # Labels of the scaling parameters of the spectra,
+        # which are stored with the posterior samples
+
+        self.spec_labels = [
+            f"scaling_{item}"
+            for item in self.spectrum
+            if f"scaling_{item}" in self.bounds
+        ]
+
+        # Attributes that are stored with the posterior samples,
+        # apart from the evidence which is added by the sampler
+
+        self.attr_dict = {
+            "spec_type": "model",
+            "spec_name": self.model,
+            "parallax": self.obj_parallax[0],
+        }
+
+        if self.ext_filter is not None:
+            self.attr_dict["ext_filter"] = self.ext_filter
+
+        # Arrays with the parameters of the uniform and normal
+        # priors, which are used by the prior transform instead
+        # of the dictionaries. The uniform transform is applied
+        # to all parameters, with a lower bound of 0 and a width
+        # of 1 for the parameters with a normal prior
+
+        self.normal_index = []
+
+        self.uniform_low = np.zeros(len(self.modelpar))
+        self.uniform_width = np.ones(len(self.modelpar))
+
+        for i, item in enumerate(self.modelpar):
+            if item in self.normal_prior:
+                self.normal_index.append(i)
+
+            else:
+                self.uniform_low[i] = self.bounds[item][0]
+                self.uniform_width[i] = self.bounds[item][1] - self.bounds[item][0]
+
+        self.normal_index = np.array(self.normal_index, dtype=int)
+
+        self.normal_mean = np.array(
+            [self.normal_prior[self.modelpar[i]][0] for i in self.normal_index]
+        )
+
+        self.normal_sigma = np.array(
+            [self.normal_prior[self.modelpar[i]][1] for i in self.normal_index]
+        )
+
+        # Weighting of the photometric and spectroscopic data
+
+        print("\nWeights for the log-likelihood function:")
+
+        if isinstance(apply_weights, bool) and not apply_weights:
+            self.weights = {}
+
+            for spec_item in inc_spec:
+                spec_size = self.spectrum[spec_item][0].shape[0]
+                self.weights[spec_item] = np.full(spec_size, 1.0)
+                print(f"   - {spec_item} = {self.weights[spec_item][0]:.2f}")
+
+            for phot_item in inc_phot:
+                # Set weight to 1 if apply_weights=False
+                self.weights[phot_item] = 1.0
+                print(f"   - {phot_item} = {self.weights[phot_item]:.2f}")
+
+        else:
+            if isinstance(apply_weights, bool):
+                self.weights = {}
+            else:
+                self.weights = apply_weights
+
+            for spec_item in inc_spec:
+                spec_size = self.spectrum[spec_item][0].shape[0]
+
+                if spec_item not in self.weights:
+                    # Set weight for spectrum to lambda/R
+                    spec_wavel = self.spectrum[spec_item][0][:, 0]
+                    spec_res = self.spectrum[spec_item][3]
+                    self.weights[spec_item] = spec_wavel / spec_res
+
+                elif not isinstance(self.weights[spec_item], np.ndarray):
+                    self.weights[spec_item] = np.full(
+                        spec_size, self.weights[spec_item]
+                    )
+
+                spec_weight = self.weights[spec_item]
+
+                if spec_weight[0] == spec_weight[-1] and np.ptp(spec_weight) == 0.0:
+                    print(f"   - {spec_item} = {spec_weight[0]:.2e}")
+
+                else:
+                    print(
+                        f"   - {spec_item} = {np.amin(spec_weight):.2e} "
+                        f"- {np.amax(spec_weight):.2e}"
+                    )
+
+            for phot_item in inc_phot:
+                if phot_item not in self.weights:
+                    # Set weight for photometry to FWHM of filter
+                    self.weights[phot_item] = _filter_fwhm(phot_item)
+
+                print(f"   - {phot_item} = {self.weights[phot_item]:.2e}")
+
+        self.phot_weight = np.array(
+            [self.weights[item] for item in self.filter_name], dtype=float
+        )
+
+    @typechecked
+    def _interpolate_grids(
+        self,
+        model: str,
+        grid_kwargs: List[dict],
+        interp_kwargs: List[dict],
+        grid_label: str,
+    ) -> List[ReadModel]:
+        """
+        Internal function for interpolating the model grids of
+        multiple filters or spectra. The grids are interpolated
+        in parallel if ``n_proc`` is larger than 1.
+
+        Parameters
+        ----------
+        model : str
+            Name of the atmospheric model.
+        grid_kwargs : list(dict)
+            List with the keyword arguments for
+            :class:`~species.read.read_model.ReadModel`.
+        interp_kwargs : list(dict)
+            List with the keyword arguments for
+            :func:`~species.read.read_model.ReadModel.interpolate_grid`.
+        grid_label : str
+            Label of the grids that is shown with the progress bar.
+
+        Returns
+        -------
+        list(species.read.read_model.ReadModel)
+            List with the interpolated models.
+        """
+
+        read_models = []
+
+        if len(grid_kwargs) == 0:
+            return read_models
+
+        # A single progress bar for all grids instead
+        # of printing a line for each filter or spectrum
+
+        progress = tqdm(
+            total=len(grid_kwargs), desc=f"Interpolating {grid_label}", unit="grid"
+        )
+
+        if self.n_proc > 1 and len(grid_kwargs) > 1:
+            with ProcessPoolExecutor(max_workers=self.n_proc) as executor:
+                interp_jobs = [
+                    executor.submit(_create_interp, model, grid_item, interp_item)
+                    for grid_item, interp_item in zip(grid_kwargs, interp_kwargs)
+                ]
+
+                for interp_job in interp_jobs:
+                    read_models.append(interp_job.result())
+                    progress.update()
+
+        else:
+            for grid_item, interp_item in zip(grid_kwargs, interp_kwargs):
+                read_models.append(_create_interp(model, grid_item, interp_item))
+                progress.update()
+
+        progress.close()
+
+        return read_models
+
+    @typechecked
+    def _check_grid_bounds(
+        self, param_key: str, grid_bounds: Tuple[float, float]
+    ) -> None:
+        """
+        Internal function for adjusting the prior boundaries of a
+        parameter to the boundaries of the model grid.
+
+        Parameters
+        ----------
+        param_key : str
+            Parameter name in the ``bounds`` dictionary.
+        grid_bounds : tuple(float, float)
+            Boundaries of the parameter in the model grid.
+
+        Returns
+        -------
+        NoneType
+            None
+        """
+
+        bound_low, bound_high = self.bounds[param_key]
+
+        if bound_low < grid_bounds[0]:
+            warnings.warn(
+                f"The lower bound on {param_key} "
+                f"({bound_low}) is smaller than "
+                f"the lower bound from the available "
+                f"{self.model} model grid "
+                f"({grid_bounds[0]}). The lower bound "
+                f"of the {param_key} prior will be adjusted to "
+                f"{grid_bounds[0]}."
+            )
+
+            bound_low = grid_bounds[0]
+
+        if bound_high > grid_bounds[1]:
+            warnings.warn(
+                f"The upper bound on {param_key} "
+                f"({bound_high}) is larger than the "
+                f"upper bound from the available {self.model} "
+                f"model grid ({grid_bounds[1]}). The "
+                f"bound of the {param_key} prior will be adjusted "
+                f"to {grid_bounds[1]}."
+            )
+
+            bound_high = grid_bounds[1]
+
+        self.bounds[param_key] = (bound_low, bound_high)
+
+    @typechecked
+    def _prior_transform(self, cube):
+        """
+        Function to transform the sampled unit cube into a
+        cube with sampled model parameters.
+
+        Parameters
+        ----------
+        cube : LP_c_double, np.ndarray
+            Unit cube. A 2D array with a unit cube in each row
+            is also supported, as used by the vectorized mode
+            of ``UltraNest``.
+
+        Returns
+        -------
         np.ndarray
             Cube with the sampled model parameters.
         """
@@ -1277,28 +1999,23 @@ class FitModel:
             param_out = cube.copy()
         else:
             # Convert from ctypes.c_double to np.ndarray
-            # Only required with MultiNest
-            # n_modelpar = len(self.modelpar)
-            # cube = np.ctypeslib.as_array(cube, shape=(n_modelpar,))
+            # Only required with MultiNest. The array
+            # shares the memory of the cube, so the
+            # same object is used with MultiNest
+            n_modelpar = len(self.modelpar)
+            param_out = np.ctypeslib.as_array(cube, shape=(n_modelpar,))
 
-            # Use the same object with MultiNest
-            param_out = cube
+        # Uniform priors
 
-        for item in cube_index:
-            if item in self.normal_prior:
-                # Gaussian prior
-                param_out[cube_index[item]] = stats.norm.ppf(
-                    param_out[cube_index[item]],
-                    loc=self.normal_prior[item][0],
-                    scale=self.normal_prior[item][1],
-                )
+        param_out *= self.uniform_width
+        param_out += self.uniform_low
 
-            else:
-                # Uniform prior
-                param_out[cube_index[item]] = (
-                    bounds[item][0]
-                    + (bounds[item][1] - bounds[item][0]) * param_out[cube_index[item]]
-                )
+        # Gaussian priors
+
+        if self.normal_index.size > 0:
+            param_out[..., self.normal_index] = self.normal_mean + (
+                self.normal_sigma * ndtri(param_out[..., self.normal_index])
+            )
 
         return param_out
 
@@ -1322,111 +2039,56 @@ class FitModel:
             Log-likelihood.
         """
 
-        # Initilize dictionaries for different parameter types
-
-        spec_scaling = {}
-        spec_log_scaling = {}
-        spec_offset = {}
-        phot_scaling = {}
-        err_scaling = {}
-        corr_len = {}
-        corr_amp = {}
-        dust_param = {}
-        veil_param = {}
-        param_dict = {}
-        rad_vel = {}
-
-        for item in self.bounds:
-            # Add the parameters from the params to their dictionaries
-
-            if item[:8] == "scaling_" and item[8:] in self.spectrum:
-                spec_scaling[item[8:]] = params[self.cube_index[item]]
-            
-            elif item[:12] == "log_scaling_" and item[12:] in self.spectrum:
-                spec_log_scaling[item[12:]] = params[self.cube_index[item]]
-            
-            elif item[:7] == "offset_" and item[7:] in self.spectrum:
-                spec_offset[item[7:]] = params[self.cube_index[item]]
-
-            elif item[:6] == "error_" and item[6:] in self.spectrum:
-                err_scaling[item[6:]] = params[self.cube_index[item]]
-
-            elif item[:7] == "radvel_":
-                rad_vel[item[7:]] = params[self.cube_index[item]]
-
-            elif item[:9] == "corr_len_" and item[9:] in self.spectrum:
-                corr_len[item[9:]] = 10.0 ** params[self.cube_index[item]]  # (um)
-
-            elif item[:9] == "corr_amp_" and item[9:] in self.spectrum:
-                corr_amp[item[9:]] = params[self.cube_index[item]]
-
-            elif item[-6:] == "_error" and item[:-6] in self.filter_name:
-                phot_scaling[item[:-6]] = params[self.cube_index[item]]
+        # Dictionaries with the free and fixed parameters of each
+        # type, which are selected with the precomputed indices
 
-            elif item[-6:] == "_error" and item[:-6] in self.instr_name:
-                phot_scaling[item[:-6]] = params[self.cube_index[item]]
+        param_dict = {key: params[idx] for key, idx in self.param_index["param_dict"]}
+        param_dict.update(self.param_fix["param_dict"])
 
-            elif item[:8] == "lognorm_":
-                dust_param[item] = params[self.cube_index[item]]
+        # Check if the blackbody and disk temperatures/radii are
+        # decreasing/increasing before creating the other dictionaries
 
-            elif item[:9] == "powerlaw_":
-                dust_param[item] = params[self.cube_index[item]]
-
-            elif item[:4] == "ism_":
-                dust_param[item] = params[self.cube_index[item]]
+        for key_high, key_low in self.param_order:
+            if param_dict[key_high] > param_dict[key_low]:
+                return -np.inf
 
-            elif self.ext_filter is not None and item == f"phot_ext_{self.ext_filter}":
-                dust_param[item] = params[self.cube_index[item]]
+        spec_scaling = {
+            key: params[idx] for key, idx in self.param_index["spec_scaling"]
+        }
+        spec_scaling.update(self.param_fix["spec_scaling"])
 
-            elif item == "veil_a":
-                veil_param["veil_a"] = params[self.cube_index[item]]
+        spec_log_scaling = {
+            key: params[idx] for key, idx in self.param_index["spec_log_scaling"]
+        }
+        spec_log_scaling.update(self.param_fix["spec_log_scaling"])
 
-            elif item == "veil_b":
-                veil_param["veil_b"] = params[self.cube_index[item]]
+        spec_offset = {key: params[idx] for key, idx in self.param_index["spec_offset"]}
+        spec_offset.update(self.param_fix["spec_offset"])
 
-            elif item == "veil_ref":
-                veil_param["veil_ref"] = params[self.cube_index[item]]
+        err_scaling = {key: params[idx] for key, idx in self.param_index["err_scaling"]}
+        err_scaling.update(self.param_fix["err_scaling"])
 
-            elif item == "spec_weight":
-                pass
+        rad_vel = {key: params[idx] for key, idx in self.param_index["rad_vel"]}
+        rad_vel.update(self.param_fix["rad_vel"])
 
-            else:
-                param_dict[item] = params[self.cube_index[item]]
+        corr_len = {
+            key: 10.0 ** params[idx] for key, idx in self.param_index["corr_len"]
+        }
+        corr_len.update(self.param_fix["corr_len"])
 
-        # Disk parameters
+        corr_amp = {key: params[idx] for key, idx in self.param_index["corr_amp"]}
+        corr_amp.update(self.param_fix["corr_amp"])
 
-        disk_param = {}
+        phot_scaling = {
+            key: params[idx] for key, idx in self.param_index["phot_scaling"]
+        }
+        phot_scaling.update(self.param_fix["phot_scaling"])
 
-        if self.n_disk == 1:
-            if "disk_teff" in self.fix_param:
-                disk_param["teff"] = self.fix_param["disk_teff"]
-            else:
-                disk_param["teff"] = params[self.cube_index["disk_teff"]]
+        dust_param = {key: params[idx] for key, idx in self.param_index["dust_param"]}
+        dust_param.update(self.param_fix["dust_param"])
 
-            if "disk_radius" in self.fix_param:
-                disk_param["radius"] = self.fix_param["disk_radius"]
-            else:
-                disk_param["radius"] = params[self.cube_index["disk_radius"]]
-
-        elif self.n_disk > 1:
-            for disk_idx in range(self.n_disk):
-                if f"disk_teff_{disk_idx}" in self.fix_param:
-                    disk_param[f"teff_{disk_idx}"] = self.fix_param[
-                        f"disk_teff_{disk_idx}"
-                    ]
-                else:
-                    disk_param[f"teff_{disk_idx}"] = params[
-                        self.cube_index[f"disk_teff_{disk_idx}"]
-                    ]
-
-                if f"disk_radius_{disk_idx}" in self.fix_param:
-                    disk_param[f"radius_{disk_idx}"] = self.fix_param[
-                        f"disk_radius_{disk_idx}"
-                    ]
-                else:
-                    disk_param[f"radius_{disk_idx}"] = params[
-                        self.cube_index[f"disk_radius_{disk_idx}"]
-                    ]
+        veil_param = {key: params[idx] for key, idx in self.param_index["veil_param"]}
+        veil_param.update(self.param_fix["veil_param"])
 
         # Add the parallax manually because it should
         # not be provided in the bounds dictionary
@@ -1453,89 +2115,21 @@ class FitModel:
             else:
                 parallax = None
 
-        for item in self.fix_param:
-            # Add the fixed parameters to their dictionaries
-
-            if item[:8] == "scaling_" and item[8:] in self.spectrum:
-                spec_scaling[item[8:]] = self.fix_param[item]
-
-            elif item[:12] == "log_scaling_" and item[12:] in self.spectrum:
-                spec_log_scaling[item[12:]] = self.fix_param[item]
-
-            elif item[:7] == "offset_" and item[7:] in self.spectrum:
-                spec_offset[item[7:]] = self.fix_param[item]
-
-            elif item[:6] == "error_" and item[6:] in self.spectrum:
-                err_scaling[item[6:]] = self.fix_param[item]
+        # Temperatures and flux scaling of the disk components, such
+        # that all components are interpolated with a single call
 
-            elif item[:7] == "radvel_" and item[7:] in self.spectrum:
-                rad_vel[item[7:]] = self.fix_param[item]
-
-            elif item[:9] == "corr_len_" and item[9:] in self.spectrum:
-                corr_len[item[9:]] = self.fix_param[item]  # (um)
-
-            elif item[:9] == "corr_amp_" and item[9:] in self.spectrum:
-                corr_amp[item[9:]] = self.fix_param[item]
-
-            elif item[:8] == "lognorm_":
-                dust_param[item] = self.fix_param[item]
-
-            elif item[:9] == "powerlaw_":
-                dust_param[item] = self.fix_param[item]
-
-            elif item[:4] == "ism_":
-                dust_param[item] = self.fix_param[item]
-
-            elif item[:9] == "phot_ext_":
-                dust_param[item] = self.fix_param[item]
-
-            elif item == "spec_weight":
-                pass
-
-            else:
-                param_dict[item] = self.fix_param[item]
-
-        # Check if the blackbody temperatures/radii are decreasing/increasing
-
-        if self.model == "planck" and self.n_planck > 1:
-            for i in range(self.n_planck - 1):
-                if param_dict[f"teff_{i+1}"] > param_dict[f"teff_{i}"]:
-                    return -np.inf
-
-                if param_dict[f"radius_{i}"] > param_dict[f"radius_{i+1}"]:
-                    return -np.inf
-
-        if self.n_disk == 1:
-            if disk_param["teff"] > param_dict["teff"]:
-                return -np.inf
-
-            if disk_param["radius"] < param_dict["radius"]:
-                return -np.inf
-
-        elif self.n_disk > 1:
-            for disk_idx in range(self.n_disk):
-                if disk_idx == 0:
-                    if disk_param["teff_0"] > param_dict["teff"]:
-                        return -np.inf
-
-                    if disk_param["radius_0"] < param_dict["radius"]:
-                        return -np.inf
-
-                else:
-                    if (
-                        disk_param[f"teff_{disk_idx}"]
-                        > disk_param[f"teff_{disk_idx-1}"]
-                    ):
-                        return -np.inf
+        if self.n_disk > 0:
+            disk_teff = np.array([[param_dict[item[0]]] for item in self.disk_keys])
+            disk_radius = np.array([param_dict[item[1]] for item in self.disk_keys])
 
-                    if (
-                        disk_param[f"radius_{disk_idx}"]
-                        < disk_param[f"radius_{disk_idx-1}"]
-                    ):
-                        return -np.inf
+            disk_scaling = (disk_radius * constants.R_JUP) ** 2 / (
+                1e3 * constants.PARSEC / parallax
+            ) ** 2
 
         # for the gtotd emission, store the radius. Ugly, but it works.
-        radius_copy = param_dict["radius"]
+        # The radius is not a parameter when fitting a binary or
+        # a flux scaling, in which case gtotd can not be used
+        radius_copy = param_dict.get("radius")
 
         if self.model != "powerlaw":
             if "radius_0" in param_dict and "radius_1" in param_dict:
@@ -1587,34 +2181,52 @@ class FitModel:
                 else:
                     flux_offset = 0.0
 
-        for item in self.spectrum:
-            if item not in spec_scaling:
-                spec_scaling[item] = 1.0
-
-            if item not in spec_log_scaling:
-                spec_log_scaling[item] = 0.0
-
-            if item not in spec_offset:
-                spec_offset[item] = 0.0
-
-            if item not in err_scaling:
-                err_scaling[item] = None
-
         if self.param_interp is not None:
             # Sort the parameters in the correct order for
             # spectrum_interp because spectrum_interp creates
             # a list in the order of the keys in param_dict
-            param_tmp = param_dict.copy()
+            param_dict = {item: param_dict[item] for item in self.param_interp}
+
+            # Array with the parameter values for spectrum_interp,
+            # which is the same for all filters and spectra
+            param_values = np.array(list(param_dict.values()))
+
+        if self.binary:
+            # Parameters of the two stars for spectrum_interp, which
+            # are the same for all filters and spectra. Both stars
+            # are interpolated with a single call of spectrum_interp
+            param_binary = np.array(
+                [
+                    [param_dict[item] for item in self.binary_keys[0]],
+                    [param_dict[item] for item in self.binary_keys[1]],
+                ]
+            )
 
-            param_dict = {}
-            for item in self.param_interp:
-                param_dict[item] = param_tmp[item]
+            # Flux scaling, flux offset, and weight of the two stars,
+            # which are also the same for all filters and spectra
+
+            if "radius" in self.cube_index:
+                binary_scaling = np.array([flux_scaling, flux_scaling])
+                binary_offset = flux_offset
+
+            elif "radius_0" in self.cube_index:
+                binary_scaling = np.array([flux_scaling_0, flux_scaling_1])
+                binary_offset = flux_offset
+
+            else:
+                binary_scaling = np.ones(2)
+                binary_offset = 0.0
+
+            if "spec_weight" in self.cube_index:
+                binary_weight = params[self.cube_index["spec_weight"]]
+            else:
+                binary_weight = None
 
         ln_like = 0.0
 
         for key, value in self.normal_prior.items():
             if key == "mass":
-                if "logg" in self.modelpar and "radius" in self.modelpar:
+                if "logg" in self.cube_index and "radius" in self.cube_index:
                     mass = logg_to_mass(
                         params[self.cube_index["logg"]],
                         params[self.cube_index["radius"]],
@@ -1623,58 +2235,42 @@ class FitModel:
                     ln_like += -0.5 * (mass - value[0]) ** 2 / value[1] ** 2
 
                 else:
-                    if "logg" not in self.modelpar:
+                    if "logg" not in self.cube_index:
                         warnings.warn(
                             "The 'logg' parameter is not used "
                             f"by the '{self.model}' model so "
                             "the mass prior can not be applied."
                         )
 
-                    if "radius" not in self.modelpar:
+                    if "radius" not in self.cube_index:
                         warnings.warn(
                             "The 'radius' parameter is not fitted "
                             "so the mass prior can not be applied."
                         )
 
-            elif key[:6] == "ratio_":
-                filter_name = key[6:]
-
-                param_0 = binary_to_single(param_dict, 0)
-
-                phot_flux_0 = self.flux_ratio[filter_name].spectrum_interp(
-                    list(param_0.values())
-                )[0][0]
+            elif key.startswith("ratio_"):
+                phot_flux_0, phot_flux_1 = self.flux_ratio[key[6:]].spectrum_interp(
+                    param_binary
+                )[:, 0]
 
                 phot_flux_0 *= flux_scaling_0
-
-                param_1 = binary_to_single(param_dict, 1)
-
-                phot_flux_1 = self.flux_ratio[filter_name].spectrum_interp(
-                    list(param_1.values())
-                )[0][0]
-
                 phot_flux_1 *= flux_scaling_1
 
+                flux_ratio = phot_flux_1 / phot_flux_0
+
                 # Uniform prior for the flux ratio
 
-                if f"ratio_{filter_name}" in self.bounds:
-                    ratio_prior = self.bounds[f"ratio_{filter_name}"]
+                if key in self.bounds:
+                    ratio_prior = self.bounds[key]
 
-                    if ratio_prior[0] > phot_flux_1 / phot_flux_0:
+                    if ratio_prior[0] > flux_ratio:
                         return -np.inf
-                    elif ratio_prior[1] < phot_flux_1 / phot_flux_0:
+                    elif ratio_prior[1] < flux_ratio:
                         return -np.inf
 
                 # Normal prior for the flux ratio
 
-                if f"ratio_{filter_name}" in self.normal_prior:
-                    ratio_prior = self.normal_prior[f"ratio_{filter_name}"]
-
-                    ln_like += (
-                        -0.5
-                        * (phot_flux_1 / phot_flux_0 - ratio_prior[0]) ** 2
-                        / ratio_prior[1] ** 2
-                    )
+                ln_like += -0.5 * (flux_ratio - value[0]) ** 2 / value[1] ** 2
 
             else:
                 ln_like += (
@@ -1683,36 +2279,70 @@ class FitModel:
                     / value[1] ** 2
                 )
 
-        if "lognorm_ext" in dust_param:
-            cross_tmp = self.cross_sections["Generic/Bessell.V"](
-                (10.0 ** dust_param["lognorm_radius"], dust_param["lognorm_sigma"])
-            )
+        if self.cross_phot is not None:
+            # Cross sections of the filters and spectra
+            # and the number of grains from the V band
 
-            n_grains = (
-                dust_param["lognorm_ext"] / cross_tmp / 2.5 / np.log10(np.exp(1.0))
-            )
+            if "lognorm_ext" in dust_param:
+                dust_point = [
+                    10.0 ** dust_param["lognorm_radius"],
+                    dust_param["lognorm_sigma"],
+                ]
 
-        elif "powerlaw_ext" in dust_param:
-            cross_tmp = self.cross_sections["Generic/Bessell.V"](
-                (10.0 ** dust_param["powerlaw_max"], dust_param["powerlaw_exp"])
-            )
+                dust_ext = dust_param["lognorm_ext"]
 
-            n_grains = (
-                dust_param["powerlaw_ext"] / cross_tmp / 2.5 / np.log10(np.exp(1.0))
-            )
+            else:
+                dust_point = [
+                    10.0 ** dust_param["powerlaw_max"],
+                    dust_param["powerlaw_exp"],
+                ]
+
+                dust_ext = dust_param["powerlaw_ext"]
+
+            cross_phot = self.cross_phot(dust_point)[0]
+
+            if self.cross_spec is not None:
+                cross_spec = self.cross_spec(dust_point)[0]
+
+            n_grains = dust_ext / cross_phot[-1] / 2.5 / np.log10(np.exp(1.0))
+
+            if not np.isfinite(n_grains):
+                # Dust parameters outside the grid of cross sections
+                return -np.inf
+
+        if self.phot_matrix is not None:
+            # Synthetic fluxes of all filters from a single blackbody spectrum
+            model_box = self.readplanck.get_spectrum(param_dict)
+            phot_planck = self.phot_matrix @ model_box.flux
+
+        if self.model not in ["planck", "powerlaw"] and len(self.objphot) > 0:
+            # Interpolated fluxes of all filters, for one or two stars
+            param_grid = param_binary if self.binary else param_values
+
+            if self.phot_interp is None:
+                phot_grid = np.column_stack(
+                    [item.spectrum_interp(param_grid)[:, 0] for item in self.modelphot]
+                )
 
-        for i, obj_item in enumerate(self.objphot):
-            # Get filter name
-            phot_filter = self.modelphot[i].filter_name
+            else:
+                phot_grid = self.phot_interp(param_grid)
+
+        if self.ext_filter_key is not None:
+            # Parameters for calculating the fluxes of the
+            # filters with the extinction of ext_filter
+            param_ext = param_dict.copy()
+            param_ext[self.ext_filter_key] = dust_param[self.ext_filter_key]
+            param_ext["ism_red"] = dust_param.get("ism_red", 3.1)
 
-            # Shortcut for weight
-            weight = self.weights[phot_filter]
+        # Synthetic fluxes and error inflation of the filters, for
+        # which the log-likelihood is calculated after the loop
 
+        phot_model = np.zeros(len(self.objphot))
+        phot_inflate = np.zeros(len(self.objphot))
+
+        for i in range(len(self.objphot)):
             if self.model == "planck":
-                readplanck = ReadPlanck(filter_name=phot_filter)
-                phot_flux = readplanck.get_flux(param_dict, synphot=self.modelphot[i])[
-                    0
-                ]
+                phot_flux = phot_planck[i]
 
             elif self.model == "powerlaw":
                 powerl_box = powerlaw_spectrum(
@@ -1725,124 +2355,67 @@ class FitModel:
 
             else:
                 if self.binary:
-                    # Star 0
+                    # Scale the fluxes by (radius/distance)^2
 
-                    param_0 = binary_to_single(param_dict, 0)
-
-                    phot_flux_0 = self.modelphot[i].spectrum_interp(
-                        list(param_0.values())
-                    )[0][0]
-
-                    # Scale the spectrum by (radius/distance)^2
-
-                    if "radius" in self.modelpar:
-                        phot_flux_0 *= flux_scaling
-                        phot_flux_0 += flux_offset
-
-                    elif "radius_0" in self.modelpar:
-                        phot_flux_0 *= flux_scaling_0
-                        phot_flux_0 += flux_offset
+                    phot_flux_0, phot_flux_1 = (
+                        binary_scaling * phot_grid[:, i] + binary_offset
+                    )
 
-                    # Optional extinction
+                    # Optional extinction of star 0
 
                     if "ism_ext_0" in dust_param:
-                        read_filt = ReadFilter(phot_filter)
-                        phot_wavel = np.array([read_filt.mean_wavelength()])
-
                         ism_reddening = dust_param.get("ism_red_0", 3.1)
 
-                        ext_filt = ism_extinction(
-                            dust_param["ism_ext_0"], ism_reddening, phot_wavel
+                        ext_filt = dust_param["ism_ext_0"] * (
+                            self.phot_ism_a[i] + self.phot_ism_b[i] / ism_reddening
                         )
 
-                        phot_flux_0 *= 10.0 ** (-0.4 * ext_filt[0])
-
-                    # Star 1
-
-                    param_1 = binary_to_single(param_dict, 1)
+                        phot_flux_0 *= 10.0 ** (-0.4 * ext_filt)
 
-                    phot_flux_1 = self.modelphot[i].spectrum_interp(
-                        list(param_1.values())
-                    )[0][0]
-
-                    # Scale the flux by (radius/distance)^2
-
-                    if "radius" in self.modelpar:
-                        phot_flux_1 *= flux_scaling
-                        phot_flux_1 += flux_offset
-
-                    elif "radius_1" in self.modelpar:
-                        phot_flux_1 *= flux_scaling_1
-                        phot_flux_1 += flux_offset
-
-                    # Optional extinction
+                    # Optional extinction of star 1
 
                     if "ism_ext_1" in dust_param:
-                        read_filt = ReadFilter(phot_filter)
-                        phot_wavel = np.array([read_filt.mean_wavelength()])
-
                         ism_reddening = dust_param.get("ism_red_1", 3.1)
 
-                        ext_filt = ism_extinction(
-                            dust_param["ism_ext_1"], ism_reddening, phot_wavel
+                        ext_filt = dust_param["ism_ext_1"] * (
+                            self.phot_ism_a[i] + self.phot_ism_b[i] / ism_reddening
                         )
 
-                        phot_flux_1 *= 10.0 ** (-0.4 * ext_filt[0])
+                        phot_flux_1 *= 10.0 ** (-0.4 * ext_filt)
 
                     # Weighted flux of two spectra for atmospheric asymmetries
                     # Or simply the same in case of an actual binary system
 
-                    if "spec_weight" in self.cube_index:
-                        phot_flux = (
-                            params[self.cube_index["spec_weight"]] * phot_flux_0
-                            + (1.0 - params[self.cube_index["spec_weight"]])
-                            * phot_flux_1
-                        )
+                    if binary_weight is None:
+                        phot_flux = phot_flux_0 + phot_flux_1
 
                     else:
-                        phot_flux = phot_flux_0 + phot_flux_1
+                        phot_flux = (
+                            binary_weight * phot_flux_0
+                            + (1.0 - binary_weight) * phot_flux_1
+                        )
 
                 else:
-                    phot_flux = self.modelphot[i].spectrum_interp(
-                        list(param_dict.values())
-                    )[0][0]
+                    phot_flux = phot_grid[0, i]
 
                     phot_flux *= flux_scaling
                     phot_flux += flux_offset
 
             # Add blackbody flux from disk components
-                       
-            if self.n_disk == 1:
-                phot_tmp = self.diskphot[i].spectrum_interp([disk_param["teff"]])[0][0]
-
-                phot_flux += (
-                    phot_tmp
-                    * (disk_param["radius"] * constants.R_JUP) ** 2
-                    / (1e3 * constants.PARSEC / parallax) ** 2
-                )
-
-            elif self.n_disk > 1:
-                for disk_idx in range(self.n_disk):
-                    phot_tmp = self.diskphot[i].spectrum_interp(
-                        [disk_param[f"teff_{disk_idx}"]]
-                    )[0][0]
 
-                    phot_flux += (
-                        phot_tmp
-                        * (disk_param[f"radius_{disk_idx}"] * constants.R_JUP) ** 2
-                        / (1e3 * constants.PARSEC / parallax) ** 2
-                    )
+            if self.n_disk > 0:
+                phot_disk = self.diskphot[i].spectrum_interp(disk_teff)[:, 0]
+                phot_flux += np.dot(disk_scaling, phot_disk)
 
             # Add linear term ( y += ax+b in Jansky ) to infrared excess ( >= 4 um )
 
-            if "lin_a" in self.cube_index and "lin_b" in self.cube_index:
+            if self.fit_lin:
 
                 lin_a = params[self.cube_index["lin_a"]]
                 lin_b = params[self.cube_index["lin_b"]]
 
-                read_filt = ReadFilter(phot_filter)
-                wavelength = read_filt.mean_wavelength()
-                
+                wavelength = self.phot_wavel[i]
+
                 if wavelength >= 4:
                     phot_tmp_Jy = lin_a * wavelength + lin_b
                     data_in = np.array([[wavelength, phot_tmp_Jy]])
@@ -1853,7 +2426,7 @@ class FitModel:
 
             # Add gtotd emission
 
-            if "gtotd_rinn" in self.cube_index and "gtotd_rout" in self.cube_index and "gtotd_incl" in self.cube_index:
+            if self.fit_gtotd:
 
                 gtotd_rinn = params[self.cube_index["gtotd_rinn"]]
                 gtotd_rout = params[self.cube_index["gtotd_rout"]]
@@ -1864,206 +2437,121 @@ class FitModel:
                 if gtotd_rinn > gtotd_rout:
                     return -np.inf
                 
-                read_filt = ReadFilter(phot_filter)
-                wavelength = read_filt.mean_wavelength()
+                wavelength = self.phot_wavel[i]
 
                 phot_tmp = abs(np.cos(gtotd_incl)) * integrate.fixed_quad(gtotd_emission, gtotd_rinn, gtotd_rout, args=(parallax, wavelength, teff, radius))[0]
                 phot_flux += phot_tmp
 
             # Apply extinction
 
-            if "lognorm_ext" in dust_param:
-                cross_tmp = self.cross_sections[phot_filter](
-                    (10.0 ** dust_param["lognorm_radius"], dust_param["lognorm_sigma"])
-                )
-
-                phot_flux *= np.exp(-cross_tmp * n_grains)
-
-            elif "powerlaw_ext" in dust_param:
-                cross_tmp = self.cross_sections[phot_filter](
-                    (10.0 ** dust_param["powerlaw_max"], dust_param["powerlaw_exp"])
-                )
-
-                phot_flux *= np.exp(-cross_tmp * n_grains)
+            if self.cross_phot is not None:
+                phot_flux *= np.exp(-cross_phot[i] * n_grains)
 
             elif "ism_ext" in dust_param:
-                read_filt = ReadFilter(phot_filter)
-                phot_wavel = np.array([read_filt.mean_wavelength()])
-
                 ism_reddening = dust_param.get("ism_red", 3.1)
 
-                ext_filt = ism_extinction(
-                    dust_param["ism_ext"], ism_reddening, phot_wavel
+                ext_filt = dust_param["ism_ext"] * (
+                    self.phot_ism_a[i] + self.phot_ism_b[i] / ism_reddening
                 )
 
-                phot_flux *= 10.0 ** (-0.4 * ext_filt[0])
+                phot_flux *= 10.0 ** (-0.4 * ext_filt)
 
             elif self.ext_filter is not None:
-                readmodel = ReadModel(self.model, filter_name=phot_filter)
-
-                param_dict[f"phot_ext_{self.ext_filter}"] = dust_param[
-                    f"phot_ext_{self.ext_filter}"
-                ]
-                param_dict["ism_red"] = dust_param.get("ism_red", 3.1)
-
-                phot_flux = readmodel.get_flux(param_dict)[0]
+                phot_flux = self.extphot[i].get_flux(
+                    param_ext, synphot=self.extsynphot[i]
+                )[0]
                 phot_flux *= flux_scaling
                 phot_flux += flux_offset
 
-                del param_dict[f"phot_ext_{self.ext_filter}"]
-                del param_dict["ism_red"]
-
-            if obj_item.ndim == 1:
-                phot_var = obj_item[1] ** 2
-
-                # Get the telescope/instrument name
-                instr_check = phot_filter.split(".")[0]
-
-                if phot_filter in phot_scaling:
-                    # Inflate photometric uncertainty for filter
-
-                    # Scale relative to the uncertainty
-                    phot_var += phot_scaling[phot_filter] ** 2 * obj_item[1] ** 2
-
-                elif instr_check in phot_scaling:
-                    # Inflate photometric uncertainty for instrument
-
-                    # Scale relative to the uncertainty
-                    phot_var += phot_scaling[instr_check] ** 2 * obj_item[1] ** 2
-
-                ln_like += -0.5 * weight * (obj_item[0] - phot_flux) ** 2 / phot_var
-
-                # Only required when fitting an error inflation
-                ln_like += -0.5 * np.log(2.0 * np.pi * phot_var)
-
-            else:
-                for j in range(obj_item.shape[1]):
-                    phot_var = obj_item[1, j] ** 2
-
-                    # Get the telescope/instrument name
-                    instr_check = phot_filter.split(".")[0]
-
-                    if phot_filter in phot_scaling:
-                        # Inflate photometric uncertainty for filter
+            phot_model[i] = phot_flux
 
-                        # Scale relative to the uncertainty
-                        phot_var += phot_scaling[phot_filter] ** 2 * obj_item[1, j] ** 2
+            # Inflate the photometric uncertainty of the filter or
+            # instrument, relative to the uncertainty of the data
 
-                    elif instr_check in phot_scaling:
-                        # Inflate photometric uncertainty for instrument
+            if self.phot_error_key[i] is not None:
+                phot_inflate[i] = phot_scaling[self.phot_error_key[i]]
 
-                        # Scale relative to the uncertainty
-                        phot_var += phot_scaling[instr_check] ** 2 * obj_item[1, j] ** 2
-
-                    ln_like += (
-                        -0.5 * weight * (obj_item[0, j] - phot_flux) ** 2 / phot_var
-                    )
-
-                    # Only required when fitting an error inflation
-                    ln_like += -0.5 * np.log(2.0 * np.pi * phot_var)
+        ln_like += photometry_lnlike(
+            self.phot_data_flux,
+            self.phot_data_error,
+            phot_model,
+            phot_inflate,
+            self.phot_weight,
+            self.phot_index,
+        )
 
         for i, item in enumerate(self.spectrum.keys()):
+            # Contiguous arrays with the data of the spectrum
+            spec_slice = self.spec_index[item]
+            spec_wavel = self.spec_wavel[spec_slice]
+            spec_flux = self.spec_flux[spec_slice]
+            spec_var = self.spec_var[spec_slice]
+            spec_ism_a = self.spec_ism_a[spec_slice]
+            spec_ism_b = self.spec_ism_b[spec_slice]
+
             # Calculate or interpolate the model spectrum
 
             # Shortcut for the weight
             weight = self.weights[item]
 
             if self.model == "planck":
-                # Calculate a blackbody spectrum
-                readplanck = ReadPlanck(
-                    (
-                        0.9 * self.spectrum[item][0][0, 0],
-                        1.1 * self.spectrum[item][0][-1, 0],
-                    )
-                )
-
-                model_box = readplanck.get_spectrum(param_dict, spec_res=1000.0)
-
-                # Resample the spectrum to the observed wavelengths
-                model_flux = spectres.spectres(
-                    self.spectrum[item][0][:, 0], model_box.wavelength, model_box.flux
-                )
+                # Calculate a blackbody spectrum and apply the
+                # smoothing and resampling with the sparse matrix
+                model_box = self.modelspec[i].get_spectrum(param_dict)
+                model_flux = self.spec_matrix[i] @ model_box.flux
 
             else:
                 # Interpolate the model spectrum from the grid
 
                 if self.binary:
-                    # Star 1
-
-                    param_0 = binary_to_single(param_dict, 0)
-
-                    model_flux_0 = self.modelspec[i].spectrum_interp(
-                        list(param_0.values())
-                    )[0, :]
-
-                    # Scale the spectrum by (radius/distance)^2
-
-                    if "radius" in self.modelpar:
-                        model_flux_0 *= flux_scaling
-                        model_flux_0 += flux_offset
+                    # Scale the spectra by (radius/distance)^2
 
-                    elif "radius_1" in self.modelpar:
-                        model_flux_0 *= flux_scaling_0
-                        model_flux_0 += flux_offset
+                    model_flux_0, model_flux_1 = (
+                        binary_scaling[:, np.newaxis]
+                        * self.modelspec[i].spectrum_interp(param_binary)
+                        + binary_offset
+                    )
 
-                    # Optional extinction
+                    # Optional extinction of star 0
 
                     if "ism_ext_0" in dust_param:
                         ism_reddening = dust_param.get("ism_red_0", 3.1)
 
-                        ext_spec = ism_extinction(
+                        apply_ism_ext_coeff(
+                            model_flux_0,
                             dust_param["ism_ext_0"],
                             ism_reddening,
-                            self.spectrum[item][0][:, 0],
+                            spec_ism_a,
+                            spec_ism_b,
                         )
 
-                        model_flux_0 *= 10.0 ** (-0.4 * ext_spec)
-
-                    # Star 2
-
-                    param_1 = binary_to_single(param_dict, 1)
-
-                    model_flux_1 = self.modelspec[i].spectrum_interp(
-                        list(param_1.values())
-                    )[0, :]
-
-                    # Scale the spectrum by (radius/distance)^2
-
-                    if "radius" in self.modelpar:
-                        model_flux_1 *= flux_scaling
-                        model_flux_1 += flux_offset
-
-                    elif "radius_1" in self.modelpar:
-                        model_flux_1 *= flux_scaling_1
-                        model_flux_1 += flux_offset
+                    # Optional extinction of star 1
 
                     if "ism_ext_1" in dust_param:
                         ism_reddening = dust_param.get("ism_red_1", 3.1)
 
-                        ext_spec = ism_extinction(
+                        apply_ism_ext_coeff(
+                            model_flux_1,
                             dust_param["ism_ext_1"],
                             ism_reddening,
-                            self.spectrum[item][0][:, 0],
+                            spec_ism_a,
+                            spec_ism_b,
                         )
 
-                        model_flux_1 *= 10.0 ** (-0.4 * ext_spec)
-
                     # Weighted flux of two spectra for atmospheric asymmetries
                     # Or simply the same in case of an actual binary system
 
-                    if "spec_weight" in self.cube_index:
+                    if binary_weight is None:
+                        model_flux = model_flux_0 + model_flux_1
+
+                    else:
                         model_flux = (
-                            params[self.cube_index["spec_weight"]] * model_flux_0
-                            + (1.0 - params[self.cube_index["spec_weight"]])
-                            * model_flux_1
+                            binary_weight * model_flux_0
+                            + (1.0 - binary_weight) * model_flux_1
                         )
-                    else:
-                        model_flux = model_flux_0 + model_flux_1
 
                 else:
-                    model_flux = self.modelspec[i].spectrum_interp(
-                        list(param_dict.values())
-                    )[0, :]
+                    model_flux = self.modelspec[i].spectrum_interp(param_values)[0, :]
 
                     # Scale the spectrum by (radius/distance)^2
                     model_flux *= flux_scaling
@@ -2079,114 +2567,81 @@ class FitModel:
                     lambda_ref = 0.5  # (um)
 
                     veil_flux = veil_param["veil_ref"] + veil_param["veil_b"] * (
-                        self.spectrum[item][0][:, 0] - lambda_ref
+                        spec_wavel - lambda_ref
                     )
 
                     model_flux = veil_param["veil_a"] * model_flux + veil_flux
 
             # Scale and offset the spectrum data
-            data_flux = spec_scaling[item] * ( 10.0 ** spec_log_scaling[item] ) * ( self.spectrum[item][0][:, 1] + spec_offset[item] )
+            data_flux = spec_scaling[item] * ( 10.0 ** spec_log_scaling[item] ) * ( spec_flux + spec_offset[item] )
 
             # Apply radial velocity shift
 
             if item in rad_vel:
-                wavel_shift = (
-                    rad_vel[item] * 1e3 * self.spectrum[item][0][:, 0] / constants.LIGHT
-                )
+                wavel_shift = rad_vel[item] * 1e3 * spec_wavel / constants.LIGHT
 
-                spec_interp = interpolate.interp1d(
-                    self.spectrum[item][0][:, 0] + wavel_shift,
-                    model_flux,
-                    fill_value="extrapolate",
+                interp_index, interp_weight = linear_interp_weights(
+                    spec_wavel + wavel_shift,
+                    spec_wavel,
                 )
 
-                model_flux = spec_interp(self.spectrum[item][0][:, 0])
+                model_flux = model_flux[interp_index] + interp_weight * (
+                    model_flux[interp_index + 1] - model_flux[interp_index]
+                )
 
             # Apply rotational broadening
 
-            if "vsini" in self.modelpar:
-                spec_interp = interpolate.interp1d(
-                    self.spectrum[item][0][:, 0], model_flux
-                )
+            if self.fit_vsini:
+                wavel_broad, interp_broad, interp_spec = self.rot_broad[item]
 
-                wavel_new = np.linspace(
-                    self.spectrum[item][0][0, 0],
-                    self.spectrum[item][0][-1, 0],
-                    2 * self.spectrum[item][0].shape[0],
-                )
+                index_broad, weight_broad = interp_broad
+                index_spec, weight_spec = interp_spec
 
-                flux_broad = fastRotBroad(
-                    wvl=wavel_new,
-                    flux=spec_interp(wavel_new),
-                    epsilon=0.0,
+                broad_kernel = rot_broad_kernel(
                     vsini=params[self.cube_index["vsini"]],
-                    effWvl=None,
+                    wavel_step=wavel_broad[1] - wavel_broad[0],
+                    wavel_eff=np.mean(wavel_broad),
                 )
 
-                spec_interp = interpolate.interp1d(wavel_new, flux_broad)
+                flux_broad = signal.fftconvolve(
+                    model_flux[index_broad]
+                    + weight_broad
+                    * (model_flux[index_broad + 1] - model_flux[index_broad]),
+                    broad_kernel,
+                    mode="same",
+                )
 
-                model_flux = spec_interp(self.spectrum[item][0][:, 0])
+                model_flux = flux_broad[index_spec] + weight_spec * (
+                    flux_broad[index_spec + 1] - flux_broad[index_spec]
+                )
 
             if err_scaling[item] is None:
                 # variance without error inflation
                 # but the variance is still scaled by the spectrum scaling
-                data_var = spec_scaling[item] ** 2 * ( 10.0 ** spec_log_scaling[item] ) ** 2 * self.spectrum[item][0][:, 2] ** 2
+                data_var = spec_scaling[item] ** 2 * ( 10.0 ** spec_log_scaling[item] ) ** 2 * spec_var
 
             else:
                 # Variance with error inflation (see Piette & Madhusudhan 2020)
-                data_var = (
-                    self.spectrum[item][0][:, 2] ** 2
-                    + (err_scaling[item] * model_flux) ** 2
-                )
-
-            if self.spectrum[item][2] is not None:
-                # The inverted covariance matrix is available
+                data_var = spec_var + (err_scaling[item] * model_flux) ** 2
 
-                if err_scaling[item] is None:
-                    # Use the inverted covariance matrix directly
-                    data_cov_inv = self.spectrum[item][2]
-
-                else:
-                    # Ratio of the inflated and original uncertainties
-                    sigma_ratio = np.sqrt(data_var) / self.spectrum[item][0][:, 2]
-                    sigma_j, sigma_i = np.meshgrid(sigma_ratio, sigma_ratio)
-
-                    # Calculate the inverted matrix of the inflated covariances
-                    data_cov_inv = np.linalg.inv(
-                        self.spectrum[item][1] * sigma_i * sigma_j
-                    )
+            if self.spectrum[item][2] is not None and err_scaling[item] is not None:
+                # Ratio of the inflated and original uncertainties
+                sigma_ratio = np.sqrt(data_var / spec_var)
 
             # Add blackbody flux from disk components
 
-            if self.n_disk == 1:
-                model_tmp = self.diskspec[i].spectrum_interp([disk_param["teff"]])[0, :]
-
-                model_tmp *= (disk_param["radius"] * constants.R_JUP) ** 2 / (
-                    1e3 * constants.PARSEC / parallax
-                ) ** 2
-
-                model_flux += model_tmp
-
-            elif self.n_disk > 1:
-                for disk_idx in range(self.n_disk):
-                    model_tmp = self.diskspec[i].spectrum_interp(
-                        [disk_param[f"teff_{disk_idx}"]]
-                    )[0, :]
-
-                    model_tmp *= (
-                        disk_param[f"radius_{disk_idx}"] * constants.R_JUP
-                    ) ** 2 / (1e3 * constants.PARSEC / parallax) ** 2
-
-                    model_flux += model_tmp
+            if self.n_disk > 0:
+                model_disk = self.diskspec[i].spectrum_interp(disk_teff)
+                model_flux += np.dot(disk_scaling, model_disk)
 
             # Add linear term ( y += ax+b in Jansky ) to infrared excess ( >= 4 um )
 
-            if "lin_a" in self.cube_index and "lin_b" in self.cube_index:
+            if self.fit_lin:
 
                 lin_a = params[self.cube_index["lin_a"]]
                 lin_b = params[self.cube_index["lin_b"]]
 
-                wavelengths = self.spectrum[item][0][:, 0]
+                wavelengths = spec_wavel
 
                 model_tmp_Jy = (lin_a * wavelengths + lin_b) * (wavelengths >= 4)
                 data_in = np.column_stack([wavelengths, model_tmp_Jy])
@@ -2197,113 +2652,107 @@ class FitModel:
             
             # Add gtotd emission
 
-            if "gtotd_rinn" in self.cube_index and "gtotd_rout" in self.cube_index and "gtotd_incl" in self.cube_index:
+            if self.fit_gtotd:
 
                 gtotd_rinn = params[self.cube_index["gtotd_rinn"]]
                 gtotd_rout = params[self.cube_index["gtotd_rout"]]
                 gtotd_incl = params[self.cube_index["gtotd_incl"]]
                 teff = param_dict["teff"]
                 radius = radius_copy
-                wavelengths = self.spectrum[item][0][:, 0]
+                wavelengths = spec_wavel
 
-                model_tmp = [abs(np.cos(gtotd_incl)) * integrate.fixed_quad(gtotd_emission, gtotd_rinn, gtotd_rout, args=(parallax, wavelength, teff, radius))[0] for wavelength in wavelengths]
-                model_tmp = np.array(model_tmp)
-                model_flux += model_tmp
-            
-            # Apply extinction
-
-            if "lognorm_ext" in dust_param:
-                cross_tmp = self.cross_sections["spectrum"](
-                    (
-                        self.spectrum[item][0][:, 0],
-                        10.0 ** dust_param["lognorm_radius"],
-                        dust_param["lognorm_sigma"],
-                    )
-                )
-
-                model_flux *= np.exp(-cross_tmp * n_grains)
-
-            elif "powerlaw_ext" in dust_param:
-                cross_tmp = self.cross_sections["spectrum"](
-                    (
-                        self.spectrum[item][0][:, 0],
-                        10.0 ** dust_param["powerlaw_max"],
-                        dust_param["powerlaw_exp"],
-                    )
-                )
+                model_tmp = [abs(np.cos(gtotd_incl)) * integrate.fixed_quad(gtotd_emission, gtotd_rinn, gtotd_rout, args=(parallax, wavelength, teff, radius))[0] for wavelength in wavelengths]
+                model_tmp = np.array(model_tmp)
+                model_flux += model_tmp
+            
+            # Apply extinction
 
-                model_flux *= np.exp(-cross_tmp * n_grains)
+            if self.cross_spec is not None:
+                model_flux *= np.exp(-cross_spec[spec_slice] * n_grains)
 
             elif "ism_ext" in dust_param:
                 ism_reddening = dust_param.get("ism_red", 3.1)
 
-                ext_spec = ism_extinction(
-                    dust_param["ism_ext"], ism_reddening, self.spectrum[item][0][:, 0]
+                apply_ism_ext_coeff(
+                    model_flux,
+                    dust_param["ism_ext"],
+                    ism_reddening,
+                    spec_ism_a,
+                    spec_ism_b,
                 )
 
-                model_flux *= 10.0 ** (-0.4 * ext_spec)
-
             elif self.ext_filter is not None:
                 ism_reddening = dust_param.get("ism_red", 3.1)
 
                 av_required = convert_to_av(
                     filter_name=self.ext_filter,
-                    filter_ext=dust_param[f"phot_ext_{self.ext_filter}"],
+                    filter_ext=dust_param[self.ext_filter_key],
                     v_band_red=ism_reddening,
                 )
 
-                ext_spec = ism_extinction(
-                    av_required, ism_reddening, self.spectrum[item][0][:, 0]
+                apply_ism_ext_coeff(
+                    model_flux, av_required, ism_reddening, spec_ism_a, spec_ism_b
                 )
-
-                model_flux *= 10.0 ** (-0.4 * ext_spec)
             
             # Calculate the likelihood
 
+            if item in self.spec_lnvar:
+                if err_scaling[item] is None:
+                    # Precomputed sum of log(2 pi var) plus the
+                    # logarithm of the scaling of the variances
+                    lnvar_sum, lnvar_count = self.spec_lnvar[item]
+
+                    lnvar_sum += lnvar_count * np.log(
+                        spec_scaling[item] ** 2 * (10.0 ** spec_log_scaling[item]) ** 2
+                    )
+
+                else:
+                    lnvar_sum = np.nansum(np.log(2.0 * np.pi * data_var))
+
             if self.spectrum[item][2] is not None:
-                # Use the inverted covariance matrix
-                ln_like += -0.5 * np.dot(
-                    weight * (data_flux - model_flux),
-                    np.dot(data_cov_inv, data_flux - model_flux),
-                )
+                data_diff = data_flux - model_flux
+
+                if err_scaling[item] is None:
+                    # Use the inverted covariance matrix directly
+                    cov_diff = np.dot(self.spectrum[item][2], data_diff)
+
+                else:
+                    # The inflated covariance matrix is D C D, with D the
+                    # diagonal matrix of sigma_ratio, so its inverse is
+                    # given by the inverted covariance matrix of the data
+                    cov_diff = np.dot(self.spectrum[item][2], data_diff / sigma_ratio)
+                    cov_diff /= sigma_ratio
 
-                ln_like += -0.5 * np.nansum(np.log(2.0 * np.pi * data_var))
+                ln_like += -0.5 * np.dot(weight * data_diff, cov_diff)
+                ln_like += -0.5 * lnvar_sum
 
             else:
                 if item in self.fit_corr:
                     # Covariance model (Wang et al. 2020)
-                    wavel = self.spectrum[item][0][:, 0]  # (um)
-                    wavel_j, wavel_i = np.meshgrid(wavel, wavel)
-
                     error = np.sqrt(data_var)  # (W m-2 um-1)
-                    error_j, error_i = np.meshgrid(error, error)
-
-                    cov_matrix = (
-                        corr_amp[item] ** 2
-                        * error_i
-                        * error_j
-                        * np.exp(
-                            -((wavel_i - wavel_j) ** 2) / (2.0 * corr_len[item] ** 2)
-                        )
-                        + (1.0 - corr_amp[item] ** 2)
-                        * np.eye(wavel.shape[0])
-                        * error_i**2
-                    )
 
-                    dot_tmp = np.dot(
-                        weight * (data_flux - model_flux),
-                        np.dot(np.linalg.inv(cov_matrix), data_flux - model_flux),
-                    )
+                    # The covariance matrix is computed in place
+                    # to limit the number of temporary matrices
+
+                    cov_matrix = self.wavel_sqdiff[item] / corr_len[item] ** 2
+                    np.exp(cov_matrix, out=cov_matrix)
+                    cov_matrix *= np.outer(corr_amp[item] ** 2 * error, error)
+
+                    cov_matrix[np.diag_indices_from(cov_matrix)] += (
+                        1.0 - corr_amp[item] ** 2
+                    ) * error**2
+
+                    data_diff = data_flux - model_flux
+                    cov_diff = _solve_cov(cov_matrix, data_diff)
+
+                    dot_tmp = np.dot(weight * data_diff, cov_diff)
 
                     ln_like += -0.5 * dot_tmp
-                    ln_like += -0.5 * np.nansum(np.log(2.0 * np.pi * data_var))
+                    ln_like += -0.5 * lnvar_sum
 
                 else:
                     # Calculate the chi-square without a covariance matrix
-                    chi_sq = -0.5 * weight * (data_flux - model_flux) ** 2 / data_var
-                    chi_sq += -0.5 * np.log(2.0 * np.pi * data_var)
-
-                    ln_like += np.nansum(chi_sq)
+                    ln_like += gaussian_lnlike(data_flux, model_flux, data_var, weight)
 
         return ln_like
 
@@ -2336,6 +2785,19 @@ class FitModel:
             >>> os.environ['DYLD_LIBRARY_PATH'] = '/path/to/MultiNest/lib'
             >>> import species
 
+        The sampling can be parallelized with MPI if ``mpi4py``
+        is installed and ``MultiNest`` has been build with MPI
+        support, by running the script with ``mpiexec``:
+
+        .. code-block:: console
+
+            $ mpiexec -n 4 python fit_script.py
+
+        By default, the importance nested sampling and the mode
+        separation of ``MultiNest`` are disabled, since these
+        require additional bookkeeping with every likelihood
+        call. Both can be enabled with ``kwargs_multinest``.
+
         Parameters
         ----------
         tag : str
@@ -2417,19 +2879,16 @@ class FitModel:
 
             del kwargs_multinest["outputfiles_basename"]
 
-        # Get the MPI rank of the process
-
-        try:
-            from mpi4py import MPI
-
-            mpi_rank = MPI.COMM_WORLD.Get_rank()
+        # Disable importance nested sampling and mode
+        # separation unless requested with kwargs_multinest
 
-        except ModuleNotFoundError:
-            mpi_rank = 0
+        kwargs_multinest.setdefault("importance_nested_sampling", False)
+        kwargs_multinest.setdefault("multimodal", False)
+        kwargs_multinest.setdefault("use_MPI", True)
 
         # Create the output folder if required
 
-        if mpi_rank == 0 and not os.path.exists(output):
+        if self.mpi_rank == 0 and not os.path.exists(output):
             os.mkdir(output)
 
         @typechecked
@@ -2454,7 +2913,7 @@ class FitModel:
                 None
             """
 
-            self._prior_transform(cube, self.bounds, self.cube_index)
+            self._prior_transform(cube)
 
         @typechecked
         def _lnlike_multinest(
@@ -2483,15 +2942,55 @@ class FitModel:
 
             return self._lnlike_func(params)
 
-        pymultinest.run(
-            _lnlike_multinest,
-            _lnprior_multinest,
-            len(self.modelpar),
-            outputfiles_basename=output,
-            resume=resume,
-            n_live_points=n_live_points,
-            **kwargs_multinest,
-        )
+        # Ignore deprecation warnings that are raised
+        # while sampling, so not with every likelihood call
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=DeprecationWarning)
+
+            pymultinest.run(
+                _lnlike_multinest,
+                _lnprior_multinest,
+                len(self.modelpar),
+                outputfiles_basename=output,
+                resume=resume,
+                n_live_points=n_live_points,
+                **kwargs_multinest,
+            )
+
+        # Peak memory usage of the processes, which can be used to
+        # verify that the interpolated grids are shared by the MPI
+        # processes on the same node (see ReadModel.interpolate_grid)
+
+        try:
+            import resource
+
+            # Maximum resident set size in kB (Linux) or bytes (macOS)
+            peak_mem = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+            if sys.platform == "darwin":
+                peak_mem /= 1024.0
+
+            try:
+                from mpi4py import MPI
+
+                peak_mem = MPI.COMM_WORLD.gather(peak_mem, root=0)
+
+            except ModuleNotFoundError:
+                peak_mem = [peak_mem]
+
+            if self.mpi_rank == 0:
+                peak_list = ", ".join([f"{item:.0f}" for item in peak_mem])
+                print(f"\nPeak memory usage per process (MB): {peak_list}")
+
+        except ModuleNotFoundError:
+            pass
+
+        # The output files are analyzed and the samples are
+        # stored in the database by the first process only
+
+        if self.mpi_rank != 0:
+            return
 
         # Create the Analyzer object
         analyzer = pymultinest.analyse.Analyzer(
@@ -2510,14 +3009,18 @@ class FitModel:
         nested_ln_z = ln_z
         nested_ln_z_error = ln_z_error
 
-        # Nested sampling global log-evidence
-        ln_z = sampling_stats["nested importance sampling global log-evidence"]
-        ln_z_error = sampling_stats[
-            "nested importance sampling global log-evidence error"
-        ]
-        print(
-            f"Nested importance sampling global log-evidence: {ln_z:.2f} +/- {ln_z_error:.2f}"
-        )
+        # Nested importance sampling global log-evidence,
+        # which is only available if importance nested
+        # sampling was used
+
+        if "nested importance sampling global log-evidence" in sampling_stats:
+            ln_z = sampling_stats["nested importance sampling global log-evidence"]
+            ln_z_error = sampling_stats[
+                "nested importance sampling global log-evidence error"
+            ]
+            print(
+                f"Nested importance sampling global log-evidence: {ln_z:.2f} +/- {ln_z_error:.2f}"
+            )
 
         # Get the best-fit (highest likelihood) point
 
@@ -2527,76 +3030,45 @@ class FitModel:
         max_lnlike = best_params["log_likelihood"]
         print(f"   - Log-likelihood = {max_lnlike:.2f}")
 
-        for i, item in enumerate(best_params["parameters"]):
-            if -0.1 < item < 0.1:
-                print(f"   - {self.modelpar[i]} = {item:.2e}")
-            else:
-                print(f"   - {self.modelpar[i]} = {item:.2f}")
+        print(_format_params(self.modelpar, best_params["parameters"]))
 
         # Get the posterior samples
         samples = analyzer.get_equal_weighted_posterior()
 
-        spec_labels = []
-        for item in self.spectrum:
-            if f"scaling_{item}" in self.bounds:
-                spec_labels.append(f"scaling_{item}")
-
         ln_prob = samples[:, -1]
         samples = samples[:, :-1]
 
-        # Adding the fixed parameters to the samples
+        # Adding the fixed parameters, which are written as
+        # additional columns when storing the samples
 
-        for key, value in self.fix_param.items():
-            self.modelpar.append(key)
-
-            app_param = np.full(samples.shape[0], value)
-            app_param = app_param[..., np.newaxis]
-
-            samples = np.append(samples, app_param, axis=1)
+        self.modelpar.extend(self.fix_param.keys())
 
         # Dictionary with attributes that will be stored
 
         attr_dict = {
-            "spec_type": "model",
-            "spec_name": self.model,
+            **self.attr_dict,
             "ln_evidence": (ln_z, ln_z_error),
             "nested_ln_evidence": (nested_ln_z, nested_ln_z_error),
-            "parallax": self.obj_parallax[0],
         }
 
-        if self.ext_filter is not None:
-            attr_dict["ext_filter"] = self.ext_filter
-
-        # Get the MPI rank of the process
-
-        try:
-            from mpi4py import MPI
-
-            mpi_rank = MPI.COMM_WORLD.Get_rank()
-
-        except ModuleNotFoundError:
-            mpi_rank = 0
-
         # Add samples to the database
 
-        if mpi_rank == 0:
-            # Writing the samples to the database is only
-            # possible when using a single process
-            from species.data.database import Database
-
-            species_db = Database()
-
-            species_db.add_samples(
-                sampler="multinest",
-                samples=samples,
-                ln_prob=ln_prob,
-                tag=tag,
-                modelpar=self.modelpar,
-                bounds=self.bounds,
-                normal_prior=self.normal_prior,
-                spec_labels=spec_labels,
-                attr_dict=attr_dict,
-            )
+        from species.data.database import Database
+
+        species_db = Database()
+
+        species_db.add_samples(
+            sampler="multinest",
+            samples=samples,
+            ln_prob=ln_prob,
+            tag=tag,
+            modelpar=self.modelpar,
+            bounds=self.bounds,
+            normal_prior=self.normal_prior,
+            spec_labels=self.spec_labels,
+            attr_dict=attr_dict,
+            fix_param=self.fix_param,
+        )
 
     @typechecked
     def run_ultranest(
@@ -2606,6 +3078,7 @@ class FitModel:
         resume: Union[bool, str] = False,
         output: str = "ultranest/",
         kwargs_ultranest: Optional[dict] = None,
+        vectorized: bool = False,
         **kwargs,
     ) -> None:
         """
@@ -2643,6 +3116,16 @@ class FitModel:
             of the ``UltraNest`` sampler.
         output : str
             Path that is used for the output files from ``UltraNest``.
+        vectorized : bool
+            Use the vectorized mode of ``UltraNest``, in which the
+            prior transform is applied to a batch of points with a
+            single call and the log-likelihood is requested for the
+            full batch at once. The size of the batches can be
+            adjusted with the ``ndraw_min`` and ``ndraw_max``
+            parameters of ``kwargs_ultranest``. When running with
+            MPI, each process evaluates a full batch between the
+            exchanges of the sampled points, which reduces the
+            communication overhead when using many processes.
 
         Returns
         -------
@@ -2682,19 +3165,9 @@ class FitModel:
         if kwargs_ultranest is None:
             kwargs_ultranest = {}
 
-        # Get the MPI rank of the process
-
-        try:
-            from mpi4py import MPI
-
-            mpi_rank = MPI.COMM_WORLD.Get_rank()
-
-        except ModuleNotFoundError:
-            mpi_rank = 0
-
         # Create the output folder if required
 
-        if mpi_rank == 0 and not os.path.exists(output):
+        if self.mpi_rank == 0 and not os.path.exists(output):
             os.mkdir(output)
 
         @typechecked
@@ -2715,7 +3188,7 @@ class FitModel:
                 Cube with the sampled model parameters.
             """
 
-            return self._prior_transform(cube, self.bounds, self.cube_index)
+            return self._prior_transform(cube)
 
         @typechecked
         def _lnlike_ultranest(params: np.ndarray) -> Union[float, np.float64]:
@@ -2736,18 +3209,44 @@ class FitModel:
 
             ln_like = self._lnlike_func(params)
 
-            if not np.isfinite(ln_like):
+            if not math.isfinite(ln_like):
                 # UltraNest can not handle np.inf in the likelihood
                 ln_like = -1e100
 
             return ln_like
 
+        @typechecked
+        def _lnlike_ultranest_batch(params: np.ndarray) -> np.ndarray:
+            """
+            Function for returning the log-likelihood for a
+            batch of sampled parameter cubes.
+
+            Parameters
+            ----------
+            params : np.ndarray
+                Array with sampled model parameters, with
+                the parameters of each point along a row.
+
+            Returns
+            -------
+            np.ndarray
+                Log-likelihood of the points.
+            """
+
+            ln_like = np.array([self._lnlike_func(param_item) for param_item in params])
+
+            # UltraNest can not handle np.inf in the likelihood
+            ln_like[~np.isfinite(ln_like)] = -1e100
+
+            return ln_like
+
         sampler = ultranest.ReactiveNestedSampler(
             self.modelpar,
-            _lnlike_ultranest,
+            _lnlike_ultranest_batch if vectorized else _lnlike_ultranest,
             transform=_lnprior_ultranest,
             resume=resume,
             log_dir=output,
+            vectorized=vectorized,
         )
 
         if "show_status" not in kwargs_ultranest:
@@ -2765,9 +3264,15 @@ class FitModel:
 
             del kwargs_ultranest["min_num_live_points"]
 
-        result = sampler.run(
-            min_num_live_points=min_num_live_points, **kwargs_ultranest
-        )
+        # Ignore deprecation warnings that are raised
+        # while sampling, so not with every likelihood call
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=DeprecationWarning)
+
+            result = sampler.run(
+                min_num_live_points=min_num_live_points, **kwargs_ultranest
+            )
 
         # Log-evidence
 
@@ -2779,11 +3284,11 @@ class FitModel:
 
         print("\nBest-fit parameters (mean +/- sigma):")
 
-        for i, item in enumerate(self.modelpar):
-            mean = np.mean(result["samples"][:, i])
-            sigma = np.std(result["samples"][:, i])
+        param_mean = np.mean(result["samples"], axis=0)
+        param_std = np.std(result["samples"], axis=0)
 
-            print(f"   - {item} = {mean:.2e} +/- {sigma:.2e}")
+        for i, item in enumerate(self.modelpar):
+            print(f"   - {item} = {param_mean[i]:.2e} +/- {param_std[i]:.2e}")
 
         # Get the best-fit (highest likelihood) point
 
@@ -2792,18 +3297,7 @@ class FitModel:
         print("\nSample with the highest probability:")
         print(f"   - Log-likelihood = {max_lnlike:.2f}")
 
-        for i, item in enumerate(result["maximum_likelihood"]["point"]):
-            if -0.1 < item < 0.1:
-                print(f"   - {self.modelpar[i]} = {item:.2e}")
-            else:
-                print(f"   - {self.modelpar[i]} = {item:.2f}")
-
-        # Create a list with scaling labels
-
-        spec_labels = []
-        for item in self.spectrum:
-            if f"scaling_{item}" in self.bounds:
-                spec_labels.append(f"scaling_{item}")
+        print(_format_params(self.modelpar, result["maximum_likelihood"]["point"]))
 
         # Posterior samples
         samples = result["samples"]
@@ -2811,41 +3305,18 @@ class FitModel:
         # Log-likelihood
         ln_prob = result["weighted_samples"]["logl"]
 
-        # Adding the fixed parameters to the samples
-
-        for key, value in self.fix_param.items():
-            self.modelpar.append(key)
-
-            app_param = np.full(samples.shape[0], value)
-            app_param = app_param[..., np.newaxis]
+        # Adding the fixed parameters, which are written as
+        # additional columns when storing the samples
 
-            samples = np.append(samples, app_param, axis=1)
+        self.modelpar.extend(self.fix_param.keys())
 
         # Dictionary with attributes that will be stored
 
-        attr_dict = {
-            "spec_type": "model",
-            "spec_name": self.model,
-            "ln_evidence": (ln_z, ln_z_error),
-            "parallax": self.obj_parallax[0],
-        }
-
-        if self.ext_filter is not None:
-            attr_dict["ext_filter"] = self.ext_filter
-
-        # Get the MPI rank of the process
-
-        try:
-            from mpi4py import MPI
-
-            mpi_rank = MPI.COMM_WORLD.Get_rank()
-
-        except ModuleNotFoundError:
-            mpi_rank = 0
+        attr_dict = {**self.attr_dict, "ln_evidence": (ln_z, ln_z_error)}
 
         # Add samples to the database
 
-        if mpi_rank == 0:
+        if self.mpi_rank == 0:
             # Writing the samples to the database is only
             # possible when using a single process
             from species.data.database import Database
@@ -2860,8 +3331,9 @@ class FitModel:
                 modelpar=self.modelpar,
                 bounds=self.bounds,
                 normal_prior=self.normal_prior,
-                spec_labels=spec_labels,
+                spec_labels=self.spec_labels,
                 attr_dict=attr_dict,
+                fix_param=self.fix_param,
             )
 
     @typechecked
@@ -2877,6 +3349,9 @@ class FitModel:
         bound: str = "multi",
         n_pool: Optional[int] = None,
         mpi_pool: bool = False,
+        ascii_output: bool = False,
+        checkpoint_every: float = 600.0,
+        queue_size: Optional[int] = None,
     ) -> None:
         """
         Function for running the atmospheric retrieval. The parameter
@@ -2924,6 +3399,22 @@ class FitModel:
         mpi_pool : bool
             Distribute the workers to an ``MPIPool`` on a cluster,
             using ``schwimmbad``.
+        ascii_output : bool
+            Store the equally-weighted samples and log-likelihoods
+            in the output folder as text file
+            (``retrieval_post_equal_weights.dat``) instead of the
+            binary NumPy file (``retrieval_post_equal_weights.npy``).
+        checkpoint_every : float
+            Time interval (s) between the checkpoints of the sampler
+            state, which are stored as ``retrieval_dynesty.save`` in
+            the output folder. Since the full state is pickled with
+            every checkpoint, small values increase the I/O overhead,
+            in particular on parallel filesystems.
+        queue_size : int, None
+            Number of points that are proposed in parallel with the
+            workers of ``n_pool``. Set to twice the number of workers
+            if the argument is set to ``None``. The parameter is only
+            used in combination with ``n_pool``.
 
         Returns
         -------
@@ -2937,19 +3428,9 @@ class FitModel:
         print(f"Number of live points: {n_live_points}")
         print(f"Resume previous fit: {resume}")
 
-        # Get the MPI rank of the process
-
-        try:
-            from mpi4py import MPI
-
-            mpi_rank = MPI.COMM_WORLD.Get_rank()
-
-        except ModuleNotFoundError:
-            mpi_rank = 0
-
         # Create the output folder if required
 
-        if mpi_rank == 0 and not os.path.exists(output):
+        if self.mpi_rank == 0 and not os.path.exists(output):
             print(f"Creating output folder: {output}")
             os.mkdir(output)
 
@@ -2960,21 +3441,103 @@ class FitModel:
 
         out_basename = os.path.join(output, "retrieval_")
 
-        if not mpi_pool:
-            if n_pool is not None:
-                with dynesty.pool.Pool(
-                    n_pool,
-                    self._lnlike_func,
-                    self._prior_transform,
-                    ptform_args=[self.bounds, self.cube_index],
-                ) as pool:
-                    print(f"Initialized a Dynesty.pool with {n_pool} workers")
+        # Ignore deprecation warnings that are raised
+        # while sampling, so not with every likelihood call
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=DeprecationWarning)
+
+            if not mpi_pool:
+                if n_pool is not None:
+                    with dynesty.pool.Pool(
+                        n_pool,
+                        self._lnlike_func,
+                        self._prior_transform,
+                    ) as pool:
+                        print(f"Initialized a Dynesty.pool with {n_pool} workers")
+
+                        # Keep the queue larger than the number of workers
+                        # such that the workers remain busy, while the bounds
+                        # are updated by the main process
+
+                        if queue_size is None:
+                            queue_size = 2 * n_pool
+
+                        use_pool = {
+                            "prior_transform": True,
+                            "loglikelihood": True,
+                            "propose_point": True,
+                            "update_bound": False,
+                        }
+
+                        if dynamic:
+                            if resume:
+                                dsampler = dynesty.DynamicNestedSampler.restore(
+                                    fname=out_basename + "dynesty.save",
+                                    pool=pool,
+                                )
+
+                                print(
+                                    "Resumed a Dynesty run from "
+                                    f"{out_basename}dynesty.save"
+                                )
+
+                            else:
+                                dsampler = dynesty.DynamicNestedSampler(
+                                    loglikelihood=pool.loglike,
+                                    prior_transform=pool.prior_transform,
+                                    ndim=len(self.modelpar),
+                                    pool=pool,
+                                    queue_size=queue_size,
+                                    use_pool=use_pool,
+                                    sample=sample_method,
+                                    bound=bound,
+                                )
+
+                            dsampler.run_nested(
+                                dlogz_init=evidence_tolerance,
+                                nlive_init=n_live_points,
+                                checkpoint_file=out_basename + "dynesty.save",
+                                checkpoint_every=checkpoint_every,
+                                resume=resume,
+                            )
+
+                        else:
+                            if resume:
+                                dsampler = dynesty.NestedSampler.restore(
+                                    fname=out_basename + "dynesty.save",
+                                    pool=pool,
+                                )
+
+                                print(
+                                    "Resumed a Dynesty run from "
+                                    f"{out_basename}dynesty.save"
+                                )
+
+                            else:
+                                dsampler = dynesty.NestedSampler(
+                                    loglikelihood=pool.loglike,
+                                    prior_transform=pool.prior_transform,
+                                    ndim=len(self.modelpar),
+                                    pool=pool,
+                                    queue_size=queue_size,
+                                    use_pool=use_pool,
+                                    nlive=n_live_points,
+                                    sample=sample_method,
+                                    bound=bound,
+                                )
 
+                            dsampler.run_nested(
+                                dlogz=evidence_tolerance,
+                                checkpoint_file=out_basename + "dynesty.save",
+                                checkpoint_every=checkpoint_every,
+                                resume=resume,
+                            )
+                else:
                     if dynamic:
                         if resume:
                             dsampler = dynesty.DynamicNestedSampler.restore(
-                                fname=out_basename + "dynesty.save",
-                                pool=pool,
+                                fname=out_basename + "dynesty.save"
                             )
 
                             print(
@@ -2984,10 +3547,9 @@ class FitModel:
 
                         else:
                             dsampler = dynesty.DynamicNestedSampler(
-                                loglikelihood=pool.loglike,
-                                prior_transform=pool.prior_transform,
+                                loglikelihood=self._lnlike_func,
+                                prior_transform=self._prior_transform,
                                 ndim=len(self.modelpar),
-                                pool=pool,
                                 sample=sample_method,
                                 bound=bound,
                             )
@@ -2996,14 +3558,14 @@ class FitModel:
                             dlogz_init=evidence_tolerance,
                             nlive_init=n_live_points,
                             checkpoint_file=out_basename + "dynesty.save",
+                            checkpoint_every=checkpoint_every,
                             resume=resume,
                         )
 
                     else:
                         if resume:
                             dsampler = dynesty.NestedSampler.restore(
-                                fname=out_basename + "dynesty.save",
-                                pool=pool,
+                                fname=out_basename + "dynesty.save"
                             )
 
                             print(
@@ -3013,11 +3575,9 @@ class FitModel:
 
                         else:
                             dsampler = dynesty.NestedSampler(
-                                loglikelihood=pool.loglike,
-                                prior_transform=pool.prior_transform,
+                                loglikelihood=self._lnlike_func,
+                                prior_transform=self._prior_transform,
                                 ndim=len(self.modelpar),
-                                pool=pool,
-                                nlive=n_live_points,
                                 sample=sample_method,
                                 bound=bound,
                             )
@@ -3025,127 +3585,97 @@ class FitModel:
                         dsampler.run_nested(
                             dlogz=evidence_tolerance,
                             checkpoint_file=out_basename + "dynesty.save",
+                            checkpoint_every=checkpoint_every,
                             resume=resume,
                         )
-            else:
-                if dynamic:
-                    if resume:
-                        dsampler = dynesty.DynamicNestedSampler.restore(
-                            fname=out_basename + "dynesty.save"
-                        )
 
-                        print(f"Resumed a Dynesty run from {out_basename}dynesty.save")
+            else:
+                # The context manager closes the pool when the sampling
+                # has finished, such that the worker processes will exit
 
-                    else:
-                        dsampler = dynesty.DynamicNestedSampler(
-                            loglikelihood=self._lnlike_func,
-                            prior_transform=self._prior_transform,
-                            ndim=len(self.modelpar),
-                            ptform_args=[self.bounds, self.cube_index],
-                            sample=sample_method,
-                            bound=bound,
-                        )
+                with MPIPool() as pool:
+                    if not pool.is_master():
+                        pool.wait()
+                        sys.exit(0)
 
-                    dsampler.run_nested(
-                        dlogz_init=evidence_tolerance,
-                        nlive_init=n_live_points,
-                        checkpoint_file=out_basename + "dynesty.save",
-                        resume=resume,
-                    )
+                    print("Created an MPIPool object.")
 
-                else:
-                    if resume:
-                        dsampler = dynesty.NestedSampler.restore(
-                            fname=out_basename + "dynesty.save"
-                        )
+                    if dynamic:
+                        if resume:
+                            dsampler = dynesty.DynamicNestedSampler.restore(
+                                fname=out_basename + "dynesty.save",
+                                pool=pool,
+                            )
 
-                        print(f"Resumed a Dynesty run from {out_basename}dynesty.save")
+                        else:
+                            dsampler = dynesty.DynamicNestedSampler(
+                                loglikelihood=self._lnlike_func,
+                                prior_transform=self._prior_transform,
+                                ndim=len(self.modelpar),
+                                pool=pool,
+                                queue_size=pool.size,
+                                sample=sample_method,
+                                bound=bound,
+                            )
 
-                    else:
-                        dsampler = dynesty.NestedSampler(
-                            loglikelihood=self._lnlike_func,
-                            prior_transform=self._prior_transform,
-                            ndim=len(self.modelpar),
-                            ptform_args=[self.bounds, self.cube_index],
-                            sample=sample_method,
-                            bound=bound,
+                        dsampler.run_nested(
+                            dlogz_init=evidence_tolerance,
+                            nlive_init=n_live_points,
+                            checkpoint_file=out_basename + "dynesty.save",
+                            checkpoint_every=checkpoint_every,
+                            resume=resume,
                         )
 
-                    dsampler.run_nested(
-                        dlogz=evidence_tolerance,
-                        checkpoint_file=out_basename + "dynesty.save",
-                        resume=resume,
-                    )
-
-        else:
-            pool = MPIPool()
-
-            if not pool.is_master():
-                pool.wait()
-                sys.exit(0)
-
-            print("Created an MPIPool object.")
-
-            if dynamic:
-                if resume:
-                    dsampler = dynesty.DynamicNestedSampler.restore(
-                        fname=out_basename + "dynesty.save",
-                        pool=pool,
-                    )
+                    else:
+                        if resume:
+                            dsampler = dynesty.NestedSampler.restore(
+                                fname=out_basename + "dynesty.save",
+                                pool=pool,
+                            )
 
-                else:
-                    dsampler = dynesty.DynamicNestedSampler(
-                        loglikelihood=self._lnlike_func,
-                        prior_transform=self._prior_transform,
-                        ndim=len(self.modelpar),
-                        ptform_args=[self.bounds, self.cube_index],
-                        pool=pool,
-                        sample=sample_method,
-                        bound=bound,
-                    )
+                        else:
+                            dsampler = dynesty.NestedSampler(
+                                loglikelihood=self._lnlike_func,
+                                prior_transform=self._prior_transform,
+                                ndim=len(self.modelpar),
+                                pool=pool,
+                                queue_size=pool.size,
+                                nlive=n_live_points,
+                                sample=sample_method,
+                                bound=bound,
+                            )
 
-                dsampler.run_nested(
-                    dlogz_init=evidence_tolerance,
-                    nlive_init=n_live_points,
-                    checkpoint_file=out_basename + "dynesty.save",
-                    resume=resume,
-                )
+                        dsampler.run_nested(
+                            dlogz=evidence_tolerance,
+                            checkpoint_file=out_basename + "dynesty.save",
+                            checkpoint_every=checkpoint_every,
+                            resume=resume,
+                        )
 
-            else:
-                if resume:
-                    dsampler = dynesty.NestedSampler.restore(
-                        fname=out_basename + "dynesty.save",
-                        pool=pool,
-                    )
+        results = dsampler.results
 
-                else:
-                    dsampler = dynesty.NestedSampler(
-                        loglikelihood=self._lnlike_func,
-                        prior_transform=self._prior_transform,
-                        ndim=len(self.modelpar),
-                        ptform_args=[self.bounds, self.cube_index],
-                        pool=pool,
-                        nlive=n_live_points,
-                        sample=sample_method,
-                        bound=bound,
-                    )
+        # Resample the indices instead of the samples, such that
+        # the log-likelihoods belong to the equally-weighted samples
 
-                dsampler.run_nested(
-                    dlogz=evidence_tolerance,
-                    checkpoint_file=out_basename + "dynesty.save",
-                    resume=resume,
-                )
+        sample_index = dynesty.utils.resample_equal(
+            np.arange(results.samples.shape[0]), results.importance_weights()
+        )
 
-        results = dsampler.results
-        samples = results.samples_equal()
-        ln_prob = results.logl
+        samples = results.samples[sample_index]
+        ln_prob = results.logl[sample_index]
 
         print(f"\nSamples shape: {samples.shape}")
         print(f"Number of iterations: {results.niter}")
 
-        out_file = out_basename + "post_equal_weights.dat"
-        print(f"Storing samples: {out_file}")
-        np.savetxt(out_file, np.c_[samples, ln_prob])
+        if ascii_output:
+            out_file = out_basename + "post_equal_weights.dat"
+            print(f"Storing samples: {out_file}")
+            np.savetxt(out_file, np.column_stack([samples, ln_prob]))
+
+        else:
+            out_file = out_basename + "post_equal_weights.npy"
+            print(f"Storing samples: {out_file}")
+            np.save(out_file, np.column_stack([samples, ln_prob]))
 
         # Nested sampling global log-evidence
         # TODO check if selecting the last index is correct
@@ -3154,51 +3684,30 @@ class FitModel:
         ln_z_error = results.logzerr[-1]
         print(f"\nNested sampling log-evidence: {ln_z:.2f} +/- {ln_z_error:.2f}")
 
-        # Get the best-fit (highest likelihood) point
+        # Get the best-fit (highest likelihood) point from all
+        # samples, since it may not be among the resampled points
 
-        max_idx = np.argmax(ln_prob)
-        max_lnlike = ln_prob[max_idx]
-        best_params = samples[max_idx]
+        max_idx = np.argmax(results.logl)
+        max_lnlike = results.logl[max_idx]
+        best_params = results.samples[max_idx]
 
         print("\nSample with the highest probability:")
         print(f"   - Log-likelihood = {max_lnlike:.2f}")
 
-        for i, item in enumerate(self.modelpar):
-            if -0.1 < best_params[i] < 0.1:
-                print(f"   - {self.modelpar[i]} = {best_params[i]:.2e}")
-            else:
-                print(f"   - {self.modelpar[i]} = {best_params[i]:.2f}")
-
-        spec_labels = []
-        for item in self.spectrum:
-            if f"scaling_{item}" in self.bounds:
-                spec_labels.append(f"scaling_{item}")
-
-        # Adding the fixed parameters to the samples
+        print(_format_params(self.modelpar, best_params))
 
-        for key, value in self.fix_param.items():
-            self.modelpar.append(key)
-
-            app_param = np.full(samples.shape[0], value)
-            app_param = app_param[..., np.newaxis]
+        # Adding the fixed parameters, which are written as
+        # additional columns when storing the samples
 
-            samples = np.append(samples, app_param, axis=1)
+        self.modelpar.extend(self.fix_param.keys())
 
         # Dictionary with attributes that will be stored
 
-        attr_dict = {
-            "spec_type": "model",
-            "spec_name": self.model,
-            "ln_evidence": (ln_z, ln_z_error),
-            "parallax": self.obj_parallax[0],
-        }
-
-        if self.ext_filter is not None:
-            attr_dict["ext_filter"] = self.ext_filter
+        attr_dict = {**self.attr_dict, "ln_evidence": (ln_z, ln_z_error)}
 
         # Add samples to the database
 
-        if mpi_rank == 0:
+        if self.mpi_rank == 0:
             # Writing the samples to the database is only
             # possible when using a single process
             from species.data.database import Database
@@ -3213,25 +3722,7 @@ class FitModel:
                 modelpar=self.modelpar,
                 bounds=self.bounds,
                 normal_prior=self.normal_prior,
-                spec_labels=spec_labels,
+                spec_labels=self.spec_labels,
                 attr_dict=attr_dict,
+                fix_param=self.fix_param,
             )
-            
-def gtotd_emission(gtotd_radius, parallax, wavelength, teff, radius):
-    #function for calculating the emission from a
-    #geometrically thin, optically thick disk at a certain radius
-
-    flux =  (
-        4. * np.pi * constants.PLANCK * constants.LIGHT**2
-        * (gtotd_radius * constants.R_JUP) #unit: m
-        / (1e3 * constants.PARSEC / parallax)**2 #distance squared, unit: m**2
-        / (wavelength * 1e-6)**5 #unit: m**5
-        / ( np.exp(
-                constants.PLANCK * constants.LIGHT
-                / (wavelength * 1e-6) #unit: m
-                / ( constants.BOLTZMANN * teff * (2./3./np.pi)**.25 * (gtotd_radius/radius)**-.75 )
-            ) -1
-        )
-    ) # unit: W m-2 m-1
-    
-    return(flux * 1e-6) #unit: W m-2 um-1
\ No newline at end of file
@@ -2945,11 +2945,11 @@ class AtmosphericRetrieval:
                         sigma_ratio = (
                             np.sqrt(data_var) / self.spectrum[spec_item][0][:, 2]
                         )
-                        sigma_j, sigma_i = np.meshgrid(sigma_ratio, sigma_ratio)
 
                         # Calculate the inversion of the infalted covariances
                         data_cov_inv = np.linalg.inv(
-                            self.spectrum[spec_item][1] * sigma_i * sigma_j
+                            self.spectrum[spec_item][1]
+                            * np.outer(sigma_ratio, sigma_ratio)
                         )
 
                     # Use the inverted covariance matrix
@@ -2961,22 +2961,16 @@ class AtmosphericRetrieval:
                 else:
                     if spec_item in self.fit_corr:
                         # Covariance model (Wang et al. 2020)
-                        wavel_j, wavel_i = np.meshgrid(data_wavel, data_wavel)
+                        wavel_sqdiff = np.subtract.outer(data_wavel, data_wavel) ** 2
 
                         error = np.sqrt(data_var)  # (W m-2 um-1)
-                        error_j, error_i = np.meshgrid(error, error)
-
-                        cov_matrix = (
-                            corr_amp[spec_item] ** 2
-                            * error_i
-                            * error_j
-                            * np.exp(
-                                -((wavel_i - wavel_j) ** 2)
-                                / (2.0 * corr_len[spec_item] ** 2)
-                            )
-                            + (1.0 - corr_amp[spec_item] ** 2)
-                            * np.eye(data_wavel.shape[0])
-                            * error_i**2
+
+                        cov_matrix = corr_amp[spec_item] ** 2 * np.outer(
+                            error, error
+                        ) * np.exp(
+                            -wavel_sqdiff / (2.0 * corr_len[spec_item] ** 2)
+                        ) + np.diag(
+                            (1.0 - corr_amp[spec_item] ** 2) * error**2
                         )
 
                         dot_tmp = np.dot(
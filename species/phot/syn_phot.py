@@ -368,6 +368,63 @@ class SyntheticPhotometry:
 
         return syn_flux, error_flux
 
+    @typechecked
+    def flux_weights(self, wavelength: np.ndarray) -> np.ndarray:
+        """
+        Function for calculating the weights of the fluxes at the
+        ``wavelength`` points for the synthetic photometry. The dot
+        product of the weights with a flux array gives the same
+        average flux as
+        :func:`~species.phot.syn_phot.SyntheticPhotometry.spectrum_to_flux`
+        for a spectrum without NaNs. The weights of multiple filters
+        can therefore be combined in a single (sparse) matrix.
+
+        Parameters
+        ----------
+        wavelength : np.ndarray
+            Wavelength points (um) of the spectrum, which should
+            cover the full wavelength range of the filter.
+
+        Returns
+        -------
+        np.ndarray
+            Weights of the fluxes, which are zero outside the
+            wavelength range of the filter profile.
+        """
+
+        if self.filter_interp is None:
+            read_filt = ReadFilter(self.filter_name)
+            self.filter_interp = read_filt.interpolate_filter()
+
+            if self.wavel_range is None:
+                self.wavel_range = read_filt.wavelength_range()
+
+        indices = np.where(
+            (self.wavel_range[0] <= wavelength) & (wavelength <= self.wavel_range[1])
+        )[0]
+
+        transmission = self.filter_interp(wavelength[indices])
+
+        indices = indices[~np.isnan(transmission)]
+        transmission = transmission[~np.isnan(transmission)]
+
+        if self.det_type == "photon":
+            transmission *= wavelength[indices]
+
+        # Weights of the trapezoidal integration
+
+        wavel_diff = np.diff(wavelength[indices])
+
+        trapz_weights = np.zeros(indices.size)
+        trapz_weights[:-1] += 0.5 * wavel_diff
+        trapz_weights[1:] += 0.5 * wavel_diff
+
+        weights = np.zeros(wavelength.size)
+        weights[indices] = trapz_weights * transmission
+        weights /= np.sum(weights)
+
+        return weights
+
     @typechecked
     def spectrum_to_magnitude(
         self,
@@ -283,12 +283,18 @@ class ReadCalibration:
             print(f"b = {popt[1]} +/- {sigma[1]}")
             print(f"c = {popt[2]} +/- {sigma[2]}")
 
-            while wavelength[-1] <= 6.0:
-                wl_add = wavelength[-1] + wavelength[-1] / 1000.0
+            if wavelength[-1] <= 6.0:
+                # Extend the spectrum up to 6 um with a constant
+                # lambda/d_lambda = 1000, so a geometric sequence
+                # of wavelengths that is computed in one step
+                log_ratio = np.log1p(1.0 / 1000.0)
+                n_add = int(np.log(6.0 / wavelength[-1]) / log_ratio) + 1
+
+                wl_add = wavelength[-1] * np.exp(log_ratio * np.arange(1, n_add + 1))
 
                 wavelength = np.append(wavelength, wl_add)
                 flux = np.append(flux, _power_law(wl_add, popt[0], popt[1], popt[2]))
-                error = np.append(error, 0.0)
+                error = np.append(error, np.zeros(n_add))
 
         if wavel_sampling is not None:
             wavelength_new = create_wavelengths(
@@ -2,10 +2,13 @@
 Module with reading functionalities for atmospheric model spectra.
 """
 
+import glob
+import hashlib
 import os
 import warnings
 
 from configparser import ConfigParser
+from functools import partial
 from typing import Dict, List, Optional, Tuple, Union
 
 import h5py
@@ -30,12 +33,25 @@ from species.phot.syn_phot import SyntheticPhotometry
 from species.read.read_filter import ReadFilter
 from species.read.read_planck import ReadPlanck
 from species.util.convert_util import logg_to_mass
+from species.util.core_util import shared_array
 from species.util.data_util import convert_units
 from species.util.dust_util import check_dust_database, ism_extinction, convert_to_av
-from species.util.model_util import binary_to_single
+from species.util.model_util import binary_to_single, interp_grid_linear
 from species.util.spec_util import smooth_spectrum
 
 
+# 4 pi h c^2 R_jup / (1e3 pc)^2 * (W m-2 m-1 -> W m-2 um-1)
+GTOTD_FACTOR = (
+    4.0
+    * np.pi
+    * constants.PLANCK
+    * constants.LIGHT**2
+    * constants.R_JUP
+    / (1e3 * constants.PARSEC) ** 2
+    * 1e-6
+)
+
+
 class ReadModel:
     """
     Class for reading a model spectrum from the database.
@@ -47,6 +63,7 @@ class ReadModel:
         model: str,
         wavel_range: Optional[Tuple[float, float]] = None,
         filter_name: Optional[str] = None,
+        teff_range: Optional[Tuple[float, float]] = None,
     ):
         """
         Parameters
@@ -59,6 +76,12 @@ class ReadModel:
         filter_name : str, None
             Filter name that is used for the wavelength range. The
             ``wavel_range`` is used if set to ``None``.
+        teff_range : tuple(float, float), None
+            Temperature range (K) of the grid points that are used
+            for the interpolation. The grid points directly outside
+            the range are included such that the full range can be
+            interpolated. All grid points are used if the argument
+            is set to ``None``.
 
         Returns
         -------
@@ -83,6 +106,7 @@ class ReadModel:
 
         self.filter_name = filter_name
         self.wavel_range = wavel_range
+        self.teff_range = teff_range
 
         if self.filter_name is not None:
             read_filter = ReadFilter(self.filter_name)
@@ -219,15 +243,22 @@ class ReadModel:
             self.wl_points, self.wl_index = self.wavelength_points()
 
         with self.open_database() as hdf5_file:
-            grid_flux = np.array(hdf5_file[f"models/{self.model}/flux"])
+            dset = hdf5_file[f"models/{self.model}/flux"]
+
+            if self.teff_range is None:
+                grid_flux = np.array(dset)
+
+            else:
+                # Only read the spectra within the temperature range
+                param_list = self.get_parameters()
+                grid_slice = [slice(None)] * dset.ndim
+                grid_slice[param_list.index("teff")] = self.teff_index()
+                grid_flux = dset[tuple(grid_slice)]
+
             grid_flux = grid_flux[..., self.wl_index]
 
-        self.spectrum_interp = RegularGridInterpolator(
-            grid_points,
-            grid_flux,
-            method="linear",
-            bounds_error=False,
-            fill_value=np.nan,
+        self.spectrum_interp = partial(
+            interp_grid_linear, grid_points, np.ascontiguousarray(grid_flux)
         )
 
     @typechecked
@@ -239,7 +270,14 @@ class ReadModel:
     ) -> None:
         """
         Internal function for linearly interpolating the grid of model
-        spectra for a given filter or wavelength sampling.
+        spectra for a given filter or wavelength sampling. The fluxes
+        at the grid points are stored in the ``interp_grids`` folder
+        of the ``data_folder``, such that they are only calculated
+        once for the same model, filter or wavelengths, and parameter
+        ranges. The stored grid is not used if the database has been
+        modified in the meantime, in which case the stored grids of
+        the model are removed when a new grid is stored. The
+        ``interp_grids`` folder can also be safely removed manually.
 
         wavel_resample : np.ndarray, None
             Wavelength points for the resampling of the spectrum. The
@@ -254,8 +292,6 @@ class ReadModel:
             None
         """
 
-        self.interpolate_model()
-
         if "smooth" in kwargs:
             warnings.warn(
                 "The 'smooth' parameter has been "
@@ -273,7 +309,6 @@ class ReadModel:
             points.append(list(item))
 
         param_list = self.get_parameters()
-        n_param = len(param_list)
 
         dim_size = []
         for item in points:
@@ -284,109 +319,107 @@ class ReadModel:
         else:
             dim_size.append(wavel_resample.size)
 
-        flux_new = np.zeros(dim_size)
+        # The filename contains the path and modification time of
+        # the database, such that the grid is recalculated after
+        # adding the model again, and a hash of the arguments that
+        # determine the interpolated grid
 
-        if n_param == 1:
-            model_param = {}
+        database_key = hashlib.sha1(
+            os.path.abspath(self.database).encode()
+        ).hexdigest()[:12]
 
-            for i, item_0 in enumerate(points[0]):
-                model_param[param_list[0]] = item_0
+        database_stamp = os.stat(self.database).st_mtime_ns
+
+        grid_hash = hashlib.sha1()
+
+        grid_hash.update(
+            repr(
+                (
+                    self.model,
+                    self.filter_name,
+                    self.wavel_range,
+                    spec_res,
+                    points,
+                )
+            ).encode()
+        )
+
+        if wavel_resample is not None:
+            grid_hash.update(np.asarray(wavel_resample, dtype=float).tobytes())
+
+        grid_prefix = os.path.join(
+            self.data_folder, "interp_grids", f"{self.model}_{database_key}_"
+        )
+
+        grid_file = f"{grid_prefix}{database_stamp}_{grid_hash.hexdigest()}.npy"
+
+        @typechecked
+        def _fill_grid(flux_new: np.ndarray) -> None:
+            """
+            Function for calculating the fluxes at the grid points.
+
+            Parameters
+            ----------
+            flux_new : np.ndarray
+                Array that is filled in place with the fluxes.
+
+            Returns
+            -------
+            NoneType
+                None
+            """
+
+            if os.path.exists(grid_file):
+                flux_new[:] = np.load(grid_file)
+                return
+
+            self.interpolate_model()
+
+            for grid_index in np.ndindex(*dim_size[:-1]):
+                model_param = {}
+
+                for i, item in enumerate(grid_index):
+                    model_param[param_list[i]] = points[i][item]
 
                 if self.filter_name is not None:
-                    flux_new[i] = self.get_flux(model_param)[0]
+                    flux_new[grid_index] = self.get_flux(model_param)[0]
 
                 else:
-                    flux_new[i, :] = self.get_model(
+                    flux_new[grid_index] = self.get_model(
                         model_param,
                         spec_res=spec_res,
                         wavel_resample=wavel_resample,
                     ).flux
 
-        elif n_param == 2:
-            model_param = {}
-
-            for i, item_0 in enumerate(points[0]):
-                for j, item_1 in enumerate(points[1]):
-                    model_param[param_list[0]] = item_0
-                    model_param[param_list[1]] = item_1
-
-                    if self.filter_name is not None:
-                        flux_new[i, j] = self.get_flux(model_param)[0]
-
-                    else:
-                        flux_new[i, j, :] = self.get_model(
-                            model_param,
-                            spec_res=spec_res,
-                            wavel_resample=wavel_resample,
-                        ).flux
-
-        elif n_param == 3:
-            model_param = {}
-
-            for i, item_0 in enumerate(points[0]):
-                for j, item_1 in enumerate(points[1]):
-                    for k, item_2 in enumerate(points[2]):
-                        model_param[param_list[0]] = item_0
-                        model_param[param_list[1]] = item_1
-                        model_param[param_list[2]] = item_2
-
-                        if self.filter_name is not None:
-                            flux_new[i, j, k] = self.get_flux(model_param)[0]
-
-                        else:
-                            flux_new[i, j, k, :] = self.get_model(
-                                model_param,
-                                spec_res=spec_res,
-                                wavel_resample=wavel_resample,
-                            ).flux
-
-        elif n_param == 4:
-            model_param = {}
-
-            for i, item_0 in enumerate(points[0]):
-                for j, item_1 in enumerate(points[1]):
-                    for k, item_2 in enumerate(points[2]):
-                        for m, item_3 in enumerate(points[3]):
-                            model_param[param_list[0]] = item_0
-                            model_param[param_list[1]] = item_1
-                            model_param[param_list[2]] = item_2
-                            model_param[param_list[3]] = item_3
-
-                            if self.filter_name is not None:
-                                flux_new[i, j, k, m] = self.get_flux(model_param)[0]
-
-                            else:
-                                flux_new[i, j, k, m, :] = self.get_model(
-                                    model_param,
-                                    spec_res=spec_res,
-                                    wavel_resample=wavel_resample,
-                                ).flux
-
-        elif n_param == 5:
-            model_param = {}
-
-            for i, item_0 in enumerate(points[0]):
-                for j, item_1 in enumerate(points[1]):
-                    for k, item_2 in enumerate(points[2]):
-                        for m, item_3 in enumerate(points[3]):
-                            for n, item_4 in enumerate(points[4]):
-                                model_param[param_list[0]] = item_0
-                                model_param[param_list[1]] = item_1
-                                model_param[param_list[2]] = item_2
-                                model_param[param_list[3]] = item_3
-                                model_param[param_list[4]] = item_4
-
-                                if self.filter_name is not None:
-                                    flux_new[i, j, k, m, n] = self.get_flux(
-                                        model_param
-                                    )[0]
-
-                                else:
-                                    flux_new[i, j, k, m, n, :] = self.get_model(
-                                        model_param,
-                                        spec_res=spec_res,
-                                        wavel_resample=wavel_resample,
-                                    ).flux
+            # Write to a temporary file first such that
+            # an incomplete file is never read by a
+            # simultaneous fit
+
+            os.makedirs(os.path.dirname(grid_file), exist_ok=True)
+            tmp_file = f"{grid_file}.{os.getpid()}.tmp"
+
+            with open(tmp_file, "wb") as open_file:
+                np.save(open_file, flux_new)
+
+            os.replace(tmp_file, grid_file)
+
+            # Remove the grids of the same model that were
+            # calculated with a previous version of the database
+
+            for old_file in glob.glob(f"{glob.escape(grid_prefix)}*.npy"):
+                if not old_file.startswith(f"{grid_prefix}{database_stamp}_"):
+                    try:
+                        os.remove(old_file)
+                    except OSError:
+                        pass
+
+        # The grid is stored in single precision, which halves the
+        # memory that is read when interpolating the grid while
+        # the interpolation itself is done in double precision.
+        # With MPI, the grid is calculated once per node and
+        # shared by the processes on that node
+
+        flux_new = shared_array(tuple(dim_size), np.float32, _fill_grid)
 
         if self.filter_name is not None:
             read_filter = ReadFilter(self.filter_name)
@@ -395,12 +428,8 @@ class ReadModel:
         else:
             self.wl_points = wavel_resample
 
-        self.spectrum_interp = RegularGridInterpolator(
-            points,
-            flux_new,
-            method="linear",
-            bounds_error=False,
-            fill_value=np.nan,
+        self.spectrum_interp = partial(
+            interp_grid_linear, [np.array(item) for item in points], flux_new
         )
 
     @typechecked
@@ -1357,10 +1386,6 @@ class ReadModel:
         # Open de HDF5 database
 
         with self.open_database() as hdf5_file:
-            # Read the grid of fluxes from the database
-
-            flux = np.array(hdf5_file[f"models/{self.model}/flux"])
-
             # Find the indices of the grid points for which the spectrum will be extracted
 
             indices = []
@@ -1380,14 +1405,14 @@ class ReadModel:
 
                 indices.append(data_index[0])
 
-        # Append the wavelength indices to the list of grid indices
+            # Only read the spectrum at the requested grid point,
+            # which is stored as a single chunk in the database
 
-        indices.append(wl_index)
+            flux = hdf5_file[f"models/{self.model}/flux"][tuple(indices)]
 
-        # Extract the spectrum at the requested grid point and
-        # wavelength range
+        # Extract the requested wavelength range
 
-        flux = flux[tuple(indices)]
+        flux = flux[wl_index]
 
         # Apply (radius/distance)^2 scaling
 
@@ -1842,7 +1867,8 @@ class ReadModel:
     @typechecked
     def get_points(self) -> Dict[str, np.ndarray]:
         """
-        Function for extracting the grid points.
+        Function for extracting the grid points. The temperature
+        points are restricted to the ``teff_range`` if it was set.
 
         Returns
         -------
@@ -1861,8 +1887,43 @@ class ReadModel:
                 data = hdf5_file[f"models/{self.model}/{param_item}"]
                 points[param_item] = np.array(data)
 
+        if self.teff_range is not None:
+            points["teff"] = points["teff"][self.teff_index()]
+
         return points
 
+    @typechecked
+    def teff_index(self) -> slice:
+        """
+        Internal function for selecting the temperature points of
+        the grid that are required for interpolating within the
+        ``teff_range``.
+
+        Returns
+        -------
+        slice
+            Slice with the indices of the temperature points.
+        """
+
+        with self.open_database() as hdf5_file:
+            teff_points = np.array(hdf5_file[f"models/{self.model}/teff"])
+
+        # Include the grid points that enclose the range
+        index_low = np.searchsorted(teff_points, self.teff_range[0], side="right")
+        index_high = np.searchsorted(teff_points, self.teff_range[1], side="left")
+
+        index_start = max(index_low - 1, 0)
+        index_stop = min(index_high + 1, teff_points.size)
+
+        # The linear interpolation requires at least two points,
+        # also when Teff is fixed at one of the grid points
+
+        if index_stop - index_start < 2:
+            index_start = max(min(index_start, teff_points.size - 2), 0)
+            index_stop = min(index_start + 2, teff_points.size)
+
+        return slice(index_start, index_stop)
+
     @typechecked
     def get_parameters(self) -> List[str]:
         """
@@ -2239,22 +2300,31 @@ class ReadModel:
             color2=color_2_list,
             sptype=param_list,
         )
-        
+
+
 def gtotd_emission(gtotd_radius, parallax, wavelength, teff, radius):
-    #function for calculating the emission from a
-    #geometrically thin, optically thick disk at a certain radius
-
-    flux =  (
-        4. * np.pi * constants.PLANCK * constants.LIGHT**2
-        * (gtotd_radius * constants.R_JUP) #unit: m
-        / (1e3 * constants.PARSEC / parallax)**2 #distance squared, unit: m**2
-        / (wavelength * 1e-6)**5 #unit: m**5
-        / ( np.exp(
-                constants.PLANCK * constants.LIGHT
-                / (wavelength * 1e-6) #unit: m
-                / ( constants.BOLTZMANN * teff * (2./3./np.pi)**.25 * (gtotd_radius/radius)**-.75 )
-            ) -1
+    # function for calculating the emission from a
+    # geometrically thin, optically thick disk at a certain radius
+
+    # the unit conversions are folded into the constant
+    # prefactor and the wavelength is converted only once
+    wavel_m = wavelength * 1e-6  # unit: m
+
+    # temperature of the disk at the radius, unit: K
+    disk_teff = (
+        teff * (2.0 / 3.0 / np.pi) ** 0.25 * (gtotd_radius / radius) ** -0.75
+    )
+
+    flux = (
+        GTOTD_FACTOR
+        * gtotd_radius  # unit: Rjup
+        * parallax**2  # unit: mas**2
+        / wavel_m**5  # unit: m**5
+        / np.expm1(
+            constants.PLANCK
+            * constants.LIGHT
+            / (constants.BOLTZMANN * disk_teff * wavel_m)
         )
-    ) # unit: W m-2 m-1
-    
-    return(flux * 1e-6) #unit: W m-2 um-1
+    )
+
+    return flux  # unit: W m-2 um-1
@@ -2,6 +2,11 @@
 Module with utility functions for the ``species`` core.
 """
 
+from functools import lru_cache
+from typing import Callable, Tuple
+
+import numpy as np
+
 from typeguard import typechecked
 
 
@@ -36,3 +41,97 @@ def print_section(
 
     print(sect_title)
     print(len(sect_title) * bound_char + "\n")
+
+
+@lru_cache(maxsize=None)
+@typechecked
+def mpi_rank() -> int:
+    """
+    Function for getting the MPI rank of the process. The rank
+    is looked up once and cached for subsequent calls.
+
+    Returns
+    -------
+    int
+        Rank of the process, which is 0 if ``mpi4py`` is
+        not installed.
+    """
+
+    try:
+        from mpi4py import MPI
+
+        return MPI.COMM_WORLD.Get_rank()
+
+    except ModuleNotFoundError:
+        return 0
+
+
+@typechecked
+def shared_array(
+    shape: Tuple[int, ...],
+    dtype: type,
+    fill_func: Callable[[np.ndarray], None],
+) -> np.ndarray:
+    """
+    Function for creating an array that is shared by the MPI
+    processes on the same node. The array is allocated in a
+    shared-memory window with ``mpi4py``, filled by the first
+    process of each node, and mapped read-only by the other
+    processes. A regular array is created and filled if
+    ``mpi4py`` is not installed or if there is a single process.
+    The function is collective, so it should be called by all
+    MPI processes.
+
+    Parameters
+    ----------
+    shape : tuple(int, ...)
+        Shape of the array.
+    dtype : type
+        Data type of the array.
+    fill_func : callable
+        Function that fills the array in place. It is only
+        called by the first process of each node.
+
+    Returns
+    -------
+    np.ndarray
+        Array with the content from ``fill_func``.
+    """
+
+    try:
+        from mpi4py import MPI
+
+        n_proc = MPI.COMM_WORLD.Get_size()
+
+    except ModuleNotFoundError:
+        n_proc = 1
+
+    if n_proc == 1:
+        array = np.zeros(shape, dtype=dtype)
+        fill_func(array)
+
+        return array
+
+    # Allocate the memory only on the first process of each
+    # node, after which the other processes query the address
+
+    node_comm = MPI.COMM_WORLD.Split_type(MPI.COMM_TYPE_SHARED)
+    node_root = node_comm.Get_rank() == 0
+
+    item_size = np.dtype(dtype).itemsize
+    n_bytes = int(np.prod(shape)) * item_size if node_root else 0
+
+    window = MPI.Win.Allocate_shared(n_bytes, item_size, comm=node_comm)
+    buffer, _ = window.Shared_query(0)
+
+    array = np.ndarray(shape, dtype=dtype, buffer=buffer)
+
+    if node_root:
+        array.fill(0)
+        fill_func(array)
+
+    node_comm.Barrier()
+
+    array.flags.writeable = False
+
+    return array
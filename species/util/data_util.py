@@ -3,30 +3,124 @@ Utility functions for data processing.
 """
 
 import os
+import shutil
 import tarfile
 import warnings
 
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import h5py
 import numpy as np
+import pandas as pd
+import requests
 
 from scipy.interpolate import griddata
+from tqdm.auto import tqdm
 from typeguard import typechecked
 
 from species.core import constants
 
 
+@typechecked
+def download_file(url: str, data_file: str, chunk_size: int = 8 << 20) -> None:
+    """
+    Function for downloading a (large) file while showing a progress
+    bar. The data is written in chunks to a temporary file with the
+    ``.part`` extension, which is renamed to ``data_file`` when the
+    download is complete. If a previous download was interrupted,
+    then the download continues from the end of the ``.part`` file
+    in case the server supports HTTP range requests. A ``.part``
+    file that does not match the size of the file on the server
+    is removed and downloaded again.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file.
+    data_file : str
+        Path where the downloaded file will be stored.
+    chunk_size : int
+        Size (bytes) of the chunks that are written to the file.
+
+    Returns
+    -------
+    NoneType
+        None
+    """
+
+    part_file = f"{data_file}.part"
+
+    if os.path.isfile(part_file):
+        n_bytes = os.path.getsize(part_file)
+    else:
+        n_bytes = 0
+
+    if n_bytes > 0:
+        headers = {"Range": f"bytes={n_bytes}-"}
+    else:
+        headers = {}
+
+    with requests.get(url, headers=headers, stream=True, timeout=60.0) as response:
+        if response.status_code == 416:
+            # The requested range starts at or beyond the end
+            # of the file. The .part file is only complete if
+            # its size is equal to the size that is provided
+            # by the Content-Range header (bytes */size)
+
+            range_total = response.headers.get("Content-Range", "").rpartition("/")[2]
+
+            if range_total.isdigit() and int(range_total) == n_bytes:
+                os.replace(part_file, data_file)
+                return
+
+            # The .part file is corrupt or larger than the file
+            # on the server so the download is started again
+
+            response.close()
+            os.remove(part_file)
+
+            download_file(url, data_file, chunk_size=chunk_size)
+
+            return
+
+        response.raise_for_status()
+
+        if response.status_code != 206:
+            # The server does not support range requests
+            # so the download starts from the beginning
+            n_bytes = 0
+
+        n_total = int(response.headers.get("Content-Length", 0)) + n_bytes
+
+        with open(part_file, "ab" if n_bytes > 0 else "wb") as open_file, tqdm(
+            total=n_total,
+            initial=n_bytes,
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+        ) as progress_bar:
+            for data_chunk in response.iter_content(chunk_size=chunk_size):
+                open_file.write(data_chunk)
+                progress_bar.update(len(data_chunk))
+
+    os.replace(part_file, data_file)
+
+
 @typechecked
 def extract_tarfile(
     data_file: str,
     data_folder: str,
     member_list: Optional[List[tarfile.TarInfo]] = None,
+    member_filter: Optional[Callable[[tarfile.TarInfo], bool]] = None,
+    skip_existing: bool = False,
 ) -> None:
     """
     Function for safely unpacking a TAR file (`see details
-    <https://github.com/advisories/GHSA-gw9q-c7gh-j9vm>`_.
+    <https://github.com/advisories/GHSA-gw9q-c7gh-j9vm>`_. The
+    members are extracted while iterating once through the TAR
+    file, such that a compressed archive is only decompressed
+    a single time.
 
     Parameters
     ----------
@@ -37,6 +131,17 @@ def extract_tarfile(
     member_list : list(tarfile.TarInfo), None
         List with filenames that should be extracted from the TAR file.
         All files are extracted if the argument is set to ``None``.
+    member_filter : callable, None
+        Function that takes a ``tarfile.TarInfo`` as argument and
+        returns ``True`` if the member should be extracted. The
+        selection is done while reading the TAR file, so without
+        first decompressing the archive to obtain the list with
+        members. Not used if the argument is set to ``None``.
+    skip_existing : bool
+        Skip the extraction of files that are already present in
+        the ``data_folder`` with the same size as the TAR member,
+        for example from a previous call of the function. The data
+        of these members is then not written again to the disk.
 
     Returns
     -------
@@ -44,35 +149,54 @@ def extract_tarfile(
         None
     """
 
+    if member_list is not None:
+        member_names = {member.name for member in member_list}
+    else:
+        member_names = None
+
+    abs_directory = os.path.abspath(data_folder)
+
     with tarfile.open(data_file) as tar:
-        if member_list is None:
-            member_list = tar.getmembers()
+        for member in tar:
+            if member_names is not None and member.name not in member_names:
+                continue
+
+            if member_filter is not None and not member_filter(member):
+                continue
 
-        @typechecked
-        def is_within_directory(directory: str, target: str) -> bool:
-            abs_directory = os.path.abspath(directory)
-            abs_target = os.path.abspath(target)
+            member_path = os.path.abspath(Path(data_folder) / Path(member.name))
+            prefix = os.path.commonprefix([abs_directory, member_path])
+
+            if prefix != abs_directory:
+                raise Exception("Attempted path traversal in TAR file")
+
+            if (
+                skip_existing
+                and member.isfile()
+                and os.path.isfile(member_path)
+                and os.path.getsize(member_path) == member.size
+            ):
+                continue
 
-            prefix = os.path.commonprefix([abs_directory, abs_target])
+            if member.isfile():
+                # Copy the file data in blocks of 1 MiB instead
+                # of the 16 kiB blocks that are used by tarfile
 
-            return prefix == abs_directory
+                os.makedirs(os.path.dirname(member_path), exist_ok=True)
 
-        @typechecked
-        def safe_extract(
-            tar: tarfile.TarFile,
-            path: str = ".",
-            member_list: Optional[List] = None,
-            numeric_owner: bool = False,
-        ) -> None:
-            for member in member_list:
-                member_path = Path(path) / Path(member.name)
+                with tar.extractfile(member) as src_file, open(
+                    member_path, "wb"
+                ) as dst_file:
+                    shutil.copyfileobj(src_file, dst_file, length=1 << 20)
 
-                if not is_within_directory(path, str(member_path)):
-                    raise Exception("Attempted path traversal in TAR file")
+                # Restore the permissions and modification
+                # time, as is done by tar.extract
 
-            tar.extractall(path, members=member_list, numeric_owner=numeric_owner)
+                os.chmod(member_path, member.mode)
+                os.utime(member_path, (member.mtime, member.mtime))
 
-        safe_extract(tar, data_folder, member_list=member_list)
+            else:
+                tar.extract(member, data_folder)
 
 
 @typechecked
@@ -119,6 +243,42 @@ def update_sptype(sptypes: np.ndarray) -> List[str]:
     return sptypes_updated
 
 
+@typechecked
+def parallax_lookup(
+    parallax_data: pd.DataFrame,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Function for creating a dictionary with the parallax and
+    uncertainty of each object in the table with parallaxes that
+    is used by the spectral libraries, such that the parallax of
+    a spectrum is looked up without selecting rows from the table.
+
+    Parameters
+    ----------
+    parallax_data : pd.DataFrame
+        Table with the columns ``object``, ``parallax``, and
+        ``parallax_error``.
+
+    Returns
+    -------
+    dict
+        Dictionary with the object names as keys and tuples with
+        the parallax and uncertainty (mas) as values. The first
+        row is used for objects that occur multiple times.
+    """
+
+    parallax_dict = {}
+
+    for row_item in parallax_data.itertuples(index=False):
+        if row_item.object not in parallax_dict:
+            parallax_dict[row_item.object] = (
+                row_item.parallax,
+                row_item.parallax_error,
+            )
+
+    return parallax_dict
+
+
 def update_filter(filter_in):
     """
     Function to update a filter ID from the Vizier Photometry viewer
@@ -240,7 +400,7 @@ def sort_data(
 
     spec_shape.append(wavelength.shape[0])
 
-    spectrum = np.zeros(spec_shape)
+    spectrum = np.zeros(spec_shape, dtype=flux.dtype)
 
     for i in range(n_spectra):
         # The parameter order is: Teff, log(g), [Fe/H], C/O,
@@ -353,7 +513,43 @@ def write_data(
 
     database.create_dataset(f"models/{model}/wavelength", data=data_sorted[n_param])
 
-    database.create_dataset(f"models/{model}/flux", data=data_sorted[n_param + 1])
+    write_flux(model, database, data_sorted[n_param + 1])
+
+
+@typechecked
+def write_flux(model: str, database: h5py._hl.files.File, flux: np.ndarray) -> None:
+    """
+    Function for writing the grid with model spectra to the
+    database. The dataset is stored in chunks of a single
+    spectrum, which matches the access pattern when a spectrum
+    is extracted at a grid point, and is compressed with the
+    LZF filter after shuffling the bytes of the fluxes.
+
+    Parameters
+    ----------
+    model : str
+        Atmosphere model.
+    database: h5py._hl.files.File
+        HDF5 database.
+    flux : np.ndarray
+        Grid with the model spectra (W m-2 um-1), with the
+        wavelength dimension as last axis.
+
+    Returns
+    -------
+    NoneType
+        None
+    """
+
+    chunk_shape = (1,) * (flux.ndim - 1) + (flux.shape[-1],)
+
+    database.create_dataset(
+        f"models/{model}/flux",
+        data=flux,
+        chunks=chunk_shape,
+        compression="lzf",
+        shuffle=True,
+    )
 
 
 @typechecked
@@ -389,8 +585,11 @@ def add_missing(
         param_data.append(np.asarray(database[f"models/{model}/{item}"]))
         print(f"   - {item}: {grid_shape[i]}")
 
-    flux = np.asarray(database[f"models/{model}/flux"])  # (W m-1 um-1)
-    flux = np.log10(flux)
+    flux_linear = np.asarray(database[f"models/{model}/flux"])  # (W m-1 um-1)
+    flux = np.log10(flux_linear)
+
+    # Grid points with a spectrum that contains zero fluxes
+    fix_select = np.isinf(np.sum(flux, axis=-1))
 
     count_total = 0
     count_interp = 0
@@ -814,8 +1013,15 @@ def add_missing(
     print(f"Number of interpolated grid points: {count_interp}")
     print(f"Number of missing grid points: {count_missing}")
 
-    del database[f"models/{model}/flux"]
-    database.create_dataset(f"models/{model}/flux", data=10.0**flux)
+    # Only the spectra of the grid points that had to be
+    # fixed are converted back from log10(flux) to flux,
+    # such that the other spectra are stored unchanged
+
+    if np.any(fix_select):
+        flux_linear[fix_select] = 10.0 ** flux[fix_select]
+
+        del database[f"models/{model}/flux"]
+        write_flux(model, database, flux_linear)
 
 
 @typechecked
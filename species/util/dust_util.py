@@ -10,6 +10,7 @@ from typing import Dict, List, Tuple, Union
 import h5py
 import numpy as np
 
+from numba import njit
 from typeguard import typechecked
 from scipy.interpolate import interp1d, RegularGridInterpolator
 from scipy.stats import lognorm
@@ -559,6 +560,35 @@ def ism_extinction(
     elif isinstance(wavelengths, list):
         wavelengths = np.array(wavelengths)
 
+    a_coeff, b_coeff = ism_extinction_coeff(wavelengths)
+
+    return av_mag * (a_coeff + b_coeff / rv_red)
+
+
+@typechecked
+def ism_extinction_coeff(wavelengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Function for calculating the coefficients of the extinction
+    relation from `Cardelli et al. (1989) <https://ui.adsabs.
+    harvard.edu/abs/1989ApJ...345..245C/abstract>`_. The extinction
+    is given by ``av_mag * (a_coeff + b_coeff / rv_red)``, so the
+    coefficients only need to be calculated once for a fixed
+    wavelength sampling.
+
+    Parameters
+    ----------
+    wavelengths : np.ndarray
+        Array with the wavelengths (um) for which the
+        coefficients are calculated.
+
+    Returns
+    -------
+    np.ndarray
+        Coefficients :math:`a(x)` at ``wavelengths``.
+    np.ndarray
+        Coefficients :math:`b(x)` at ``wavelengths``.
+    """
+
     x_wavel = 1.0 / wavelengths
     y_wavel = x_wavel - 1.82
 
@@ -595,7 +625,48 @@ def ism_extinction(
             - 2.09002 * y_wavel[indices] ** 7
         )
 
-    return av_mag * (a_coeff + b_coeff / rv_red)
+    return a_coeff, b_coeff
+
+
+@njit(cache=True)
+def apply_ism_ext_coeff(
+    flux: np.ndarray,
+    av_mag: float,
+    rv_red: float,
+    a_coeff: np.ndarray,
+    b_coeff: np.ndarray,
+) -> None:
+    """
+    Function for applying the ISM extinction from
+    :func:`~species.util.dust_util.ism_extinction` in place to a
+    spectrum, with the coefficients that are precomputed with
+    :func:`~species.util.dust_util.ism_extinction_coeff`. The
+    extinction and attenuation are calculated in a single pass
+    over the wavelengths, so without temporary arrays.
+
+    Parameters
+    ----------
+    flux : np.ndarray
+        Fluxes (W m-2 um-1) of the spectrum, which are
+        attenuated in place.
+    av_mag : float
+        Extinction (mag) in the $V$ band.
+    rv_red : float
+        Reddening in the $V$ band, ``R_V = A_V / E(B-V)``.
+    a_coeff : np.ndarray
+        Coefficients :math:`a(x)` at the wavelengths of ``flux``.
+    b_coeff : np.ndarray
+        Coefficients :math:`b(x)` at the wavelengths of ``flux``.
+
+    Returns
+    -------
+    NoneType
+        None
+    """
+
+    for i in range(flux.size):
+        ext_mag = av_mag * (a_coeff[i] + b_coeff[i] / rv_red)
+        flux[i] *= 10.0 ** (-0.4 * ext_mag)
 
 
 @typechecked
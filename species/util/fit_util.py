@@ -9,6 +9,7 @@ from typing import Dict, List, Optional, Union
 import numpy as np
 import spectres
 
+from numba import njit
 from typeguard import typechecked
 
 from species.core.box import ObjectBox, ResidualsBox, SynphotBox, create_box
@@ -474,3 +475,101 @@ def get_residuals(
         chi2_stat=chi2_stat,
         n_dof=n_dof,
     )
+
+
+@njit(cache=True)
+def gaussian_lnlike(
+    data_flux: np.ndarray,
+    model_flux: np.ndarray,
+    data_var: np.ndarray,
+    weight: np.ndarray,
+) -> float:
+    """
+    Function for calculating the weighted log-likelihood of a
+    spectrum with uncorrelated, Gaussian uncertainties. The sum
+    is computed in a single compiled loop, without the temporary
+    arrays of the equivalent NumPy expression. Wavelengths for
+    which the log-likelihood is NaN are skipped, as with
+    ``np.nansum``.
+
+    Parameters
+    ----------
+    data_flux : np.ndarray
+        Flux of the data.
+    model_flux : np.ndarray
+        Flux of the model, at the wavelengths of the data.
+    data_var : np.ndarray
+        Variance of the data.
+    weight : np.ndarray
+        Weights of the wavelength points.
+
+    Returns
+    -------
+    float
+        Log-likelihood.
+    """
+
+    ln_like = 0.0
+
+    for i in range(data_flux.size):
+        ln_tmp = -0.5 * weight[i] * (data_flux[i] - model_flux[i]) ** 2
+        ln_tmp /= data_var[i]
+        ln_tmp -= 0.5 * np.log(2.0 * np.pi * data_var[i])
+
+        if not np.isnan(ln_tmp):
+            ln_like += ln_tmp
+
+    return ln_like
+
+
+@njit(cache=True)
+def photometry_lnlike(
+    data_flux: np.ndarray,
+    data_error: np.ndarray,
+    model_flux: np.ndarray,
+    error_scaling: np.ndarray,
+    weight: np.ndarray,
+    filter_index: np.ndarray,
+) -> float:
+    """
+    Function for calculating the weighted log-likelihood of the
+    photometric fluxes. The measurements of all filters are
+    provided as flattened arrays, such that a filter with
+    multiple measurements is included multiple times, and
+    the sum is computed in a single compiled loop.
+
+    Parameters
+    ----------
+    data_flux : np.ndarray
+        Fluxes of the measurements.
+    data_error : np.ndarray
+        Uncertainties of the measurements.
+    model_flux : np.ndarray
+        Synthetic fluxes of the filters.
+    error_scaling : np.ndarray
+        Inflation of the uncertainties of the filters, relative
+        to the uncertainties of the data. Set to zero for
+        filters without error inflation.
+    weight : np.ndarray
+        Weights of the filters.
+    filter_index : np.ndarray
+        Index of the filter for each of the measurements.
+
+    Returns
+    -------
+    float
+        Log-likelihood.
+    """
+
+    ln_like = 0.0
+
+    for i in range(data_flux.size):
+        j = filter_index[i]
+
+        data_var = data_error[i] ** 2
+        data_var += error_scaling[j] ** 2 * data_error[i] ** 2
+
+        ln_like += -0.5 * weight[j] * (data_flux[i] - model_flux[j]) ** 2 / data_var
+        ln_like += -0.5 * np.log(2.0 * np.pi * data_var)
+
+    return ln_like
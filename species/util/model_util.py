@@ -5,17 +5,43 @@ Utility functions for model spectra.
 import json
 import warnings
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Tuple, Union
+from typing import Dict, List, Tuple, Union
 
 import numpy as np
 
+from numba import njit
 from typeguard import typechecked
 
 from species.core.box import ModelBox, create_box
 from species.util.spec_util import create_wavelengths
 
 
+@lru_cache(maxsize=None)
+@typechecked
+def _model_names() -> Dict[str, str]:
+    """
+    Function for reading the plot names of the models from
+    ``model_data.json``. The dictionary is only read once.
+
+    Returns
+    -------
+    dict
+        Dictionary with the model names used by species as keys
+        and the names for plots as values.
+    """
+
+    data_file = (
+        Path(__file__).parent.resolve().parents[0] / "data/model_data/model_data.json"
+    )
+
+    with open(data_file, "r", encoding="utf-8") as json_file:
+        model_data = json.load(json_file)
+
+    return {key: value["name"] for key, value in model_data.items()}
+
+
 @typechecked
 def convert_model_name(in_name: str) -> str:
     """
@@ -32,17 +58,9 @@ def convert_model_name(in_name: str) -> str:
         Updated model name for plots.
     """
 
-    data_file = (
-        Path(__file__).parent.resolve().parents[0] / "data/model_data/model_data.json"
-    )
-
-    with open(data_file, "r", encoding="utf-8") as json_file:
-        model_data = json.load(json_file)
+    out_name = _model_names().get(in_name)
 
-    if in_name in model_data.keys():
-        out_name = model_data[in_name]["name"]
-
-    else:
+    if out_name is None:
         out_name = in_name
 
         warnings.warn(
@@ -289,3 +307,125 @@ def binary_to_single(param_dict: Dict[str, float], star_index: int) -> Dict[str,
             new_dict[key] = value
 
     return new_dict
+
+
+@njit(cache=True)
+def _interp_linear_nd(
+    points_flat: np.ndarray,
+    points_edges: np.ndarray,
+    flux_flat: np.ndarray,
+    param: np.ndarray,
+) -> np.ndarray:
+    """
+    Compiled kernel of :func:`~species.util.model_util.interp_grid_linear`.
+    The :math:`2^N` vertices of the grid cell are iterated with the
+    bits of the vertex number, which select for each dimension
+    either the lower or upper grid point.
+    """
+
+    n_point, n_dim = param.shape
+    n_flux = flux_flat.shape[1]
+
+    index = np.empty(n_dim, dtype=np.int64)
+    frac = np.empty(n_dim)
+    strides = np.ones(n_dim, dtype=np.int64)
+
+    for j in range(n_dim - 2, -1, -1):
+        strides[j] = strides[j + 1] * (points_edges[j + 2] - points_edges[j + 1])
+
+    flux_out = np.zeros((n_point, n_flux))
+
+    for i in range(n_point):
+        in_grid = True
+
+        for j in range(n_dim):
+            points_item = points_flat[points_edges[j] : points_edges[j + 1]]
+
+            if not points_item[0] <= param[i, j] <= points_item[-1]:
+                in_grid = False
+                break
+
+            index[j] = min(
+                max(np.searchsorted(points_item, param[i, j]) - 1, 0),
+                points_item.size - 2,
+            )
+
+            frac[j] = (param[i, j] - points_item[index[j]]) / (
+                points_item[index[j] + 1] - points_item[index[j]]
+            )
+
+        if not in_grid:
+            flux_out[i, :] = np.nan
+            continue
+
+        for vertex in range(1 << n_dim):
+            weight = 1.0
+            flat_index = 0
+
+            for j in range(n_dim):
+                if (vertex >> j) & 1:
+                    weight *= frac[j]
+                    flat_index += (index[j] + 1) * strides[j]
+                else:
+                    weight *= 1.0 - frac[j]
+                    flat_index += index[j] * strides[j]
+
+            for k in range(n_flux):
+                flux_out[i, k] += weight * flux_flat[flat_index, k]
+
+    return flux_out
+
+
+@typechecked
+def interp_grid_linear(
+    grid_points: List[np.ndarray],
+    grid_flux: np.ndarray,
+    param: Union[List[Union[float, np.float32]], np.ndarray],
+) -> np.ndarray:
+    """
+    Function for linearly interpolating a regular grid of model
+    spectra or fluxes. The output is the same as the ``linear``
+    method of ``scipy.interpolate.RegularGridInterpolator`` with
+    ``bounds_error=False`` and ``fill_value=np.nan``, but the
+    interpolation is compiled with ``numba``. The function can be
+    used with ``functools.partial`` as replacement of a
+    ``RegularGridInterpolator`` instance.
+
+    Parameters
+    ----------
+    grid_points : list(np.ndarray)
+        List with the sorted grid points of each parameter.
+    grid_flux : np.ndarray
+        Array with the grid of fluxes. The first dimensions
+        correspond with ``grid_points`` and the last dimension
+        with the wavelengths. The array should be C-contiguous
+        to avoid a copy at each call.
+    param : list(float), np.ndarray
+        Parameter values, either a single point with a value for
+        each parameter or a 2D array with the shape (n_points,
+        n_parameters).
+
+    Returns
+    -------
+    np.ndarray
+        Interpolated fluxes, with the shape (n_points,
+        n_wavelengths). The fluxes are set to NaN for points
+        outside the grid.
+    """
+
+    param = np.atleast_2d(np.asarray(param, dtype=np.float64))
+
+    n_dim = len(grid_points)
+    grid_shape = grid_flux.shape[:n_dim]
+
+    points_edges = np.zeros(n_dim + 1, dtype=np.int64)
+    points_edges[1:] = np.cumsum(grid_shape)
+
+    flux_out = _interp_linear_nd(
+        np.concatenate(grid_points).astype(np.float64),
+        points_edges,
+        grid_flux.reshape(np.prod(grid_shape), -1),
+        param,
+    )
+
+    return flux_out.reshape((param.shape[0],) + grid_flux.shape[n_dim:])
@@ -2,18 +2,58 @@
 Module with utility functions for plotting data.
 """
 
+import re
 import warnings
 
+from functools import lru_cache
 from string import ascii_lowercase
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+from numba import njit
 from typeguard import typechecked
 
 from species.core import constants
 from species.util.model_util import convert_model_name
 
+# Indices of the spectral classes in the discrete colorbar
+# without subclasses, as function of the character code
+
+_SPT_CLASS_INDEX = np.full(256, np.nan)
+_SPT_CLASS_INDEX[[ord(x) for x in "OBAFGKMLTY"]] = np.arange(10) + 0.5
+
+
+@njit(cache=True)
+def _sptype_subclass(
+    spt_code: np.ndarray, spt_y: np.ndarray, class_index: np.ndarray
+) -> np.ndarray:
+    """
+    Compiled kernel of :func:`~species.util.plot_util.sptype_to_index`
+    that maps the code points of the first two characters of the
+    spectral types to the early and late subclasses.
+    """
+
+    spt_discrete = np.full(spt_code.shape[0], np.nan)
+
+    for i in range(spt_code.shape[0]):
+        if spt_y[i]:
+            spt_discrete[i] = 18.5
+
+        # Class followed by a digit, for which the subclasses
+        # of O to T have priority over a Y in the type
+
+        if spt_code[i, 0] < 256 and ord("0") <= spt_code[i, 1] <= ord("9"):
+            spt_class = class_index[spt_code[i, 0]]
+
+            if spt_class < 9.0:
+                if spt_code[i, 1] < ord("5"):
+                    spt_discrete[i] = 2.0 * spt_class - 0.5
+                else:
+                    spt_discrete[i] = 2.0 * spt_class + 0.5
+
+    return spt_discrete
+
 
 @typechecked
 def sptype_to_index(
@@ -47,7 +87,7 @@ def sptype_to_index(
         will be set to NaN.
     """
 
-    spt_discrete = np.zeros(spec_types.size)
+    spec_types = spec_types.astype(str)
 
     if check_subclass:
         spt_check = [
@@ -63,66 +103,13 @@ def sptype_to_index(
             ("early Y", "late Y"),
         ]
 
-        for i, item in enumerate(spec_types):
-            if item[0:2] in ["O0", "O1", "O2", "O3", "O4"]:
-                spt_discrete[i] = 0.5
-
-            elif item[0:2] in ["O5", "O6", "O7", "O8", "O9"]:
-                spt_discrete[i] = 1.5
-
-            elif item[0:2] in ["B0", "B1", "B2", "B3", "B4"]:
-                spt_discrete[i] = 2.5
-
-            elif item[0:2] in ["B5", "B6", "B7", "B8", "B9"]:
-                spt_discrete[i] = 3.5
-
-            elif item[0:2] in ["A0", "A1", "A2", "A3", "A4"]:
-                spt_discrete[i] = 4.5
-
-            elif item[0:2] in ["A5", "A6", "A7", "A8", "A9"]:
-                spt_discrete[i] = 5.5
-
-            elif item[0:2] in ["F0", "F1", "F2", "F3", "F4"]:
-                spt_discrete[i] = 6.5
-
-            elif item[0:2] in ["F5", "F6", "F7", "F8", "F9"]:
-                spt_discrete[i] = 7.5
-
-            elif item[0:2] in ["G0", "G1", "G2", "G3", "G4"]:
-                spt_discrete[i] = 8.5
-
-            elif item[0:2] in ["G5", "G6", "G7", "G8", "G9"]:
-                spt_discrete[i] = 9.5
-
-            elif item[0:2] in ["K0", "K1", "K2", "K3", "K4"]:
-                spt_discrete[i] = 10.5
-
-            elif item[0:2] in ["K5", "K6", "K7", "K8", "K9"]:
-                spt_discrete[i] = 11.5
-
-            elif item[0:2] in ["M0", "M1", "M2", "M3", "M4"]:
-                spt_discrete[i] = 12.5
-
-            elif item[0:2] in ["M5", "M6", "M7", "M8", "M9"]:
-                spt_discrete[i] = 13.5
+        # Code points of the first two characters, which
+        # are 0 for spectral types that are shorter
 
-            elif item[0:2] in ["L0", "L1", "L2", "L3", "L4"]:
-                spt_discrete[i] = 14.5
+        spt_code = spec_types.astype("U2").view(np.uint32).reshape(-1, 2)
+        spt_y = np.char.find(spec_types, "Y") >= 0
 
-            elif item[0:2] in ["L5", "L6", "L7", "L8", "L9"]:
-                spt_discrete[i] = 15.5
-
-            elif item[0:2] in ["T0", "T1", "T2", "T3", "T4"]:
-                spt_discrete[i] = 16.5
-
-            elif item[0:2] in ["T5", "T6", "T7", "T8", "T9"]:
-                spt_discrete[i] = 17.5
-
-            elif "Y" in item:
-                spt_discrete[i] = 18.5
-
-            else:
-                spt_discrete[i] = np.nan
+        spt_discrete = _sptype_subclass(spt_code, spt_y, _SPT_CLASS_INDEX)
 
         count = 0
         for i, item in enumerate(spt_check):
@@ -135,39 +122,11 @@ def sptype_to_index(
     else:
         spt_check = ["O", "B", "A", "F", "G", "K", "M", "L", "T", "Y"]
 
-        for i, item in enumerate(spec_types):
-            if item[0] == "O":
-                spt_discrete[i] = 0.5
-
-            elif item[0] == "B":
-                spt_discrete[i] = 1.5
-
-            elif item[0] == "A":
-                spt_discrete[i] = 2.5
-
-            elif item[0] == "F":
-                spt_discrete[i] = 3.5
+        # Gather the indices from a lookup table by the code point
+        # of the first character, which is 0 for empty strings
 
-            elif item[0] == "G":
-                spt_discrete[i] = 4.5
-
-            elif item[0] == "K":
-                spt_discrete[i] = 5.5
-
-            elif item[0] == "M":
-                spt_discrete[i] = 6.5
-
-            elif item[0] == "L":
-                spt_discrete[i] = 7.5
-
-            elif item[0] == "T":
-                spt_discrete[i] = 8.5
-
-            elif item[0] == "Y":
-                spt_discrete[i] = 9.5
-
-            else:
-                spt_discrete[i] = np.nan
+        spt_code = spec_types.astype("U1").view(np.uint32)
+        spt_discrete = _SPT_CLASS_INDEX[np.minimum(spt_code, 255)]
 
         for i, item in enumerate(spt_check):
             if field_range[0] == item:
@@ -180,6 +139,315 @@ def sptype_to_index(
     return spt_discrete
 
 
+# Labels of the model parameters that do not depend on the
+# object type, such that update_labels can replace the names
+# with a single dictionary lookup per parameter
+
+_CLOUD_SPECIES = ["Fe", "MgSiO3", "Al2O3", "Na2S", "KCl"]
+
+_CLOUD_LABELS = ["Fe", r"MgSiO_{3}", r"Al_{2}O_{3}", r"Na_{2}S", "KCl"]
+
+_ABUND_LABELS = {
+    "CO_all_iso": "CO",
+    "CO_all_iso_HITEMP": "CO",
+    "H2O": "H_{2}O",
+    "H2O_HITEMP": "H_{2}O",
+    "H2O_main_iso": "H_{2}O",
+    "CH4": "CH_{4}",
+    "CH4_main_iso": "CH_{4}",
+    "NH3": "NH_{3}",
+    "NH3_main_iso": "NH_{3}",
+    "CO2": "CO_{2}",
+    "CO2_main_iso": "CO_{2}",
+    "H2S": "H_{2}S",
+    "H2S_main_iso": "H_{2}S",
+    "Na": "Na",
+    "Na_allard": "Na",
+    "Na_burrows": "Na",
+    "Na_lor_cur": "Na",
+    "K": "K",
+    "K_allard": "K",
+    "K_burrows": "K",
+    "K_lor_cur": "K",
+    "PH3": "PH_{3}",
+    "PH3_main_iso": "PH_{3}",
+    "VO": "VO",
+    "VO_Plez": "VO",
+    "TiO": "TiO",
+    "TiO_all_Exomol": "TiO",
+    "TiO_all_iso_Plez": "TiO",
+    "FeH": "FeH",
+    "FeH_main_iso": "FeH",
+    "MgSiO3(c)": "MgSiO_{3}",
+    "Fe(c)": "Fe",
+    "Al2O3(c)": "Al_{2}O_{3}",
+    "Na2S(c)": "Na_{2}S",
+    "KCL(c)": "KCl",
+}
+
+_STATIC_LABELS = {
+    "teff": r"$T_\mathrm{eff}$ (K)",
+    "teff_0": r"$T_\mathrm{eff,1}$ (K)",
+    "teff_1": r"$T_\mathrm{eff,2}$ (K)",
+    "logg": r"$\log\,g$",
+    "logg_0": r"$\log\,g_\mathrm{1}$",
+    "logg_1": r"$\log\,g_\mathrm{2}$",
+    "metallicity": "[Fe/H]",
+    "feh": "[Fe/H]",
+    "feh_0": r"[Fe/H]$_\mathrm{1}$",
+    "feh_1": r"[Fe/H]$_\mathrm{2}$",
+    "fsed": r"$f_\mathrm{sed}$",
+    "fsed_1": r"$f_\mathrm{sed,1}$",
+    "fsed_2": r"$f_\mathrm{sed,2}$",
+    "f_clouds": r"$w_\mathrm{clouds}$",
+    "c_o_ratio": r"C/O",
+    "distance": "$d$ (pc)",
+    "parallax": r"$\varpi$ (mas)",
+    "parallax_0": r"$\varpi_\mathrm{1}$ (mas)",
+    "parallax_1": r"$\varpi_\mathrm{2}$ (mas)",
+    "vsini": r"$v\,\sin\,i$ (km s$^{-1}$)",
+    "age": "Age (Myr)",
+    "entropy": r"$S_\mathrm{i}$ ($k_\mathrm{B}/\mathrm{baryon}$)",
+    "entropy_1": r"$S_\mathrm{i,b}$ ($k_\mathrm{B}/\mathrm{baryon}$)",
+    "entropy_2": r"$S_\mathrm{i,c}$ ($k_\mathrm{B}/\mathrm{baryon}$)",
+    "dfrac_1": r"$\log\,D_\mathrm{i,b}$",
+    "dfrac_2": r"$\log\,D_\mathrm{i,c}$",
+    "y_frac": r"$Y$",
+    "yfrac_1": r"$Y_\mathrm{b}$",
+    "yfrac_2": r"$Y_\mathrm{c}$",
+    "mcore_1": r"$M_\mathrm{core,b}$ ($M_\mathrm{E}$)",
+    "mcore_2": r"$M_\mathrm{core,c}$ ($M_\mathrm{E}$)",
+    **{
+        key: value
+        for i, item in enumerate(ascii_lowercase[1:])
+        for key, value in (
+            (f"teff_evol_{i}", rf"$T_\mathrm{{eff, {item}}}$ (K)"),
+            (f"radius_evol_{i}", rf"$R_\mathrm{{{item}}}$ ($R_\mathrm{{J}}$)"),
+            (f"logg_evol_{i}", rf"$\log\,g_\mathrm{{{item}}}$"),
+            (f"inflate_lbol{i}", rf"$\sigma_{{L,{{{item}}}}}$ (dex)"),
+            (f"inflate_mass{i}", rf"$\sigma_{{M,{{{item}}}}}$ ($M_\mathrm{{J}}$)"),
+        )
+    },
+    "luminosity_ratio": r"$\log\,L_\mathrm{1}/L_\mathrm{2}$",
+    "lognorm_radius": r"$\log\,r_\mathrm{g}$",
+    "lognorm_sigma": r"$\sigma_\mathrm{g}$",
+    "lognorm_ext": r"$A_V$",
+    "powerlaw_min": r"$\log\,a_\mathrm{min}/\mathrm{µm}$",
+    "powerlaw_max": r"$\log\,a_\mathrm{max}/\mathrm{µm}$",
+    "powerlaw_exp": r"$\beta$",
+    "powerlaw_ext": r"$A_V$",
+    "ism_ext": r"$A_V$",
+    "ism_ext_0": r"$A_{V,\mathrm{1}}$",
+    "ism_ext_1": r"$A_{V,\mathrm{2}}$",
+    "ism_red": r"$R_V$",
+    "tint": r"$T_\mathrm{int}$ (K)",
+    **{f"t{i}": rf"$T_\mathrm{{{i}}}$ (K)" for i in range(15)},
+    "alpha": r"$\alpha$",
+    "log_sigma_alpha": r"$\log\,\sigma_\alpha$",
+    "log_delta": r"$\log\,\delta$",
+    "T_bottom": r"$T_\mathrm{bot}$ (K)",
+    **{f"PTslope_{6 - i}": rf"dlnT/dlnP$_{i}$ " for i in range(6)},
+    "log_p_quench": r"$\log\,P_\mathrm{quench}$",
+    "sigma_lnorm": r"$\sigma_\mathrm{g}$",
+    "log_kzz": r"$\log\,K_\mathrm{zz}$",
+    # Backward compatibility
+    "kzz": r"$\log\,K_\mathrm{zz}$",
+    **{
+        key: value
+        for item, label in zip(_CLOUD_SPECIES, _CLOUD_LABELS)
+        for key, value in (
+            (
+                f"{item.lower()}_fraction",
+                rf"$\log\,\tilde{{\mathrm{{X}}}}_\mathrm{{{label}}}$",
+            ),
+            (f"{item.lower()}_tau", rf"$\bar{{\tau}}_\mathrm{{{label}}}$"),
+            (f"log_p_base_{item}(c)", rf"$\log\,P_\mathrm{{{label}}}$"),
+            (f"fsed_{item}(c)", rf"fsed$_\mathrm{{{label}}}$"),
+        )
+    },
+    **{
+        f"{item_i.lower()}_{item_j.lower()}_ratio": (
+            rf"$\log\,\tilde{{\mathrm{{X}}}}"
+            rf"_\mathrm{{{label_i}}}/"
+            rf"\mathrm{{\tilde{{X}}}}_\mathrm{{{label_j}}}$"
+        )
+        for item_i, label_i in zip(_CLOUD_SPECIES, _CLOUD_LABELS)
+        for item_j, label_j in zip(_CLOUD_SPECIES, _CLOUD_LABELS)
+    },
+    **{key: rf"$\log\,\mathrm{{{value}}}$" for key, value in _ABUND_LABELS.items()},
+    "c_h_ratio": r"[C/H]",
+    "o_h_ratio": r"[O/H]",
+    # The labels of teff_0 and teff_1 of a binary system are set above
+    **{f"teff_{i}": rf"$T_\mathrm{{{i+1}}}$ (K)" for i in range(2, 100)},
+    **{
+        f"luminosity_{i}": rf"$\log\,L_\mathregular{{{i+1}}}/L_\mathregular{{\odot}}$"
+        for i in range(100)
+    },
+    "disk_teff": r"$T_\mathrm{disk}$ (K)",
+    **{
+        f"disk_teff_{i}": r"$T_\mathrm{disk,}$" + rf"$_\mathrm{{{i+1}}}$ (K)"
+        for i in range(100)
+    },
+    "log_powerlaw_a": r"$a_\mathrm{powerlaw}$",
+    "log_powerlaw_b": r"$b_\mathrm{powerlaw}$",
+    "log_powerlaw_c": r"$c_\mathrm{powerlaw}$",
+    "pt_smooth": r"$\sigma_\mathrm{P-T}$",
+    "abund_smooth": r"$\sigma_\mathrm{abund}$",
+    "log_prob": r"$\log\,\mathcal{L}$",
+    "log_tau_cloud": r"$\log\,\tau_\mathrm{cloud}$",
+    "veil_a": r"$a_\mathrm{veil}$",
+    "veil_b": r"$b_\mathrm{veil}$",
+    "veil_ref": r"$F_\mathrm{ref, veil}$",
+    "gauss_amplitude": r"$a$ (W m$^{-2}$ µm$^{-1}$)",
+    "gauss_mean": r"$\lambda$ (nm)",
+    "gauss_sigma": r"$\sigma$ (nm)",
+    "gauss_amplitude_2": r"$a_2$ (W m$^{-2}$ µm$^{-1}$)",
+    "gauss_mean_2": r"$\lambda_2$ (nm)",
+    "gauss_sigma_2": r"$\sigma_2$ (nm)",
+    "gauss_fwhm": r"FWHM (km s$^{-1}$)",
+    "line_flux": r"$F_\mathrm{line}$ (W m$^{-2}$)",
+    "line_luminosity": r"$L_\mathrm{line}$ ($L_\mathrm{\odot}$)",
+    "log_line_lum": r"$\log\,L_\mathrm{line}/L_\mathrm{\odot}$",
+    "log_acc_lum": r"$\log\,L_\mathrm{acc}/L_\mathrm{\odot}$",
+    "line_eq_width": r"EW ($\AA$)",
+    "line_vrad": r"RV (km s$^{-1}$)",
+    "log_kappa_0": r"$\log\,\kappa_0$",
+    "log_kappa_abs": r"$\log\,\kappa_\mathrm{abs}$",
+    "log_kappa_sca": r"$\log\,\kappa_\mathrm{sca}$",
+    "opa_index": r"$\xi$",
+    "opa_abs_index": r"$\xi_\mathrm{abs}$",
+    "opa_sca_index": r"$\xi_\mathrm{sca}$",
+    "log_p_base": r"$\log\,P_\mathrm{cloud}$",
+    "albedo": r"$\omega$",
+    "opa_knee": r"$\lambda_\mathrm{R}$ (µm)",
+    "lambda_ray": r"$\lambda_\mathrm{R}$ (µm)",
+    "mix_length": r"$\ell_\mathrm{m}$ ($H_\mathrm{p}$)",
+    "spec_weight": r"w$_\mathrm{spec}$",
+    "log_beta_r": r"$\log\,\beta_\mathrm{r}$",
+    "log_gamma_r": r"$\log\,\gamma_\mathrm{r}$",
+    "gamma_r": r"$\gamma_\mathrm{r}$",
+    "log_kappa_gray": r"$\log\,\kappa_\mathrm{gray}$",
+    "log_cloud_top": r"$\log\,P_\mathrm{top}$",
+    "flux_scaling": r"$a_\mathrm{flux}$",
+    "log_flux_scaling": r"$\log\,a_\mathrm{flux}$",
+    "flux_offset": r"$b_\mathrm{flux}$ (W m$^{-2}$ µm$^{-1}$)",
+}
+
+# Labels of the model parameters for which the units
+# depend on the object type ('planet' or 'star')
+
+_OBJTYPE_LABELS = {
+    "radius": {
+        "planet": r"$R$ ($R_\mathrm{J}$)",
+        "star": r"$R_\ast$ ($R_\mathrm{\odot}$)",
+    },
+    "mass": {
+        "planet": r"$M$ ($M_\mathrm{J}$)",
+        "star": r"$M_\ast$ ($M_\mathrm{\odot}$)",
+    },
+    "mass_0": {
+        "planet": r"$M_\mathrm{1}$ ($M_\mathrm{J}$)",
+        "star": r"$M_\mathrm{1}$ ($M_\mathrm{\odot}$)",
+    },
+    "mass_1": {
+        "planet": r"$M_\mathrm{2}$ ($M_\mathrm{J}$)",
+        "star": r"$M_\mathrm{2}$ ($M_\mathrm{\odot}$)",
+    },
+    "log_mass": {
+        "planet": r"$\log\,M/M_\mathrm{J}$",
+        "star": r"$\log\,M_\ast/M_\mathrm{\odot}$",
+    },
+    "log_mass_0": {
+        "planet": r"$\log\,M_\mathrm{1}/M_\mathrm{J}$",
+        "star": r"$\log\,M_\mathrm{1}/M_\mathrm{\odot}$",
+    },
+    "log_mass_1": {
+        "planet": r"$\log\,M_\mathrm{2}/M_\mathrm{J}$",
+        "star": r"$\log\,M_\mathrm{2}/M_\mathrm{\odot}$",
+    },
+    "luminosity": {
+        "planet": r"$\log\,L/L_\mathrm{\odot}$",
+        "star": r"$\log\,L_\ast/L_\mathrm{\odot}$",
+    },
+    "luminosity_disk_planet": {
+        "planet": r"$L_\mathrm{disk}/L_\mathrm{atm}$",
+        "star": r"$L_\mathrm{disk}/L_\ast$",
+    },
+    "disk_radius": {
+        "planet": r"$R_\mathrm{disk}$ ($R_\mathrm{J}$)",
+        "star": r"$R_\mathrm{disk}$ (au)",
+    },
+    "radius_bb": {
+        "planet": r"$R_\mathrm{bb}$ ($R_\mathrm{J}$)",
+        "star": r"$R_\mathrm{bb}$ (au)",
+    },
+    **{
+        f"radius_{i}": {
+            "planet": rf"$R_\mathrm{{{i+1}}}$ ($R_\mathrm{{J}}$)",
+            "star": rf"$R_\mathrm{{{i+1}}}$ ($R_\mathrm{{\odot}}$)",
+        }
+        for i in range(100)
+    },
+    **{
+        f"disk_radius_{i}": {
+            "planet": r"$R_\mathrm{disk,}$" + rf"$_{{{i+1}}}$ ($R_\mathrm{{J}}$)",
+            "star": r"$R_\mathrm{disk,}$" + rf"$_\mathrm{{{i+1}}}$ (au)",
+        }
+        for i in range(100)
+    },
+    **{
+        f"radius_bb_{i}": {
+            "planet": r"$R_\mathrm{bb,}$" + rf"$_{{{i+1}}}$ ($R_\mathrm{{J}}$)",
+            "star": r"$R_\mathrm{bb,}$" + rf"$_\mathrm{{{i+1}}}$ (au)",
+        }
+        for i in range(100)
+    },
+}
+
+
+# Prefixes and suffix of parameters that refer to a specific
+# spectrum or filter, in order of precedence. The '_error'
+# entry is matched at the end instead of the start of a name
+
+_AFFIX_LABELS = (
+    ("scaling_", r"$a_\mathrm{{{}}}$"),
+    ("error_", r"$b_\mathrm{{{}}}$"),
+    ("radvel_", r"RV$_\mathrm{{{}}}$ (km s$^{{-1}}$)"),
+    ("wavelength_", r"$c_\mathrm{{{}}}$ (nm)"),
+    ("_error", r"$f_\mathrm{{{}}}$"),
+    ("corr_len_", r"$\log\,\ell_\mathrm{{{}}}$"),
+    ("corr_amp_", r"$f_\mathrm{{{}}}$"),
+    ("ratio_", r"$r_\mathrm{{{}}}$"),
+)
+
+_AFFIX_PREFIXES = tuple(item for item, _ in _AFFIX_LABELS if item != "_error")
+
+
+@lru_cache(maxsize=1024)
+@typechecked
+def _escape_underscore(item_name: str) -> str:
+    """
+    Function for escaping the underscores in the name of a spectrum
+    or filter for use in a LaTeX label. Names that are already
+    escaped or that start with an underscore are not changed.
+
+    Parameters
+    ----------
+    item_name : str
+        Name of the spectrum or filter.
+
+    Returns
+    -------
+    str
+        Name with escaped underscores.
+    """
+
+    if item_name.find("\\_") == -1 and item_name.find("_") > 0:
+        item_name = item_name.replace("_", "\\_")
+
+    return item_name
+
+
 @typechecked
 def update_labels(param: List[str], object_type: str = "planet") -> List[str]:
     """
@@ -201,768 +469,121 @@ def update_labels(param: List[str], object_type: str = "planet") -> List[str]:
         List with parameter labels for plots.
     """
 
-    cloud_species = ["Fe", "MgSiO3", "Al2O3", "Na2S", "KCl"]
-
-    cloud_labels = ["Fe", r"MgSiO_{3}", r"Al_{2}O_{3}", r"Na_{2}S", "KCl"]
-
-    abund_species = [
-        "CO_all_iso",
-        "CO_all_iso_HITEMP",
-        "H2O",
-        "H2O_HITEMP",
-        "H2O_main_iso",
-        "CH4",
-        "CH4_main_iso",
-        "NH3",
-        "NH3_main_iso",
-        "CO2",
-        "CO2_main_iso",
-        "H2S",
-        "H2S_main_iso",
-        "Na",
-        "Na_allard",
-        "Na_burrows",
-        "Na_lor_cur",
-        "K",
-        "K_allard",
-        "K_burrows",
-        "K_lor_cur",
-        "PH3",
-        "PH3_main_iso",
-        "VO",
-        "VO_Plez",
-        "TiO",
-        "TiO_all_Exomol",
-        "TiO_all_iso_Plez",
-        "FeH",
-        "FeH_main_iso",
-        "MgSiO3(c)",
-        "Fe(c)",
-        "Al2O3(c)",
-        "Na2S(c)",
-        "KCL(c)",
-    ]
-
-    abund_labels = [
-        "CO",
-        "CO",
-        "H_{2}O",
-        "H_{2}O",
-        "H_{2}O",
-        "CH_{4}",
-        "CH_{4}",
-        "NH_{3}",
-        "NH_{3}",
-        "CO_{2}",
-        "CO_{2}",
-        "H_{2}S",
-        "H_{2}S",
-        "Na",
-        "Na",
-        "Na",
-        "Na",
-        "K",
-        "K",
-        "K",
-        "K",
-        "PH_{3}",
-        "PH_{3}",
-        "VO",
-        "VO",
-        "TiO",
-        "TiO",
-        "TiO",
-        "FeH",
-        "FeH",
-        "MgSiO_{3}",
-        "Fe",
-        "Al_{2}O_{3}",
-        "Na_{2}S",
-        "KCl",
-    ]
+    # The labels are cached by the tuple of parameter names and
+    # the list is updated in place, as before the caching
 
-    if "teff" in param:
-        index = param.index("teff")
-        param[index] = r"$T_\mathrm{eff}$ (K)"
-
-    if "teff_0" in param:
-        index = param.index("teff_0")
-        param[index] = r"$T_\mathrm{eff,1}$ (K)"
-
-    if "teff_1" in param:
-        index = param.index("teff_1")
-        param[index] = r"$T_\mathrm{eff,2}$ (K)"
-
-    if "logg" in param:
-        index = param.index("logg")
-        param[index] = r"$\log\,g$"
-
-    if "logg_0" in param:
-        index = param.index("logg_0")
-        param[index] = r"$\log\,g_\mathrm{1}$"
-
-    if "logg_1" in param:
-        index = param.index("logg_1")
-        param[index] = r"$\log\,g_\mathrm{2}$"
-
-    if "metallicity" in param:
-        index = param.index("metallicity")
-        param[index] = "[Fe/H]"
-
-    if "feh" in param:
-        index = param.index("feh")
-        param[index] = "[Fe/H]"
-
-    if "feh_0" in param:
-        index = param.index("feh_0")
-        param[index] = r"[Fe/H]$_\mathrm{1}$"
-
-    if "feh_1" in param:
-        index = param.index("feh_1")
-        param[index] = r"[Fe/H]$_\mathrm{2}$"
-
-    if "fsed" in param:
-        index = param.index("fsed")
-        param[index] = r"$f_\mathrm{sed}$"
-
-    if "fsed_1" in param:
-        index = param.index("fsed_1")
-        param[index] = r"$f_\mathrm{sed,1}$"
-
-    if "fsed_2" in param:
-        index = param.index("fsed_2")
-        param[index] = r"$f_\mathrm{sed,2}$"
-
-    if "f_clouds" in param:
-        index = param.index("f_clouds")
-        param[index] = r"$w_\mathrm{clouds}$"
-
-    if "c_o_ratio" in param:
-        index = param.index("c_o_ratio")
-        param[index] = r"C/O"
-
-    if "radius" in param:
-        index = param.index("radius")
-        if object_type == "planet":
-            param[index] = r"$R$ ($R_\mathrm{J}$)"
-        elif object_type == "star":
-            param[index] = r"$R_\ast$ ($R_\mathrm{\odot}$)"
-
-    if "distance" in param:
-        index = param.index("distance")
-        param[index] = "$d$ (pc)"
-
-    if "parallax" in param:
-        index = param.index("parallax")
-        param[index] = r"$\varpi$ (mas)"
-
-    if "parallax_0" in param:
-        index = param.index("parallax_0")
-        param[index] = r"$\varpi_\mathrm{1}$ (mas)"
-
-    if "parallax_1" in param:
-        index = param.index("parallax_1")
-        param[index] = r"$\varpi_\mathrm{2}$ (mas)"
-
-    if "vsini" in param:
-        index = param.index("vsini")
-        param[index] = r"$v\,\sin\,i$ (km s$^{-1}$)"
-
-    if "mass" in param:
-        index = param.index("mass")
-        if object_type == "planet":
-            param[index] = r"$M$ ($M_\mathrm{J}$)"
-        elif object_type == "star":
-            param[index] = r"$M_\ast$ ($M_\mathrm{\odot}$)"
-
-    if "mass_0" in param:
-        index = param.index("mass_0")
-        if object_type == "planet":
-            param[index] = r"$M_\mathrm{1}$ ($M_\mathrm{J}$)"
-        elif object_type == "star":
-            param[index] = r"$M_\mathrm{1}$ ($M_\mathrm{\odot}$)"
-
-    if "mass_1" in param:
-        index = param.index("mass_1")
-        if object_type == "planet":
-            param[index] = r"$M_\mathrm{2}$ ($M_\mathrm{J}$)"
-        elif object_type == "star":
-            param[index] = r"$M_\mathrm{2}$ ($M_\mathrm{\odot}$)"
-
-    # for i, item in enumerate(ascii_lowercase[1:]):
-    #     if f"mass_{i}" in param:
-    #         index = param.index(f"mass_{i}")
-    #         param[index] = rf"$M_\mathrm{{{item}}}$ ($M_\mathrm{{J}}$)"
-    #     else:
-    #         break
-
-    if "log_mass" in param:
-        index = param.index("log_mass")
-        if object_type == "planet":
-            param[index] = r"$\log\,M/M_\mathrm{J}$"
-        elif object_type == "star":
-            param[index] = r"$\log\,M_\ast/M_\mathrm{\odot}$"
-
-    if "log_mass_0" in param:
-        index = param.index("log_mass_0")
-        if object_type == "planet":
-            param[index] = r"$\log\,M_\mathrm{1}/M_\mathrm{J}$"
-        elif object_type == "star":
-            param[index] = r"$\log\,M_\mathrm{1}/M_\mathrm{\odot}$"
-
-    if "log_mass_1" in param:
-        index = param.index("log_mass_1")
-        if object_type == "planet":
-            param[index] = r"$\log\,M_\mathrm{2}/M_\mathrm{J}$"
-        elif object_type == "star":
-            param[index] = r"$\log\,M_\mathrm{2}/M_\mathrm{\odot}$"
-
-    if "age" in param:
-        index = param.index("age")
-        param[index] = "Age (Myr)"
-
-    # if "mass_1" in param:
-    #     index = param.index("mass_1")
-    #     param[index] = r"$M_\mathrm{b}$ ($M_\mathrm{J}$)"
-    #
-    # if "mass_2" in param:
-    #     index = param.index("mass_2")
-    #     param[index] = r"$M_\mathrm{c}$ ($M_\mathrm{J}$)"
-
-    if "entropy" in param:
-        index = param.index("entropy")
-        param[index] = r"$S_\mathrm{i}$ ($k_\mathrm{B}/\mathrm{baryon}$)"
-
-    if "entropy_1" in param:
-        index = param.index("entropy_1")
-        param[index] = r"$S_\mathrm{i,b}$ ($k_\mathrm{B}/\mathrm{baryon}$)"
-
-    if "entropy_2" in param:
-        index = param.index("entropy_2")
-        param[index] = r"$S_\mathrm{i,c}$ ($k_\mathrm{B}/\mathrm{baryon}$)"
-
-    if "dfrac_1" in param:
-        index = param.index("dfrac_1")
-        param[index] = r"$\log\,D_\mathrm{i,b}$"
-
-    if "dfrac_2" in param:
-        index = param.index("dfrac_2")
-        param[index] = r"$\log\,D_\mathrm{i,c}$"
-
-    if "y_frac" in param:
-        index = param.index("y_frac")
-        param[index] = r"$Y$"
-
-    if "yfrac_1" in param:
-        index = param.index("yfrac_1")
-        param[index] = r"$Y_\mathrm{b}$"
-
-    if "yfrac_2" in param:
-        index = param.index("yfrac_2")
-        param[index] = r"$Y_\mathrm{c}$"
-
-    if "mcore_1" in param:
-        index = param.index("mcore_1")
-        param[index] = r"$M_\mathrm{core,b}$ ($M_\mathrm{E}$)"
-
-    if "mcore_2" in param:
-        index = param.index("mcore_2")
-        param[index] = r"$M_\mathrm{core,c}$ ($M_\mathrm{E}$)"
-
-    for i, item in enumerate(ascii_lowercase[1:]):
-        if f"teff_evol_{i}" in param:
-            index = param.index(f"teff_evol_{i}")
-            param[index] = rf"$T_\mathrm{{eff, {item}}}$ (K)"
-        else:
-            break
+    param[:] = _update_labels(tuple(param), object_type)
 
-    for i, item in enumerate(ascii_lowercase[1:]):
-        if f"radius_evol_{i}" in param:
-            index = param.index(f"radius_evol_{i}")
-            param[index] = rf"$R_\mathrm{{{item}}}$ ($R_\mathrm{{J}}$)"
-        else:
-            break
+    return param
 
-    for i, item in enumerate(ascii_lowercase[1:]):
-        if f"logg_evol_{i}" in param:
-            index = param.index(f"logg_evol_{i}")
-            param[index] = rf"$\log\,g_\mathrm{{{item}}}$"
-        else:
-            break
 
-    for i, item in enumerate(ascii_lowercase[1:]):
-        if f"inflate_lbol{i}" in param:
-            index = param.index(f"inflate_lbol{i}")
-            param[index] = rf"$\sigma_{{L,{{{item}}}}}$ (dex)"
-        else:
-            break
+@lru_cache(maxsize=128)
+@typechecked
+def _update_labels(param_tuple: Tuple[str, ...], object_type: str) -> Tuple[str, ...]:
+    """
+    Cached implementation of
+    :func:`~species.util.plot_util.update_labels`.
+    """
 
-    for i, item in enumerate(ascii_lowercase[1:]):
-        if f"inflate_mass{i}" in param:
-            index = param.index(f"inflate_mass{i}")
-            param[index] = rf"$\sigma_{{M,{{{item}}}}}$ ($M_\mathrm{{J}}$)"
-        else:
-            break
-
-    if "luminosity" in param:
-        index = param.index("luminosity")
-        if object_type == "planet":
-            param[index] = r"$\log\,L/L_\mathrm{\odot}$"
-        elif object_type == "star":
-            param[index] = r"$\log\,L_\ast/L_\mathrm{\odot}$"
-
-    if "luminosity_ratio" in param:
-        index = param.index("luminosity_ratio")
-        param[index] = r"$\log\,L_\mathrm{1}/L_\mathrm{2}$"
-
-    if "luminosity_disk_planet" in param:
-        index = param.index("luminosity_disk_planet")
-        if object_type == "planet":
-            param[index] = r"$L_\mathrm{disk}/L_\mathrm{atm}$"
-        elif object_type == "star":
-            param[index] = r"$L_\mathrm{disk}/L_\ast$"
-
-    if "lognorm_radius" in param:
-        index = param.index("lognorm_radius")
-        param[index] = r"$\log\,r_\mathrm{g}$"
-
-    if "lognorm_sigma" in param:
-        index = param.index("lognorm_sigma")
-        param[index] = r"$\sigma_\mathrm{g}$"
-
-    if "lognorm_ext" in param:
-        index = param.index("lognorm_ext")
-        param[index] = r"$A_V$"
-
-    if "powerlaw_min" in param:
-        index = param.index("powerlaw_min")
-        param[index] = r"$\log\,a_\mathrm{min}/\mathrm{µm}$"
-
-    if "powerlaw_max" in param:
-        index = param.index("powerlaw_max")
-        param[index] = r"$\log\,a_\mathrm{max}/\mathrm{µm}$"
-
-    if "powerlaw_exp" in param:
-        index = param.index("powerlaw_exp")
-        param[index] = r"$\beta$"
-
-    if "powerlaw_ext" in param:
-        index = param.index("powerlaw_ext")
-        param[index] = r"$A_V$"
-
-    if "ism_ext" in param:
-        index = param.index("ism_ext")
-        param[index] = r"$A_V$"
-
-    if "ism_ext_0" in param:
-        index = param.index("ism_ext_0")
-        param[index] = r"$A_{V,\mathrm{1}}$"
-
-    if "ism_ext_1" in param:
-        index = param.index("ism_ext_1")
-        param[index] = r"$A_{V,\mathrm{2}}$"
-
-    if "ism_red" in param:
-        index = param.index("ism_red")
-        param[index] = r"$R_V$"
-
-    for item in param:
-        if item.startswith("phot_ext_"):
-            index = param.index(item)
-            filter_name = item[9:].split("/")[1]
-            param[index] = rf"$A_\mathrm{{{filter_name}}}$"
-            break
-
-    if "tint" in param:
-        index = param.index("tint")
-        param[index] = r"$T_\mathrm{int}$ (K)"
-
-    for i in range(15):
-        if f"t{i}" in param:
-            index = param.index(f"t{i}")
-            param[index] = rf"$T_\mathrm{{{i}}}$ (K)"
-
-    if "alpha" in param:
-        index = param.index("alpha")
-        param[index] = r"$\alpha$"
-
-    if "log_sigma_alpha" in param:
-        index = param.index("log_sigma_alpha")
-        param[index] = r"$\log\,\sigma_\alpha$"
-
-    if "log_delta" in param:
-        index = param.index("log_delta")
-        param[index] = r"$\log\,\delta$"
-
-    if "T_bottom" in param:
-        index = param.index("T_bottom")
-        param[index] = r"$T_\mathrm{bot}$ (K)"
-
-    num_layer = 6  # could make a variable in the future
-    for i in range(num_layer):
-        if f"PTslope_{num_layer - i}" in param:
-            index = param.index(f"PTslope_{num_layer - i}")
-            param[index] = rf"dlnT/dlnP$_{i}$ "
-
-    if "log_p_quench" in param:
-        index = param.index("log_p_quench")
-        param[index] = r"$\log\,P_\mathrm{quench}$"
-
-    if "sigma_lnorm" in param:
-        index = param.index("sigma_lnorm")
-        param[index] = r"$\sigma_\mathrm{g}$"
-
-    if "log_kzz" in param:
-        index = param.index("log_kzz")
-        param[index] = r"$\log\,K_\mathrm{zz}$"
-
-    if "kzz" in param:
-        # Backward compatibility
-        index = param.index("kzz")
-        param[index] = r"$\log\,K_\mathrm{zz}$"
-
-    for i, item in enumerate(cloud_species):
-        if f"{item.lower()}_fraction" in param:
-            index = param.index(f"{item.lower()}_fraction")
-            param[
-                index
-            ] = rf"$\log\,\tilde{{\mathrm{{X}}}}_\mathrm{{{cloud_labels[i]}}}$"
-
-        if f"{item.lower()}_tau" in param:
-            index = param.index(f"{item.lower()}_tau")
-            param[index] = rf"$\bar{{\tau}}_\mathrm{{{cloud_labels[i]}}}$"
-
-        if f"log_p_base_{item}(c)" in param:
-            index = param.index(f"log_p_base_{item}(c)")
-            param[index] = rf"$\log\,P_\mathrm{{{cloud_labels[i]}}}$"
-
-        if f"fsed_{item}(c)" in param:
-            index = param.index(f"fsed_{item}(c)")
-            param[index] = rf"fsed$_\mathrm{{{cloud_labels[i]}}}$"
-
-    for i, item_i in enumerate(cloud_species):
-        for j, item_j in enumerate(cloud_species):
-            if f"{item_i.lower()}_{item_j.lower()}_ratio" in param:
-                index = param.index(f"{item_i.lower()}_{item_j.lower()}_ratio")
-                param[index] = (
-                    rf"$\log\,\tilde{{\mathrm{{X}}}}"
-                    rf"_\mathrm{{{cloud_labels[i]}}}/"
-                    rf"\mathrm{{\tilde{{X}}}}_\mathrm{{{cloud_labels[j]}}}$"
-                )
-
-    for i, item in enumerate(abund_species):
-        if item in param:
-            index = param.index(item)
-            param[index] = rf"$\log\,\mathrm{{{abund_labels[i]}}}$"
+    param = list(param_tuple)
 
     for i, item in enumerate(param):
-        if item[0:8] == "scaling_":
-            item_name = item[8:]
-            if item_name.find("\\_") == -1 and item_name.find("_") > 0:
-                item_name = item_name.replace("_", "\\_")
-            param[i] = rf"$a_\mathrm{{{item_name}}}$"
-
-        elif item[0:6] == "error_":
-            item_name = item[6:]
-            if item_name.find("\\_") == -1 and item_name.find("_") > 0:
-                item_name = item_name.replace("_", "\\_")
-            param[i] = rf"$b_\mathrm{{{item_name}}}$"
-
-        elif item[0:7] == "radvel_":
-            item_name = item[7:]
-            if item_name.find("\\_") == -1 and item_name.find("_") > 0:
-                item_name = item_name.replace("_", "\\_")
-            param[i] = rf"RV$_\mathrm{{{item_name}}}$ (km s$^{{-1}}$)"
-
-        elif item[0:11] == "wavelength_":
-            item_name = item[11:]
-            if item_name.find("\\_") == -1 and item_name.find("_") > 0:
-                item_name = item_name.replace("_", "\\_")
-            param[i] = rf"$c_\mathrm{{{item_name}}}$ (nm)"
-
-        elif item[-6:] == "_error":
-            item_name = item[:-6]
-            if item_name.find("\\_") == -1 and item_name.find("_") > 0:
-                item_name = item_name.replace("_", "\\_")
-            param[i] = rf"$f_\mathrm{{{item_name}}}$"
-
-        elif item[0:9] == "corr_len_":
-            item_name = item[9:]
-            if item_name.find("\\_") == -1 and item_name.find("_") > 0:
-                item_name = item_name.replace("_", "\\_")
-            param[i] = rf"$\log\,\ell_\mathrm{{{item_name}}}$"
-
-        elif item[0:9] == "corr_amp_":
-            item_name = item[9:]
-            if item_name.find("\\_") == -1 and item_name.find("_") > 0:
-                item_name = item_name.replace("_", "\\_")
-            param[i] = rf"$f_\mathrm{{{item_name}}}$"
-
-        elif item[0:6] == "ratio_":
-            item_name = item[6:]
-            if item_name.find("\\_") == -1 and item_name.find("_") > 0:
-                item_name = item_name.replace("_", "\\_")
-                item_name = item_name.split("/")[1]
-            param[i] = rf"$r_\mathrm{{{item_name}}}$"
-
-    if "c_h_ratio" in param:
-        index = param.index("c_h_ratio")
-        param[index] = r"[C/H]"
-
-    if "o_h_ratio" in param:
-        index = param.index("o_h_ratio")
-        param[index] = r"[O/H]"
-
-    for i in range(100):
-        if f"teff_{i}" in param:
-            index = param.index(f"teff_{i}")
-            param[index] = rf"$T_\mathrm{{{i+1}}}$ (K)"
-
-        else:
-            break
-
-    for i in range(100):
-        if f"radius_{i}" in param:
-            index = param.index(f"radius_{i}")
-            if object_type == "planet":
-                param[index] = rf"$R_\mathrm{{{i+1}}}$ ($R_\mathrm{{J}}$)"
-            elif object_type == "star":
-                param[index] = rf"$R_\mathrm{{{i+1}}}$ ($R_\mathrm{{\odot}}$)"
-
-        else:
-            break
-
-    for i in range(100):
-        if f"luminosity_{i}" in param:
-            index = param.index(f"luminosity_{i}")
-            param[index] = rf"$\log\,L_\mathregular{{{i+1}}}/L_\mathregular{{\odot}}$"
-
-        else:
-            break
-
-    if "disk_teff" in param:
-        index = param.index("disk_teff")
-        param[index] = r"$T_\mathrm{disk}$ (K)"
-
-    for i in range(100):
-        if f"disk_teff_{i}" in param:
-            index = param.index(f"disk_teff_{i}")
-            param[index] = r"$T_\mathrm{disk,}$" + rf"$_\mathrm{{{i+1}}}$ (K)"
-
-        else:
-            break
-
-    if "disk_radius" in param:
-        index = param.index("disk_radius")
-        if object_type == "planet":
-            param[index] = r"$R_\mathrm{disk}$ ($R_\mathrm{J}$)"
-        elif object_type == "star":
-            param[index] = r"$R_\mathrm{disk}$ (au)"
-
-    for i in range(100):
-        if f"disk_radius_{i}" in param:
-            index = param.index(f"disk_radius_{i}")
-            if object_type == "planet":
-                param[index] = (
-                    r"$R_\mathrm{disk,}$" + rf"$_{{{i+1}}}$ ($R_\mathrm{{J}}$)"
-                )
-            elif object_type == "star":
-                param[index] = r"$R_\mathrm{disk,}$" + rf"$_\mathrm{{{i+1}}}$ (au)"
-
-        else:
-            break
-
-    if "radius_bb" in param:
-        index = param.index("radius_bb")
-        if object_type == "planet":
-            param[index] = r"$R_\mathrm{bb}$ ($R_\mathrm{J}$)"
-        elif object_type == "star":
-            param[index] = r"$R_\mathrm{bb}$ (au)"
-
-    for i in range(100):
-        if f"radius_bb_{i}" in param:
-            index = param.index(f"radius_bb_{i}")
-            if object_type == "planet":
-                param[index] = r"$R_\mathrm{bb,}$" + rf"$_{{{i+1}}}$ ($R_\mathrm{{J}}$)"
-            elif object_type == "star":
-                param[index] = r"$R_\mathrm{bb,}$" + rf"$_\mathrm{{{i+1}}}$ (au)"
-
-        else:
-            break
-
-    if "log_powerlaw_a" in param:
-        index = param.index("log_powerlaw_a")
-        param[index] = r"$a_\mathrm{powerlaw}$"
-
-    if "log_powerlaw_b" in param:
-        index = param.index("log_powerlaw_b")
-        param[index] = r"$b_\mathrm{powerlaw}$"
-
-    if "log_powerlaw_c" in param:
-        index = param.index("log_powerlaw_c")
-        param[index] = r"$c_\mathrm{powerlaw}$"
-
-    if "pt_smooth" in param:
-        index = param.index("pt_smooth")
-        param[index] = r"$\sigma_\mathrm{P-T}$"
-
-    if "abund_smooth" in param:
-        index = param.index("abund_smooth")
-        param[index] = r"$\sigma_\mathrm{abund}$"
-
-    if "log_prob" in param:
-        index = param.index("log_prob")
-        param[index] = r"$\log\,\mathcal{L}$"
-
-    if "log_tau_cloud" in param:
-        index = param.index("log_tau_cloud")
-        param[index] = r"$\log\,\tau_\mathrm{cloud}$"
-
-    if "veil_a" in param:
-        index = param.index("veil_a")
-        param[index] = r"$a_\mathrm{veil}$"
-
-    if "veil_b" in param:
-        index = param.index("veil_b")
-        param[index] = r"$b_\mathrm{veil}$"
-
-    if "veil_ref" in param:
-        index = param.index("veil_ref")
-        param[index] = r"$F_\mathrm{ref, veil}$"
-
-    if "gauss_amplitude" in param:
-        index = param.index("gauss_amplitude")
-        param[index] = r"$a$ (W m$^{-2}$ µm$^{-1}$)"
-
-    if "gauss_mean" in param:
-        index = param.index("gauss_mean")
-        param[index] = r"$\lambda$ (nm)"
-
-    if "gauss_sigma" in param:
-        index = param.index("gauss_sigma")
-        param[index] = r"$\sigma$ (nm)"
-
-    if "gauss_amplitude_2" in param:
-        index = param.index("gauss_amplitude_2")
-        param[index] = r"$a_2$ (W m$^{-2}$ µm$^{-1}$)"
-
-    if "gauss_mean_2" in param:
-        index = param.index("gauss_mean_2")
-        param[index] = r"$\lambda_2$ (nm)"
-
-    if "gauss_sigma_2" in param:
-        index = param.index("gauss_sigma_2")
-        param[index] = r"$\sigma_2$ (nm)"
+        if item in _STATIC_LABELS:
+            param[i] = _STATIC_LABELS[item]
 
-    if "gauss_fwhm" in param:
-        index = param.index("gauss_fwhm")
-        param[index] = r"FWHM (km s$^{-1}$)"
+        elif item in _OBJTYPE_LABELS:
+            param[i] = _OBJTYPE_LABELS[item].get(object_type, item)
 
-    if "line_flux" in param:
-        index = param.index("line_flux")
-        param[index] = r"$F_\mathrm{line}$ (W m$^{-2}$)"
-
-    if "line_luminosity" in param:
-        index = param.index("line_luminosity")
-        param[index] = r"$L_\mathrm{line}$ ($L_\mathrm{\odot}$)"
-
-    if "log_line_lum" in param:
-        index = param.index("log_line_lum")
-        param[index] = r"$\log\,L_\mathrm{line}/L_\mathrm{\odot}$"
-
-    if "log_acc_lum" in param:
-        index = param.index("log_acc_lum")
-        param[index] = r"$\log\,L_\mathrm{acc}/L_\mathrm{\odot}$"
-
-    if "line_eq_width" in param:
-        index = param.index("line_eq_width")
-        param[index] = r"EW ($\AA$)"
-
-    if "line_vrad" in param:
-        index = param.index("line_vrad")
-        param[index] = r"RV (km s$^{-1}$)"
-
-    if "log_kappa_0" in param:
-        index = param.index("log_kappa_0")
-        param[index] = r"$\log\,\kappa_0$"
-
-    if "log_kappa_abs" in param:
-        index = param.index("log_kappa_abs")
-        param[index] = r"$\log\,\kappa_\mathrm{abs}$"
-
-    if "log_kappa_sca" in param:
-        index = param.index("log_kappa_sca")
-        param[index] = r"$\log\,\kappa_\mathrm{sca}$"
-
-    if "opa_index" in param:
-        index = param.index("opa_index")
-        param[index] = r"$\xi$"
-
-    if "opa_abs_index" in param:
-        index = param.index("opa_abs_index")
-        param[index] = r"$\xi_\mathrm{abs}$"
-
-    if "opa_sca_index" in param:
-        index = param.index("opa_sca_index")
-        param[index] = r"$\xi_\mathrm{sca}$"
-
-    if "log_p_base" in param:
-        index = param.index("log_p_base")
-        param[index] = r"$\log\,P_\mathrm{cloud}$"
-
-    if "albedo" in param:
-        index = param.index("albedo")
-        param[index] = r"$\omega$"
-
-    if "opa_knee" in param:
-        index = param.index("opa_knee")
-        param[index] = r"$\lambda_\mathrm{R}$ (µm)"
-
-    if "lambda_ray" in param:
-        index = param.index("lambda_ray")
-        param[index] = r"$\lambda_\mathrm{R}$ (µm)"
-
-    if "mix_length" in param:
-        index = param.index("mix_length")
-        param[index] = r"$\ell_\mathrm{m}$ ($H_\mathrm{p}$)"
-
-    if "spec_weight" in param:
-        index = param.index("spec_weight")
-        param[index] = r"w$_\mathrm{spec}$"
-
-    if "log_beta_r" in param:
-        index = param.index("log_beta_r")
-        param[index] = r"$\log\,\beta_\mathrm{r}$"
-
-    if "log_gamma_r" in param:
-        index = param.index("log_gamma_r")
-        param[index] = r"$\log\,\gamma_\mathrm{r}$"
-
-    if "gamma_r" in param:
-        index = param.index("gamma_r")
-        param[index] = r"$\gamma_\mathrm{r}$"
-
-    if "log_kappa_gray" in param:
-        index = param.index("log_kappa_gray")
-        param[index] = r"$\log\,\kappa_\mathrm{gray}$"
-
-    if "log_cloud_top" in param:
-        index = param.index("log_cloud_top")
-        param[index] = r"$\log\,P_\mathrm{top}$"
-
-    if "flux_scaling" in param:
-        index = param.index("flux_scaling")
-        param[index] = r"$a_\mathrm{flux}$"
+        elif item.startswith("phot_ext_"):
+            filter_name = item[9:].split("/")[1]
+            param[i] = rf"$A_\mathrm{{{filter_name}}}$"
 
-    if "log_flux_scaling" in param:
-        index = param.index("log_flux_scaling")
-        param[index] = r"$\log\,a_\mathrm{flux}$"
+        elif item.startswith(_AFFIX_PREFIXES) or item.endswith("_error"):
+            for affix, label in _AFFIX_LABELS:
+                if affix == "_error":
+                    if item.endswith(affix):
+                        item_name = item[: -len(affix)]
+                        break
 
-    if "flux_offset" in param:
-        index = param.index("flux_offset")
-        param[index] = r"$b_\mathrm{flux}$ (W m$^{-2}$ µm$^{-1}$)"
+                elif item.startswith(affix):
+                    item_name = item[len(affix) :]
+                    break
 
-    return param
+            escaped_name = _escape_underscore(item_name)
+
+            if affix == "ratio_" and escaped_name != item_name:
+                escaped_name = escaped_name.split("/")[1]
+
+            param[i] = label.format(escaped_name)
+
+    return tuple(param)
+
+
+# Units and labels of the parameters in quantity_unit, for
+# which the quantity is the same as the parameter name
+
+_QUANTITY_LABELS = {
+    "teff": ("K", r"$T_\mathrm{eff}$"),
+    "logg": (None, r"$\log g$"),
+    "metallicity": (None, "[Fe/H]"),
+    "feh": (None, "[Fe/H]"),
+    "fsed": (None, r"$f_\mathrm{sed}$"),
+    "c_o_ratio": (None, "C/O"),
+    "log_kzz": (None, r"$\log\,K_\mathrm{zz}$"),
+    "ad_index": (None, r"$\gamma_\mathrm{ad}$"),
+    "distance": ("pc", r"$d$"),
+    "parallax": ("mas", r"$\varpi$"),
+    "luminosity": (None, r"$\log\,L/L_\mathrm{\odot}$"),
+    "ism_ext": (None, r"$A_V$"),
+    "lognorm_ext": (None, r"$A_V$"),
+    "powerlaw_ext": (None, r"$A_V$"),
+    "pt_smooth": (None, r"$\sigma_\mathrm{P-T}$"),
+    "abund_smooth": (None, r"$\sigma_\mathrm{abund}$"),
+    "disk_teff": ("K", r"$T_\mathrm{disk}$"),
+    "flux_scaling": (None, r"$a_\mathrm{flux}$"),
+    "log_flux_scaling": (None, r"$\log\,a_\mathrm{flux}$"),
+    "flux_offset": (r"W m$^{-2}$ µm$^{-1}$", r"$b_\mathrm{flux}$"),
+}
+
+# Units and labels of the parameters in quantity_unit
+# that depend on the object type ('planet' or 'star')
+
+_QUANTITY_OBJTYPE = {
+    "radius": {
+        "planet": (r"$R_\mathrm{J}$", r"$R$"),
+        "star": (r"$R_\mathrm{\odot}$", r"$R_\ast$"),
+    },
+    "mass": {
+        "planet": (r"$M_\mathrm{J}$", r"$M$"),
+        "star": (r"$M_\mathrm{\odot}$", r"$M_\ast$"),
+    },
+    "disk_radius": {
+        "planet": (r"$R_\mathrm{J}$", r"$R_\mathrm{disk}$"),
+        "star": ("au", r"$R_\mathrm{disk}$"),
+    },
+}
+
+
+# Parameters of quantity_unit with an index, for which the unit
+# is a dict if it depends on the object type. The label is
+# formatted with the index starting at 1
+
+_QUANTITY_INDEX = re.compile(r"(teff|logg|feh|radius|disk_teff|disk_radius)_([0-9]+)")
+
+_QUANTITY_INDEX_LABELS = {
+    "teff": ("K", r"$T_\mathrm{{{}}}$"),
+    "logg": ("", r"$\log g_\mathrm{{{}}}$"),
+    "feh": ("", r"[Fe/H]$_\mathrm{{{}}}$"),
+    "radius": (
+        {"planet": r"$R_\mathrm{J}$", "star": r"$R_\mathrm{\odot}$"},
+        r"$R_\mathrm{{{}}}$",
+    ),
+    "disk_teff": ("K", r"$T_\mathrm{{disk,}}$$_\mathrm{{{}}}$"),
+    "disk_radius": (
+        {"planet": r"$R_\mathrm{J}$", "star": "au"},
+        r"$R_\mathrm{{disk,}}$$_\mathrm{{{}}}$",
+    ),
+}
 
 
 @typechecked
@@ -995,201 +616,52 @@ def quantity_unit(
     label = []
 
     for item in param:
-        if item == "teff":
-            quantity.append("teff")
-            unit.append("K")
-            label.append(r"$T_\mathrm{eff}$")
-
-        if item == "logg":
-            quantity.append("logg")
-            unit.append(None)
-            label.append(r"$\log g$")
-
-        if item == "metallicity":
-            quantity.append("metallicity")
-            unit.append(None)
-            label.append("[Fe/H]")
-
-        if item == "feh":
-            quantity.append("feh")
-            unit.append(None)
-            label.append("[Fe/H]")
-
-        if item == "fsed":
-            quantity.append("fsed")
-            unit.append(None)
-            label.append(r"$f_\mathrm{sed}$")
-
-        if item == "c_o_ratio":
-            quantity.append("c_o_ratio")
-            unit.append(None)
-            label.append("C/O")
-
-        if item == "log_kzz":
-            quantity.append("log_kzz")
-            unit.append(None)
-            label.append(r"$\log\,K_\mathrm{zz}$")
-
-        if item == "ad_index":
-            quantity.append("ad_index")
-            unit.append(None)
-            label.append(r"$\gamma_\mathrm{ad}$")
-
-        if item == "radius":
-            quantity.append("radius")
-
-            if object_type == "planet":
-                unit.append(r"$R_\mathrm{J}$")
-                label.append(r"$R$")
-
-            elif object_type == "star":
-                unit.append(r"$R_\mathrm{\odot}$")
-                label.append(r"$R_\ast$")
-
-        item_split = item.split("_")
-
-        if len(item_split) == 2 and item_split[1].isdigit():
-            param_index = int(item_split[1])
-
-            if item_split[0] == "teff":
-                quantity.append(f"teff_{item_split[1]}")
-                unit.append("K")
-                label.append(rf"$T_\mathrm{{{param_index+1}}}$")
-
-            elif item_split[0] == "logg":
-                quantity.append(f"logg_{item_split[1]}")
-                unit.append("")
-                label.append(rf"$\log g_\mathrm{{{param_index+1}}}$")
-
-            elif item_split[0] == "feh":
-                quantity.append(f"feh_{item_split[1]}")
-                unit.append("")
-                label.append(rf"[Fe/H]$_\mathrm{{{param_index+1}}}$")
-
-            elif item_split[0] == "radius":
-                quantity.append(f"radius_{item_split[1]}")
-
-                if object_type == "planet":
-                    unit.append(r"$R_\mathrm{J}$")
-
-                elif object_type == "star":
-                    unit.append(r"$R_\mathrm{\odot}$")
-
-                label.append(rf"$R_\mathrm{{{param_index+1}}}$")
-
-        if item == "distance":
-            quantity.append("distance")
-            unit.append("pc")
-            label.append(r"$d$")
-
-        if item == "parallax":
-            quantity.append("parallax")
-            unit.append("mas")
-            label.append(r"$\varpi$")
-
-        if item == "mass":
-            quantity.append("mass")
-
-            if object_type == "planet":
-                unit.append(r"$M_\mathrm{J}$")
-                label.append(r"$M$")
-
-            elif object_type == "star":
-                unit.append(r"$M_\mathrm{\odot}$")
-                label.append(r"$M_\ast$")
-
-        if item == "luminosity":
-            quantity.append("luminosity")
-            unit.append(None)
-            label.append(r"$\log\,L/L_\mathrm{\odot}$")
+        if item in _QUANTITY_LABELS:
+            quantity.append(item)
+            unit.append(_QUANTITY_LABELS[item][0])
+            label.append(_QUANTITY_LABELS[item][1])
 
-        if item == "ism_ext":
-            quantity.append("ism_ext")
-            unit.append(None)
-            label.append(r"$A_V$")
+        elif item in _QUANTITY_OBJTYPE:
+            quantity.append(item)
 
-        if item == "lognorm_ext":
-            quantity.append("lognorm_ext")
-            unit.append(None)
-            label.append(r"$A_V$")
+            if object_type in _QUANTITY_OBJTYPE[item]:
+                unit.append(_QUANTITY_OBJTYPE[item][object_type][0])
+                label.append(_QUANTITY_OBJTYPE[item][object_type][1])
 
-        if item == "powerlaw_ext":
-            quantity.append("powerlaw_ext")
-            unit.append(None)
-            label.append(r"$A_V$")
-
-        if item.startswith("phot_ext_"):
+        elif item.startswith("phot_ext_"):
             quantity.append(item)
             unit.append(None)
             filter_name = item[9:].split("/")[1]
             label.append(rf"$A_\mathrm{{{filter_name}}}$")
 
-        if item == "pt_smooth":
-            quantity.append("pt_smooth")
-            unit.append(None)
-            label.append(r"$\sigma_\mathrm{P-T}$")
-
-        if item == "abund_smooth":
-            quantity.append("abund_smooth")
-            unit.append(None)
-            label.append(r"$\sigma_\mathrm{abund}$")
-
-        if item == "disk_teff":
-            quantity.append("disk_teff")
-            unit.append("K")
-            label.append(r"$T_\mathrm{disk}$")
-
-        for i in range(100):
-            if item == f"disk_teff_{i}":
-                quantity.append(f"disk_teff_{i}")
-                unit.append("K")
-                label.append(r"$T_\mathrm{disk,}$" + rf"$_\mathrm{{{i+1}}}$")
-
-            else:
-                break
-
-        if item == "disk_radius":
-            quantity.append("disk_radius")
-
-            if object_type == "planet":
-                unit.append(r"$R_\mathrm{J}$")
-
-            elif object_type == "star":
-                unit.append("au")
+        else:
+            match = _QUANTITY_INDEX.fullmatch(item)
 
-            label.append(r"$R_\mathrm{disk}$")
+            if match is not None:
+                item_unit, item_label = _QUANTITY_INDEX_LABELS[match.group(1)]
 
-        for i in range(100):
-            if item == f"disk_radius_{i}":
-                quantity.append(f"disk_radius_{i}")
+                quantity.append(item)
 
-                if object_type == "planet":
-                    unit.append(r"$R_\mathrm{J}$")
+                if not isinstance(item_unit, dict):
+                    unit.append(item_unit)
+                elif object_type in item_unit:
+                    unit.append(item_unit[object_type])
 
-                elif object_type == "star":
-                    unit.append("au")
+                label.append(item_label.format(int(match.group(2)) + 1))
 
-                label.append(r"$R_\mathrm{disk,}$" + rf"$_\mathrm{{{i+1}}}$")
+    return quantity, unit, label
 
-            else:
-                break
 
-        if item == "flux_scaling":
-            quantity.append("flux_scaling")
-            unit.append(None)
-            label.append(r"$a_\mathrm{flux}$")
+# Indices of the early and late subclasses in
+# the discrete colorbar of the field objects
 
-        if item == "log_flux_scaling":
-            quantity.append("log_flux_scaling")
-            unit.append(None)
-            label.append(r"$\log\,a_\mathrm{flux}$")
-
-        if item == "flux_offset":
-            quantity.append("flux_offset")
-            unit.append(r"W m$^{-2}$ µm$^{-1}$")
-            label.append(r"$b_\mathrm{flux}$")
+_SUBCLASS_INDEX = {
+    f"{sub_item} {class_item}": 2 * i + j
+    for i, class_item in enumerate("OBAFGKMLT")
+    for j, sub_item in enumerate(["early", "late"])
+}
 
-    return quantity, unit, label
+_SUBCLASS_INDEX["early Y"] = 18
 
 
 @typechecked
@@ -1247,142 +719,39 @@ def field_bounds_ticks(
             "Y1-Y2",
         ]
 
-        if field_range[0] == "early O":
-            index_start = 0
-        elif field_range[0] == "late O":
-            index_start = 1
-        elif field_range[0] == "early B":
-            index_start = 2
-        elif field_range[0] == "late B":
-            index_start = 3
-        elif field_range[0] == "early A":
-            index_start = 4
-        elif field_range[0] == "late A":
-            index_start = 5
-        elif field_range[0] == "early F":
-            index_start = 6
-        elif field_range[0] == "late F":
-            index_start = 7
-        elif field_range[0] == "early G":
-            index_start = 8
-        elif field_range[0] == "late G":
-            index_start = 9
-        elif field_range[0] == "early K":
-            index_start = 10
-        elif field_range[0] == "late K":
-            index_start = 11
-        elif field_range[0] == "early M":
-            index_start = 12
-        elif field_range[0] == "late M":
-            index_start = 13
-        elif field_range[0] == "early L":
-            index_start = 14
-        elif field_range[0] == "late L":
-            index_start = 15
-        elif field_range[0] == "early T":
-            index_start = 16
-        elif field_range[0] == "late T":
-            index_start = 17
-        elif field_range[0] == "early Y":
-            index_start = 18
-
-        if field_range[1] == "early O":
-            index_end = 1
-        elif field_range[1] == "late O":
-            index_end = 2
-        elif field_range[1] == "early B":
-            index_end = 3
-        elif field_range[1] == "late B":
-            index_end = 4
-        elif field_range[1] == "early A":
-            index_end = 5
-        elif field_range[1] == "late A":
-            index_end = 6
-        elif field_range[1] == "early F":
-            index_end = 7
-        elif field_range[1] == "late F":
-            index_end = 8
-        elif field_range[1] == "early G":
-            index_end = 9
-        elif field_range[1] == "late G":
-            index_end = 10
-        elif field_range[1] == "early K":
-            index_end = 11
-        elif field_range[1] == "late K":
-            index_end = 12
-        elif field_range[1] == "early M":
-            index_end = 13
-        elif field_range[1] == "late M":
-            index_end = 14
-        elif field_range[1] == "early L":
-            index_end = 15
-        elif field_range[1] == "late L":
-            index_end = 16
-        elif field_range[1] == "early T":
-            index_end = 17
-        elif field_range[1] == "late T":
-            index_end = 18
-        elif field_range[1] == "early Y":
-            index_end = 19
+        index_start = _SUBCLASS_INDEX[field_range[0]]
+        index_end = _SUBCLASS_INDEX[field_range[1]] + 1
 
     else:
         spectral_ranges = ["O", "B", "A", "F", "G", "K", "M", "L", "T", "Y"]
 
-        if field_range[0] == "O":
-            index_start = 0
-        elif field_range[0] == "B":
-            index_start = 1
-        elif field_range[0] == "A":
-            index_start = 2
-        elif field_range[0] == "F":
-            index_start = 3
-        elif field_range[0] == "G":
-            index_start = 4
-        elif field_range[0] == "K":
-            index_start = 5
-        elif field_range[0] == "M":
-            index_start = 6
-        elif field_range[0] == "L":
-            index_start = 7
-        elif field_range[0] == "T":
-            index_start = 8
-        elif field_range[0] == "Y":
-            index_start = 9
-
-        if field_range[1] == "O":
-            index_end = 1
-        elif field_range[1] == "B":
-            index_end = 2
-        elif field_range[1] == "A":
-            index_end = 3
-        elif field_range[1] == "F":
-            index_end = 4
-        elif field_range[1] == "G":
-            index_end = 5
-        elif field_range[1] == "K":
-            index_end = 6
-        elif field_range[1] == "M":
-            index_end = 7
-        elif field_range[1] == "L":
-            index_end = 8
-        elif field_range[1] == "T":
-            index_end = 9
-        elif field_range[1] == "Y":
-            index_end = 10
-
-    index_range = index_end - index_start + 1
-
-    bounds = np.linspace(index_start, index_end, index_range)
-    ticks = np.linspace(index_start + 0.5, index_end - 0.5, index_range - 1)
+        index_start = spectral_ranges.index(field_range[0])
+        index_end = spectral_ranges.index(field_range[1]) + 1
 
-    labels = spectral_ranges[index_start:index_end]
+    # Boundaries and midpoints relative to the start of the range
+
+    bounds = np.arange(index_end - index_start + 1, dtype=float)
+    ticks = bounds[:-1] + 0.5
 
-    ticks -= bounds[0]
-    bounds -= bounds[0]
+    labels = spectral_ranges[index_start:index_end]
 
     return bounds, ticks, labels
 
 
+# Names of the young/low-gravity objects and the
+# corresponding names of the directly imaged objects
+
+_EMPIRICAL_NAMES = {
+    "beta_Pic_b": "beta Pic b",
+    "HR8799b": "HR 8799 b",
+    "HR8799c": "HR 8799 c",
+    "HR8799d": "HR 8799 d",
+    "HR8799e": "HR 8799 e",
+    "kappa_And_B": "kappa And b",
+    "HD1160B": "HD 1160 B",
+}
+
+
 @typechecked
 def remove_color_duplicates(
     object_names: List[str], empirical_names: np.ndarray
@@ -1404,28 +773,12 @@ def remove_color_duplicates(
         List with selected indices of the young/low-gravity objects.
     """
 
+    object_set = set(object_names)
+
     indices = []
 
     for i, item in enumerate(empirical_names):
-        if item == "beta_Pic_b" and "beta Pic b" in object_names:
-            continue
-
-        if item == "HR8799b" and "HR 8799 b" in object_names:
-            continue
-
-        if item == "HR8799c" and "HR 8799 c" in object_names:
-            continue
-
-        if item == "HR8799d" and "HR 8799 d" in object_names:
-            continue
-
-        if item == "HR8799e" and "HR 8799 e" in object_names:
-            continue
-
-        if item == "kappa_And_B" and "kappa And b" in object_names:
-            continue
-
-        if item == "HD1160B" and "HD 1160 B" in object_names:
+        if _EMPIRICAL_NAMES.get(item) in object_set:
             continue
 
         indices.append(i)
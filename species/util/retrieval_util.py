@@ -5,6 +5,7 @@ This module was put together many contributions by Paul Mollière
 """
 
 import copy
+import math
 import sys
 import warnings
 
@@ -14,7 +15,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from scipy.interpolate import interp1d, PchipInterpolator
-from scipy.ndimage import gaussian_filter
+from scipy.ndimage import gaussian_filter1d
 from typeguard import typechecked
 
 from species.core import constants
@@ -397,7 +398,7 @@ def pt_spline_interp(
         raise ValueError("Expecting equally spaced pressures in log space.")
 
     if pt_smooth is not None:
-        temp_interp = gaussian_filter(
+        temp_interp = gaussian_filter1d(
             temp_interp, sigma=pt_smooth / log_diff, mode="nearest"
         )
 
@@ -2861,7 +2862,7 @@ def convolve_spectrum(
 
     # delta_lambda of resolution element is
     # FWHM of the LSF's standard deviation
-    sigma_lsf = 1.0 / spec_res / (2.0 * np.sqrt(2.0 * np.log(2.0)))
+    sigma_lsf = 1.0 / spec_res / (2.0 * math.sqrt(2.0 * math.log(2.0)))
 
     # The input spacing of petitRADTRANS is 1e3, but just compute
     # it to be sure, or more versatile in the future.
@@ -2873,7 +2874,7 @@ def convolve_spectrum(
     # in units of the input wavelength bins
     sigma_filter = sigma_lsf / spacing
 
-    return gaussian_filter(input_flux, sigma=sigma_filter, mode="nearest")
+    return gaussian_filter1d(input_flux, sigma=sigma_filter, mode="nearest")
 
 
 @typechecked
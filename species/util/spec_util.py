@@ -4,14 +4,24 @@ Utility functions for manipulating spectra.
 
 import warnings
 
-from math import ceil
+from functools import lru_cache
+from math import ceil, log, sqrt, tanh
 from typing import Tuple, Union
 
 import numpy as np
 
-from scipy.ndimage import gaussian_filter
+from numba import njit
+from scipy import sparse
+from scipy.ndimage import correlate1d
 from typeguard import typechecked
 
+from species.core import constants
+
+# Ratio between the FWHM and the standard
+# deviation of a Gaussian line spread function
+
+_FWHM_TO_SIGMA = 2.0 * sqrt(2.0 * log(2.0))
+
 
 @typechecked
 def create_wavelengths(
@@ -39,23 +49,422 @@ def create_wavelengths(
         argument of ``wavel_sampling``.
     """
 
+    # The cached array is read-only so a copy is returned
+    # because several functions modify the wavelengths
+
+    return _create_wavelengths(wavel_range[0], wavel_range[1], wavel_sampling).copy()
+
+
+@lru_cache(maxsize=128, typed=True)
+def _create_wavelengths(
+    wavel_min: Union[float, np.float32],
+    wavel_max: Union[float, np.float32],
+    wavel_sampling: float,
+) -> np.ndarray:
+    """
+    Cached implementation of
+    :func:`~species.util.spec_util.create_wavelengths`. With
+    ``typed=True``, the wavelengths of a ``np.float32`` range
+    are cached separately from those of a ``float`` range.
+    """
+
     n_test = 100
 
-    wavel_test = np.logspace(np.log10(wavel_range[0]), np.log10(wavel_range[1]), n_test)
-    sampling_test = 0.5 * (wavel_test[1:] + wavel_test[:-1]) / np.diff(wavel_test)
+    # The sampling of a logarithmic grid with n_test points is
+    # the same for all wavelengths and given by the ratio r of
+    # adjacent points, 0.5*(r+1)/(r-1) = 0.5/tanh(0.5*ln(r))
+
+    log_step = log(wavel_max / wavel_min) / (n_test - 1)
+    sampling_test = 0.5 / tanh(0.5 * log_step)
 
     # math.ceil returns int, but np.ceil returns float
     wavel_array = np.logspace(
-        np.log10(wavel_range[0]),
-        np.log10(wavel_range[1]),
-        ceil(n_test * wavel_sampling / np.mean(sampling_test)) + 1,
+        np.log10(wavel_min),
+        np.log10(wavel_max),
+        ceil(n_test * wavel_sampling / sampling_test) + 1,
     )
 
     # res_out = np.mean(0.5*(wavel_array[1:]+wavel_array[:-1])/np.diff(wavel_array))
 
+    wavel_array.flags.writeable = False
+
     return wavel_array
 
 
+@njit(cache=True)
+def _make_bins(wavel: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Function for calculating the edges and widths of the
+    wavelength bins, with the same convention as ``spectres``.
+    """
+
+    edges = np.empty(wavel.size + 1)
+    widths = np.empty(wavel.size)
+
+    edges[0] = wavel[0] - 0.5 * (wavel[1] - wavel[0])
+    edges[-1] = wavel[-1] + 0.5 * (wavel[-1] - wavel[-2])
+    edges[1:-1] = 0.5 * (wavel[1:] + wavel[:-1])
+
+    widths[:-1] = edges[1:-1] - edges[:-2]
+    widths[-1] = wavel[-1] - wavel[-2]
+
+    return edges, widths
+
+
+@njit(cache=True)
+def _resample_flux(
+    new_wavel: np.ndarray, old_wavel: np.ndarray, old_flux: np.ndarray, fill: float
+) -> np.ndarray:
+    """
+    Compiled kernel of :func:`~species.util.spec_util.resample_spectrum`.
+    """
+
+    old_edges, old_widths = _make_bins(old_wavel)
+    new_edges, _ = _make_bins(new_wavel)
+
+    new_flux = np.empty(new_wavel.size)
+
+    start = 0
+    stop = 0
+
+    for j in range(new_wavel.size):
+        if new_edges[j] < old_edges[0] or new_edges[j + 1] > old_edges[-1]:
+            new_flux[j] = fill
+            continue
+
+        # First and last old bin that are (partially)
+        # covered by the new bin
+
+        while old_edges[start + 1] <= new_edges[j]:
+            start += 1
+
+        while old_edges[stop + 1] < new_edges[j + 1]:
+            stop += 1
+
+        if start == stop:
+            new_flux[j] = old_flux[start]
+            continue
+
+        # Fraction of the first and last old bin
+        # that is covered by the new bin
+
+        width_start = (
+            old_widths[start]
+            * (old_edges[start + 1] - new_edges[j])
+            / (old_edges[start + 1] - old_edges[start])
+        )
+
+        width_stop = (
+            old_widths[stop]
+            * (new_edges[j + 1] - old_edges[stop])
+            / (old_edges[stop + 1] - old_edges[stop])
+        )
+
+        sum_flux = width_start * old_flux[start] + width_stop * old_flux[stop]
+        sum_width = width_start + width_stop
+
+        for k in range(start + 1, stop):
+            sum_flux += old_widths[k] * old_flux[k]
+            sum_width += old_widths[k]
+
+        new_flux[j] = sum_flux / sum_width
+
+    return new_flux
+
+
+@njit(cache=True)
+def _resample_weights(
+    new_wavel: np.ndarray, old_wavel: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Function for calculating the weights with which
+    :func:`~species.util.spec_util.resample_spectrum` combines
+    the old flux values, returned as the rows, columns, and values
+    of a sparse matrix. Bins of ``new_wavel`` that are not fully
+    covered by ``old_wavel`` get a single NaN weight.
+    """
+
+    old_edges, old_widths = _make_bins(old_wavel)
+    new_edges, _ = _make_bins(new_wavel)
+
+    bin_start = np.zeros(new_wavel.size, dtype=np.int64)
+    bin_stop = np.full(new_wavel.size, -1, dtype=np.int64)
+
+    start = 0
+    stop = 0
+
+    for j in range(new_wavel.size):
+        if new_edges[j] < old_edges[0] or new_edges[j + 1] > old_edges[-1]:
+            continue
+
+        while old_edges[start + 1] <= new_edges[j]:
+            start += 1
+
+        while old_edges[stop + 1] < new_edges[j + 1]:
+            stop += 1
+
+        bin_start[j] = start
+        bin_stop[j] = stop
+
+    n_weights = np.maximum(bin_stop - bin_start + 1, 1)
+    row_edges = np.zeros(new_wavel.size + 1, dtype=np.int64)
+    row_edges[1:] = np.cumsum(n_weights)
+
+    rows = np.empty(row_edges[-1], dtype=np.int64)
+    cols = np.empty(row_edges[-1], dtype=np.int64)
+    weights = np.empty(row_edges[-1])
+
+    for j in range(new_wavel.size):
+        idx = row_edges[j]
+        start = bin_start[j]
+        stop = bin_stop[j]
+
+        rows[idx : row_edges[j + 1]] = j
+
+        if stop < start:
+            cols[idx] = 0
+            weights[idx] = np.nan
+            continue
+
+        if start == stop:
+            cols[idx] = start
+            weights[idx] = 1.0
+            continue
+
+        width_start = (
+            old_widths[start]
+            * (old_edges[start + 1] - new_edges[j])
+            / (old_edges[start + 1] - old_edges[start])
+        )
+
+        width_stop = (
+            old_widths[stop]
+            * (new_edges[j + 1] - old_edges[stop])
+            / (old_edges[stop + 1] - old_edges[stop])
+        )
+
+        sum_width = width_start + width_stop
+
+        for k in range(start + 1, stop):
+            sum_width += old_widths[k]
+
+        cols[idx : row_edges[j + 1]] = np.arange(start, stop + 1)
+
+        weights[idx] = width_start / sum_width
+        weights[row_edges[j + 1] - 1] = width_stop / sum_width
+
+        for k in range(start + 1, stop):
+            weights[idx + k - start] = old_widths[k] / sum_width
+
+    return rows, cols, weights
+
+
+@typechecked
+def resample_spectrum(
+    new_wavel: np.ndarray,
+    old_wavel: np.ndarray,
+    old_flux: np.ndarray,
+    fill: float = np.nan,
+) -> np.ndarray:
+    """
+    Function for resampling a spectrum to new wavelengths while
+    conserving the flux. The algorithm is the same as the one of
+    ``spectres.spectres`` but the loop over the wavelength bins
+    is compiled with ``numba``.
+
+    Parameters
+    ----------
+    new_wavel : np.ndarray
+        Wavelengths (um) to which the spectrum is resampled.
+    old_wavel : np.ndarray
+        Wavelengths (um) of the input spectrum.
+    old_flux : np.ndarray
+        Flux (W m-2 um-1) of the input spectrum.
+    fill : float
+        Value of the flux for wavelengths bins of ``new_wavel``
+        that are not fully covered by ``old_wavel``.
+
+    Returns
+    -------
+    np.ndarray
+        Resampled flux (W m-2 um-1).
+    """
+
+    return _resample_flux(
+        np.ascontiguousarray(new_wavel, dtype=np.float64),
+        np.ascontiguousarray(old_wavel, dtype=np.float64),
+        np.ascontiguousarray(old_flux, dtype=np.float64),
+        fill,
+    )
+
+
+@typechecked
+def linear_interp_weights(
+    old_wavel: np.ndarray, new_wavel: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Function for calculating the indices and weights for linearly
+    interpolating a spectrum from ``old_wavel`` to ``new_wavel``.
+    The interpolated flux is given by ``(1 - weight) *
+    flux[index] + weight * flux[index + 1]``, such that the
+    weights can be reused for different fluxes that are sampled
+    at the same wavelengths. Wavelengths outside the range of
+    ``old_wavel`` are linearly extrapolated.
+
+    Parameters
+    ----------
+    old_wavel : np.ndarray
+        Wavelengths (um) of the input spectrum, sorted by
+        increasing value.
+    new_wavel : np.ndarray
+        Wavelengths (um) to which the spectrum is interpolated.
+
+    Returns
+    -------
+    np.ndarray
+        Indices of ``old_wavel`` directly below ``new_wavel``.
+    np.ndarray
+        Interpolation weights of the points at ``index + 1``.
+    """
+
+    index = np.searchsorted(old_wavel, new_wavel) - 1
+    np.clip(index, 0, old_wavel.size - 2, out=index)
+
+    weight = (new_wavel - old_wavel[index]) / (old_wavel[index + 1] - old_wavel[index])
+
+    return index, weight
+
+
+@typechecked
+def rot_broad_kernel(
+    vsini: float, wavel_step: float, wavel_eff: float, epsilon: float = 0.0
+) -> np.ndarray:
+    """
+    Function for calculating the rotational broadening profile
+    from Gray (2005) on a linear wavelength grid. The profile is
+    the same as the kernel that is used by
+    :func:`PyAstronomy.pyasl.fastRotBroad`, but normalized to a
+    sum of unity such that a spectrum can be broadened with a
+    single (FFT) convolution.
+
+    Parameters
+    ----------
+    vsini : float
+        Projected rotational velocity (km/s).
+    wavel_step : float
+        Wavelength spacing (um) of the linear wavelength grid.
+    wavel_eff : float
+        Wavelength (um) at which the broadening profile is
+        evaluated, typically the mean wavelength of the spectrum.
+    epsilon : float
+        Linear limb-darkening coefficient, between 0 and 1.
+
+    Returns
+    -------
+    np.ndarray
+        Broadening profile, with an odd number of elements.
+    """
+
+    wavel_max = vsini * 1e3 / constants.LIGHT * wavel_eff
+
+    if wavel_max <= 0.0:
+        return np.ones(1)
+
+    n_half = int(np.floor(wavel_max / wavel_step))
+
+    x_kernel = np.arange(-n_half, n_half + 1) * wavel_step / wavel_max
+    x_kernel = x_kernel[np.abs(x_kernel) < 1.0]
+
+    kernel = 2.0 * (1.0 - epsilon) * np.sqrt(1.0 - x_kernel**2) / np.pi
+    kernel += 0.5 * epsilon * (1.0 - x_kernel**2)
+
+    return kernel / np.sum(kernel)
+
+
+@njit(cache=True)
+def _smooth_flux(flux: np.ndarray, sigma: np.ndarray, spacing: float) -> np.ndarray:
+    """
+    Compiled kernel of the non-uniform branch of
+    :func:`~species.util.spec_util.smooth_spectrum`. The flux is
+    convolved with a Gaussian of which the kernel size is 5 times
+    the width of the LSF at each wavelength. The flux is set to NaN
+    where the kernel does not fit within the array.
+    """
+
+    flux_smooth = np.full(flux.size, np.nan)
+
+    for i in range(flux.size):
+        size = int(5.0 * sigma[i] / spacing)
+        if size % 2 == 0:
+            size += 1
+
+        half_size = (size - 1) // 2
+
+        if i < half_size or i + half_size >= flux.size:
+            continue
+
+        # The normalization of the Gaussian cancels
+        # out when dividing by the sum of the kernel
+
+        sigma_pix = sigma[i] / spacing
+
+        # The symmetric taps exp(-a*j^2) are calculated with the
+        # recurrence g_j+1 = g_j * q_j and q_j+1 = q_j * exp(-2a),
+        # so only two exponentials are needed per wavelength
+
+        alpha = 1.0 / (2.0 * sigma_pix**2)
+        ratio = np.exp(-2.0 * alpha)
+
+        kernel = 1.0
+        factor = np.exp(-alpha)
+
+        sum_kernel = 1.0
+        sum_flux = flux[i]
+
+        for j in range(1, half_size + 1):
+            kernel *= factor
+            factor *= ratio
+
+            sum_kernel += 2.0 * kernel
+            sum_flux += kernel * (flux[i - j] + flux[i + j])
+
+        flux_smooth[i] = sum_flux / sum_kernel
+
+    return flux_smooth
+
+
+@lru_cache(maxsize=256)
+@typechecked
+def _gaussian_taps(sigma: float, truncate: float = 4.0) -> np.ndarray:
+    """
+    Function for calculating the normalized Gaussian kernel with
+    the same taps as ``scipy.ndimage.gaussian_filter``. The kernel
+    is cached because the same width is typically used for many
+    spectra, so the returned array should not be modified.
+
+    Parameters
+    ----------
+    sigma : float
+        Standard deviation of the Gaussian, in number of pixels.
+    truncate : float
+        Truncate the kernel at this many standard deviations.
+
+    Returns
+    -------
+    np.ndarray
+        Normalized Gaussian kernel.
+    """
+
+    radius = int(truncate * sigma + 0.5)
+    pos = np.arange(-radius, radius + 1)
+
+    kernel = np.exp(-0.5 / (sigma * sigma) * pos**2)
+    kernel /= kernel.sum()
+    kernel.flags.writeable = False
+
+    return kernel
+
+
 @typechecked
 def smooth_spectrum(
     wavelength: np.ndarray,
@@ -92,37 +501,32 @@ def smooth_spectrum(
         Smoothed spectrum (W m-2 um-1).
     """
 
-    def _gaussian(size, sigma):
-        pos = range(-(size - 1) // 2, (size - 1) // 2 + 1)
-        kernel = [
-            np.exp(-float(x) ** 2 / (2.0 * sigma**2)) / (sigma * np.sqrt(2.0 * np.pi))
-            for x in pos
-        ]
+    # Wavelength steps, which are also used for the
+    # absolute spacing when smoothing with the kernel
 
-        return np.asarray(kernel / sum(kernel))
+    wavel_diff = np.diff(wavelength)
 
-    spacing = np.mean(2.0 * np.diff(wavelength) / (wavelength[1:] + wavelength[:-1]))
-    spacing_std = np.std(2.0 * np.diff(wavelength) / (wavelength[1:] + wavelength[:-1]))
+    rel_spacing = 2.0 * wavel_diff / (wavelength[1:] + wavelength[:-1])
+    spacing = rel_spacing.mean()
+    spacing_std = rel_spacing.std()
 
     if spacing_std / spacing < 1e-2 or force_smooth:
         # delta_lambda of resolution element is
         # FWHM of the LSF's standard deviation
-        sigma_lsf = 1.0 / spec_res / (2.0 * np.sqrt(2.0 * np.log(2.0)))
+        sigma_lsf = 1.0 / spec_res / _FWHM_TO_SIGMA
 
         # Calculate the sigma to be used with the Gaussian filter
         # in units of the input wavelength bins
         sigma_filter = sigma_lsf / spacing
 
-        flux_smooth = gaussian_filter(flux, sigma=sigma_filter, mode="nearest")
+        flux_smooth = correlate1d(flux, _gaussian_taps(sigma_filter), mode="nearest")
 
     else:
         if size % 2 == 0:
             raise ValueError("The kernel size should be an odd number.")
 
-        flux_smooth = np.zeros(flux.shape)  # (W m-2 um-1)
-
-        spacing = np.mean(np.diff(wavelength))  # (um)
-        spacing_std = np.std(np.diff(wavelength))  # (um)
+        spacing = wavel_diff.mean()  # (um)
+        spacing_std = wavel_diff.std()  # (um)
 
         if spacing_std / spacing > 1e-2:
             warnings.warn(
@@ -136,24 +540,79 @@ def smooth_spectrum(
                 "on the Github page if help is needed."
             )
 
-        for i, item in enumerate(wavelength):
-            fwhm = item / spec_res  # (um)
-            sigma = fwhm / (2.0 * np.sqrt(2.0 * np.log(2.0)))  # (um)
+        # Width of the LSF (um) at each wavelength
 
-            size = int(
-                5.0 * sigma / spacing
-            )  # Kernel size 5 times the width of the LSF
-            if size % 2 == 0:
-                size += 1
+        sigma = wavelength / spec_res / _FWHM_TO_SIGMA
 
-            gaussian = _gaussian(size, sigma / spacing)
+        flux_smooth = _smooth_flux(
+            np.ascontiguousarray(flux, dtype=np.float64), sigma, float(spacing)
+        )
 
-            try:
-                flux_smooth[i] = np.sum(
-                    gaussian * flux[i - (size - 1) // 2 : i + (size - 1) // 2 + 1]
-                )
+    return flux_smooth
 
-            except ValueError:
-                flux_smooth[i] = np.nan
 
-    return flux_smooth
+@typechecked
+def smooth_resample_matrix(
+    new_wavel: np.ndarray, old_wavel: np.ndarray, spec_res: float
+) -> sparse.csr_matrix:
+    """
+    Function for creating a sparse matrix that smooths a spectrum
+    with :func:`~species.util.spec_util.smooth_spectrum` and then
+    resamples it with
+    :func:`~species.util.spec_util.resample_spectrum`. Both steps
+    are linear in the flux, so the matrix can be applied to any
+    spectrum that is sampled at ``old_wavel``.
+
+    Parameters
+    ----------
+    new_wavel : np.ndarray
+        Wavelengths (um) to which the spectrum is resampled.
+    old_wavel : np.ndarray
+        Wavelengths (um) of the input spectrum. Should be sampled
+        with a uniform spectral resolution, for example with
+        :func:`~species.util.spec_util.create_wavelengths`.
+    spec_res : float
+        Spectral resolution to which the spectrum is smoothed.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        Matrix with shape ``(new_wavel.size, old_wavel.size)``.
+    """
+
+    rel_spacing = 2.0 * np.diff(old_wavel) / (old_wavel[1:] + old_wavel[:-1])
+    spacing = rel_spacing.mean()
+
+    if rel_spacing.std() / spacing >= 1e-2:
+        raise ValueError(
+            "The wavelengths of old_wavel should be sampled "
+            "with a uniform spectral resolution."
+        )
+
+    # Banded matrix of the Gaussian taps, with the columns beyond
+    # the edges clipped to the first and last wavelength in the
+    # same way as correlate1d with mode="nearest"
+
+    taps = _gaussian_taps(1.0 / spec_res / _FWHM_TO_SIGMA / spacing)
+    offsets = np.arange(taps.size) - taps.size // 2
+
+    smooth_rows = np.repeat(np.arange(old_wavel.size), taps.size)
+    smooth_cols = np.clip(
+        smooth_rows + np.tile(offsets, old_wavel.size), 0, old_wavel.size - 1
+    )
+
+    smooth_matrix = sparse.csr_matrix(
+        (np.tile(taps, old_wavel.size), (smooth_rows, smooth_cols)),
+        shape=(old_wavel.size, old_wavel.size),
+    )
+
+    rows, cols, weights = _resample_weights(
+        np.ascontiguousarray(new_wavel, dtype=np.float64),
+        np.ascontiguousarray(old_wavel, dtype=np.float64),
+    )
+
+    resample_matrix = sparse.csr_matrix(
+        (weights, (rows, cols)), shape=(new_wavel.size, old_wavel.size)
+    )
+
+    return resample_matrix @ smooth_matrix
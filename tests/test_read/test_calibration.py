@@ -16,19 +16,28 @@ class TestCalibration:
         self.test_path = os.path.dirname(__file__) + "/"
         self.model_param = {"scaling": 1.0}
 
-    def teardown_class(self):
-        os.remove("species_database.hdf5")
-        os.remove("species_config.ini")
-        shutil.rmtree("data/")
+    @pytest.fixture(scope="class", autouse=True)
+    def database(self):
+        # The database is created once for the tests of the class
+        # and also removed when one of the tests has failed
 
-    def test_species_init(self):
         test_util.create_config("./")
         SpeciesInit()
 
-    def test_read_calibration(self):
         database = Database()
         database.add_spectra("vega")
 
+        yield database
+
+        os.remove("species_database.hdf5")
+        os.remove("species_config.ini")
+        shutil.rmtree("data/")
+
+    def test_species_init(self, database):
+        assert os.path.isfile("species_config.ini")
+        assert os.path.isfile(database.database)
+
+    def test_read_calibration(self):
         read_calib = ReadCalibration("vega", filter_name="Paranal/NACO.H")
         assert read_calib.wavel_range == pytest.approx((1.44, 1.88), rel=1e-7, abs=0.0)
 
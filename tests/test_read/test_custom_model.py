@@ -0,0 +1,86 @@
+import os
+import shutil
+
+import pytest
+import numpy as np
+
+from species import SpeciesInit
+from species.data.database import Database
+from species.read.read_model import ReadModel
+from species.util import test_util
+
+
+class TestCustomModel:
+    def setup_class(self):
+        self.limit = 1e-8
+        self.test_path = os.path.dirname(__file__) + "/"
+        self.wavelength = np.logspace(0.0, np.log10(5.0), 100)
+
+    @pytest.fixture(scope="class", autouse=True)
+    def database(self):
+        test_util.create_config("./")
+        SpeciesInit()
+
+        database = Database()
+
+        # The custom spectra are stored with a .txt extension,
+        # which is read as plain text just like .dat files
+
+        os.makedirs("custom_grid/")
+
+        for teff in [1000.0, 1100.0]:
+            for logg in [4.0, 4.5]:
+                flux = teff * logg * np.ones(self.wavelength.size)
+
+                np.savetxt(
+                    f"custom_grid/custom-model_teff_{teff}_logg_{logg}_spec.txt",
+                    np.column_stack([self.wavelength, flux]),
+                )
+
+        yield database
+
+        os.remove("species_database.hdf5")
+        os.remove("species_config.ini")
+        shutil.rmtree("data/")
+        shutil.rmtree("custom_grid/")
+
+    def test_add_custom_model(self, database):
+        database.add_custom_model(
+            "custom-model",
+            data_path="custom_grid/",
+            parameters=["teff", "logg"],
+        )
+
+        read_model = ReadModel("custom-model")
+        assert read_model.get_parameters() == ["teff", "logg"]
+
+    def test_get_data(self):
+        read_model = ReadModel("custom-model")
+
+        points = read_model.get_points()
+        assert np.sum(points["teff"]) == 2100.0
+        assert np.sum(points["logg"]) == 8.5
+
+        wavelengths = read_model.get_wavelengths()
+        assert np.sum(wavelengths) == pytest.approx(
+            np.sum(self.wavelength), rel=self.limit, abs=0.0
+        )
+
+        model_box = read_model.get_data({"teff": 1100.0, "logg": 4.5})
+        assert np.sum(model_box.flux) == pytest.approx(
+            100.0 * 1100.0 * 4.5, rel=self.limit, abs=0.0
+        )
+
+    def test_fixed_teff(self):
+        # Teff fixed at the last grid point, for which the linear
+        # interpolation still requires two temperature points
+
+        read_model = ReadModel("custom-model", teff_range=(1100.0, 1100.0))
+
+        points = read_model.get_points()
+        assert np.sum(points["teff"]) == 2100.0
+
+        model_box = read_model.get_model({"teff": 1100.0, "logg": 4.5})
+        assert np.sum(model_box.flux) == pytest.approx(
+            100.0 * 1100.0 * 4.5, rel=self.limit, abs=0.0
+        )
@@ -16,21 +16,30 @@ class TestIsochrone:
         self.limit = 1e-8
         self.test_path = os.path.dirname(__file__) + "/"
 
-    def teardown_class(self):
-        os.remove("species_database.hdf5")
-        os.remove("species_config.ini")
-        shutil.rmtree("data/")
+    @pytest.fixture(scope="class", autouse=True)
+    def database(self):
+        # The database is created once for the tests of the class
+        # and also removed when one of the tests has failed
 
-    def test_species_init(self):
         test_util.create_config("./")
         SpeciesInit()
 
-    def test_read_isochrone(self):
         database = Database()
         database.add_isochrones("ames")
 
         database.add_model("ames-cond", teff_range=(2000.0, 2500.0))
 
+        yield database
+
+        os.remove("species_database.hdf5")
+        os.remove("species_config.ini")
+        shutil.rmtree("data/")
+
+    def test_species_init(self, database):
+        assert os.path.isfile("species_config.ini")
+        assert os.path.isfile(database.database)
+
+    def test_read_isochrone(self):
         read_isochrone = ReadIsochrone("ames-cond")
         assert read_isochrone.tag == "ames-cond"
 
@@ -21,16 +21,14 @@ class TestModel:
             "parallax": 100.0,
         }
 
-    def teardown_class(self):
-        os.remove("species_database.hdf5")
-        os.remove("species_config.ini")
-        shutil.rmtree("data/")
+    @pytest.fixture(scope="class", autouse=True)
+    def database(self):
+        # The database is created once for the tests of the class
+        # and also removed when one of the tests has failed
 
-    def test_species_init(self):
         test_util.create_config("./")
         SpeciesInit()
 
-    def test_read_model(self):
         database = Database()
 
         database.add_model(
@@ -40,12 +38,28 @@ class TestModel:
             teff_range=(2000.0, 2500.0),
         )
 
+        yield database
+
+        os.remove("species_database.hdf5")
+        os.remove("species_config.ini")
+        shutil.rmtree("data/")
+
+    @pytest.fixture(scope="class")
+    def read_model(self, database):
+        # The model grid is interpolated only once
+        # for the tests that use the NACO H filter
+
+        return ReadModel("ames-cond", filter_name="Paranal/NACO.H")
+
+    def test_species_init(self, database):
+        assert os.path.isfile("species_config.ini")
+        assert os.path.isfile(database.database)
+
+    def test_read_model(self):
         read_model = ReadModel("ames-cond")
         assert read_model.model == "ames-cond"
 
-    def test_get_model(self):
-        read_model = ReadModel("ames-cond", filter_name="Paranal/NACO.H")
-
+    def test_get_model(self, read_model):
         model_box = read_model.get_model(
             self.model_param, spec_res=100.0, magnitude=False,
         )
@@ -68,8 +82,7 @@ class TestModel:
             646.3776539114224, rel=self.limit, abs=0.0
         )
 
-    def test_get_data(self):
-        read_model = ReadModel("ames-cond", filter_name="Paranal/NACO.H")
+    def test_get_data(self, read_model):
         model_box = read_model.get_data(self.model_param)
 
         assert np.sum(model_box.wavelength) == pytest.approx(
@@ -79,14 +92,12 @@ class TestModel:
             1.709461299237834e-12, rel=self.limit, abs=0.0
         )
 
-    def test_get_flux(self):
-        read_model = ReadModel("ames-cond", filter_name="Paranal/NACO.H")
+    def test_get_flux(self, read_model):
         flux = read_model.get_flux(self.model_param)
 
         assert flux[0] == pytest.approx(3.489491094733077e-14, rel=self.limit, abs=0.0)
 
-    def test_get_magnitude(self):
-        read_model = ReadModel("ames-cond", filter_name="Paranal/NACO.H")
+    def test_get_magnitude(self, read_model):
         magnitude = read_model.get_magnitude(self.model_param)
 
         assert magnitude[0] == pytest.approx(
@@ -96,30 +107,26 @@ class TestModel:
             11.291213115013914, rel=self.limit, abs=0.0
         )
 
-    def test_get_bounds(self):
-        read_model = ReadModel("ames-cond", filter_name="Paranal/NACO.H")
+    def test_get_bounds(self, read_model):
         bounds = read_model.get_bounds()
 
         assert bounds["teff"] == (2000.0, 2500.0)
         assert bounds["logg"] == (2.5, 5.5)
 
-    def test_get_wavelengths(self):
-        read_model = ReadModel("ames-cond", filter_name="Paranal/NACO.H")
+    def test_get_wavelengths(self, read_model):
         wavelengths = read_model.get_wavelengths()
 
         assert np.sum(wavelengths) == pytest.approx(
             813.2224003071026, rel=1e-7, abs=0.0
         )
 
-    def test_get_points(self):
-        read_model = ReadModel("ames-cond", filter_name="Paranal/NACO.H")
+    def test_get_points(self, read_model):
         points = read_model.get_points()
 
         assert np.sum(points["teff"]) == 13500.0
         assert np.sum(points["logg"]) == 28.0
 
-    def test_get_parameters(self):
-        read_model = ReadModel("ames-cond", filter_name="Paranal/NACO.H")
+    def test_get_parameters(self, read_model):
         parameters = read_model.get_parameters()
 
         assert parameters == ["teff", "logg"]